@@ -0,0 +1,215 @@
+"""
+Streaming report export
+
+Records are buffered column-wise and flushed to disk every `batch_size`
+rows while the backtest is running. Supported sinks:
+    *.csv      - chunked CSV (one header, appended in batches)
+    *.parquet  - Parquet row groups (requires pyarrow)
+    directory  - numbered .npz column chunks (numpy only)
+"""
+import csv
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from core.timestamps import EXCHANGE_TZ, format_timestamp
+
+
+TRADE_COLUMNS = (
+    ("timestamp", "i8"),
+    ("strategy_id", "U"),
+    ("symbol", "U"),
+    ("side", "U"),
+    ("quantity", "i8"),
+    ("price", "f8"),
+    ("realized_pnl", "f8"),
+    ("reason", "U"),
+)
+
+SKIP_COLUMNS = (
+    ("timestamp", "i8"),
+    ("strategy_id", "U"),
+    ("symbol", "U"),
+    ("side", "U"),
+    ("reason", "U"),
+    ("current_position", "i8"),
+    ("strategy_pnl", "f8"),
+)
+
+
+class BatchWriter(ABC):
+    """Column-buffered writer; subclasses implement _write_batch"""
+
+    def __init__(self, path: str, columns: Sequence = TRADE_COLUMNS,
+                 batch_size: int = 50000):
+        self.path = Path(path)
+        self.columns = tuple(columns)
+        self.names = [name for name, _ in self.columns]
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer: List[list] = [[] for _ in self.columns]
+        self._pending = 0
+        self.closed = False
+
+    def append(self, row: Sequence):
+        """Buffer one record (values in column order)"""
+        for column, value in zip(self._buffer, row):
+            column.append(value)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows to disk"""
+        if not self._pending:
+            return
+        arrays = {
+            name: np.asarray(values, dtype=dtype if dtype != "U" else str)
+            for (name, dtype), values in zip(self.columns, self._buffer)
+        }
+        self._write_batch(arrays, self._pending)
+        self.rows_written += self._pending
+        self._buffer = [[] for _ in self.columns]
+        self._pending = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._close()
+        self.closed = True
+
+    @abstractmethod
+    def _write_batch(self, arrays: Dict[str, np.ndarray], n: int):
+        pass
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvBatchWriter(BatchWriter):
+    """Chunked CSV with human-readable timestamps"""
+
+    def __init__(self, path: str, columns: Sequence = TRADE_COLUMNS,
+                 batch_size: int = 50000, tz=EXCHANGE_TZ):
+        super().__init__(path, columns, batch_size)
+        self.tz = tz
+        self._file = open(self.path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.names)
+
+    def _write_batch(self, arrays, n):
+        columns = [arrays[name].tolist() for name in self.names]
+        columns[0] = [format_timestamp(ts, self.tz) for ts in columns[0]]
+        self._writer.writerows(zip(*columns))
+
+    def _close(self):
+        self._file.close()
+
+
+class NpzBatchWriter(BatchWriter):
+    """Directory of part-NNNNN.npz files, one per batch"""
+
+    def __init__(self, path: str, columns: Sequence = TRADE_COLUMNS,
+                 batch_size: int = 50000):
+        super().__init__(path, columns, batch_size)
+        self.path.mkdir(parents=True, exist_ok=True)
+        for old in self.path.glob("part-*.npz"):
+            old.unlink()
+        self._parts = 0
+
+    def _write_batch(self, arrays, n):
+        np.savez(self.path / f"part-{self._parts:05d}.npz", **arrays)
+        self._parts += 1
+
+
+class ParquetBatchWriter(BatchWriter):
+    """Parquet file with one row group per batch"""
+
+    def __init__(self, path: str, columns: Sequence = TRADE_COLUMNS,
+                 batch_size: int = 50000):
+        super().__init__(path, columns, batch_size)
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from e
+        self._writer = None
+
+    def _write_batch(self, arrays, n):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(arrays)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self.path), table.schema)
+        self._writer.write_table(table)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path: str, columns: Sequence = TRADE_COLUMNS,
+                batch_size: int = 50000) -> BatchWriter:
+    """Pick a writer from the path: .csv, .parquet, anything else -> .npz directory"""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return CsvBatchWriter(path, columns, batch_size)
+    if suffix == ".parquet":
+        return ParquetBatchWriter(path, columns, batch_size)
+    return NpzBatchWriter(path, columns, batch_size)
+
+
+def iter_chunks(path: str, chunk_size: int = 50000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Lazily read an exported file back as column dicts, one chunk at a time.
+
+    CSV timestamps come back as strings; binary formats keep epoch-ns ints.
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        for part in sorted(path.glob("part-*.npz")):
+            with np.load(part) as data:
+                yield {name: data[name] for name in data.files}
+        return
+
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=chunk_size):
+            yield {name: batch.column(name).to_numpy(zero_copy_only=False)
+                   for name in batch.schema.names}
+        return
+
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        names = next(reader)
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield _csv_columns(names, rows)
+                rows = []
+        if rows:
+            yield _csv_columns(names, rows)
+
+
+def _csv_columns(names, rows) -> Dict[str, np.ndarray]:
+    numeric = {"quantity": np.int64, "current_position": np.int64,
+               "price": np.float64, "realized_pnl": np.float64, "strategy_pnl": np.float64}
+    columns = list(zip(*rows))
+    return {
+        name: np.asarray(values, dtype=numeric.get(name, str))
+        for name, values in zip(names, columns)
+    }
+
@@ -1,16 +1,41 @@
 
 import csv
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Optional
+import numpy as np
+from core.timestamps import EXCHANGE_TZ, format_timestamp
 from execution.models import Trade
+from .export import BatchWriter, iter_chunks
+from .rejections import RejectionLog
 
 
 class Analytics:
  
-    def __init__(self):
-        """Initialize analytics"""
+    def __init__(self, tz=EXCHANGE_TZ,
+                 trade_writer: Optional[BatchWriter] = None,
+                 skip_writer: Optional[BatchWriter] = None,
+                 keep_in_memory: bool = True,
+                 skip_mode: str = "full"):
+        """
+        Initialize analytics
+
+        Args:
+            tz: Timezone used when rendering timestamps in exports
+            trade_writer: Streams trades to disk in batches during the run
+            skip_writer: Streams skipped signals to disk in batches
+            keep_in_memory: Also keep trades/skips in memory
+            skip_mode: "full" keeps every rejection, "aggregate" only
+                counters per (strategy, symbol, reason, side)
+        """
+        self.tz = tz  # Timestamps are epoch-ns until export
         self.trades: List[Trade] = []
-        self.skipped_trades: List[Dict] = []
+        self.rejections = RejectionLog(skip_mode)
+
+        self.trade_writer = trade_writer
+        self.skip_writer = skip_writer
+        self.keep_in_memory = keep_in_memory
+
+        self.trade_count = 0
+        self.skip_count = 0
 
     def log_trade(self, trade: Trade):
         """
@@ -19,11 +44,18 @@ class Analytics:
         Args:
             trade: Executed trade object
         """
-        self.trades.append(trade)
+        self.trade_count += 1
+        if self.keep_in_memory:
+            self.trades.append(trade)
+        if self.trade_writer is not None:
+            self.trade_writer.append((
+                trade.timestamp, trade.strategy_id, trade.symbol, trade.side,
+                trade.quantity, trade.price, trade.realized_pnl, trade.reason
+            ))
 
     def log_skipped_trade(
         self,
-        timestamp: datetime,
+        timestamp: int,
         strategy_id: str,
         symbol: str,
         side: str,
@@ -43,15 +75,15 @@ class Analytics:
             current_position: Current position quantity
             strategy_pnl: Current strategy PnL
         """
-        self.skipped_trades.append({
-            'timestamp': timestamp,
-            'strategy_id': strategy_id,
-            'symbol': symbol,
-            'side': side,
-            'reason': reason,
-            'current_position': current_position,
-            'strategy_pnl': strategy_pnl
-        })
+        self.skip_count += 1
+        if self.skip_writer is not None:
+            self.skip_writer.append((
+                timestamp, strategy_id, symbol, side, reason,
+                current_position, strategy_pnl
+            ))
+        if self.keep_in_memory:
+            self.rejections.log(timestamp, strategy_id, symbol, side, reason,
+                                current_position, strategy_pnl)
 
     def export_trades_csv(self, path: str):
         """
@@ -75,7 +107,7 @@ class Analytics:
 
             for trade in self.trades:
                 writer.writerow([
-                    trade.timestamp,
+                    format_timestamp(trade.timestamp, self.tz),
                     trade.strategy_id,
                     trade.symbol,
                     trade.side,
@@ -94,9 +126,12 @@ class Analytics:
         Args:
             path: Output file path
         """
+        aggregate = self.rejections.mode == "aggregate"
+        skipped = self.rejections.rows()
+
         with open(path, "w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow([
+            header = [
                 "timestamp",
                 "strategy_id",
                 "symbol",
@@ -104,27 +139,57 @@ class Analytics:
                 "reason",
                 "current_position",
                 "strategy_pnl"
-            ])
+            ]
+            if aggregate:
+                header += ["last_timestamp", "count"]
+            writer.writerow(header)
 
-            for skip in self.skipped_trades:
-                writer.writerow([
-                    skip['timestamp'],
+            for skip in skipped:
+                row = [
+                    format_timestamp(skip['timestamp'], self.tz),
                     skip['strategy_id'],
                     skip['symbol'],
                     skip['side'],
                     skip['reason'],
                     skip['current_position'],
                     round(skip['strategy_pnl'], 2)
-                ])
+                ]
+                if aggregate:
+                    row += [format_timestamp(skip['last_timestamp'], self.tz), skip['count']]
+                writer.writerow(row)
         
-        print(f"✅ Exported {len(self.skipped_trades)} skipped trades to {path}")
+        print(f"✅ Exported {len(skipped)} skipped trades to {path}")
+
+    def flush(self):
+        """Push buffered rows of the streaming writers to disk"""
+        for writer in (self.trade_writer, self.skip_writer):
+            if writer is not None:
+                writer.flush()
+
+    def close(self):
+        """Flush and close the streaming writers"""
+        for writer in (self.trade_writer, self.skip_writer):
+            if writer is not None:
+                writer.close()
 
     def calculate_metrics(self, trades: List[Trade], strategy_id: str) -> Dict:
    
     # Only CLOSED trades (exit legs)
         closed_trades = [t for t in trades if t.realized_pnl != 0]
 
-        if not closed_trades:
+        winning = [t.realized_pnl for t in closed_trades if t.realized_pnl > 0]
+        losing = [t.realized_pnl for t in closed_trades if t.realized_pnl < 0]
+
+        return self._metrics(strategy_id, len(winning), sum(winning),
+                             len(losing), sum(losing))
+
+    @staticmethod
+    def _metrics(strategy_id: str, wins: int, sum_win: float,
+                 losses: int, sum_loss: float) -> Dict:
+        """Build the metrics dict from win/loss aggregates"""
+        closed = wins + losses
+
+        if not closed:
             return {
                 'strategy_id': strategy_id,
                 'total_trades': 0,
@@ -136,33 +201,43 @@ class Analytics:
                 'avg_loss': 0.0
             }
 
-        total_pnl = sum(t.realized_pnl for t in closed_trades)
+        return {
+            'strategy_id': strategy_id,
+            'total_trades': closed,
+            'total_pnl': round(sum_win + sum_loss, 2),
+            'winning_trades': wins,
+            'losing_trades': losses,
+            'win_rate': round(wins / closed * 100, 2),
+            'avg_win': round(sum_win / wins, 2) if wins else 0.0,
+            'avg_loss': round(sum_loss / losses, 2) if losses else 0.0
+        }
 
-        winning_trades = [t for t in closed_trades if t.realized_pnl > 0]
-        losing_trades = [t for t in closed_trades if t.realized_pnl < 0]
+    def metrics_from_file(self, path: str, strategy_ids: List[str]) -> List[Dict]:
+        """
+        Compute metrics from an exported trade file, one chunk at a time
 
-        win_rate = len(winning_trades) / len(closed_trades)
+        Args:
+            path: Trade export (.csv, .parquet or .npz directory)
+            strategy_ids: Strategies to report on
 
-        avg_win = (
-            sum(t.realized_pnl for t in winning_trades) / len(winning_trades)
-            if winning_trades else 0.0
-        )
+        Returns:
+            One metrics dict per strategy
+        """
+        totals = {sid: [0, 0.0, 0, 0.0] for sid in strategy_ids}
 
-        avg_loss = (
-            sum(t.realized_pnl for t in losing_trades) / len(losing_trades)
-            if losing_trades else 0.0
-        )
+        for chunk in iter_chunks(path):
+            pnl = chunk['realized_pnl'].astype(np.float64)
+            sids = chunk['strategy_id']
+            for sid, agg in totals.items():
+                mine = pnl[sids == sid]
+                win = mine[mine > 0]
+                loss = mine[mine < 0]
+                agg[0] += len(win)
+                agg[1] += float(win.sum())
+                agg[2] += len(loss)
+                agg[3] += float(loss.sum())
 
-        return {
-            'strategy_id': strategy_id,
-            'total_trades': len(closed_trades),   # ✅ FIX
-            'total_pnl': round(total_pnl, 2),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': round(win_rate * 100, 2),
-            'avg_win': round(avg_win, 2),
-            'avg_loss': round(avg_loss, 2)
-    }
+        return [self._metrics(sid, *agg) for sid, agg in totals.items()]
 
     def export_metrics_csv(self, path: str, strategy_ids: List[str]):
         """
@@ -211,8 +286,8 @@ class Analytics:
             Dict with summary statistics
         """
         return {
-            'total_trades': len(self.trades),
-            'total_skipped': len(self.skipped_trades),
+            'total_trades': self.trade_count,
+            'total_skipped': self.skip_count,
             'trades': self.trades,
-            'skipped_trades': self.skipped_trades
+            'skipped_trades': self.rejections.rows()
         }
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Compact log of signals rejected by the risk manager
+"""
+from array import array
+from typing import Dict, List, Tuple
+
+
+class RejectionLog:
+    """
+    Rejections stored in typed columns with interned strings.
+
+    Modes:
+        full      - one ~40 byte row per rejection
+        aggregate - only a counter per (strategy, symbol, reason, side) plus
+                    the first and last occurrence; memory stays flat no matter
+                    how long a blocked strategy keeps firing
+    """
+
+    MODES = ("full", "aggregate")
+
+    def __init__(self, mode: str = "full"):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid mode: {mode}. Must be one of {self.MODES}")
+
+        self.mode = mode
+        self.count = 0
+
+        # Interned strings (strategy ids, symbols, sides, reasons)
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+        # Full mode columns
+        self.timestamps = array('q')
+        self.strategy_codes = array('i')
+        self.symbol_codes = array('i')
+        self.side_codes = array('i')
+        self.reason_codes = array('i')
+        self.positions = array('q')
+        self.strategy_pnls = array('d')
+
+        # Aggregate mode: (strategy, symbol, reason, side) codes ->
+        #   [count, first_ts, last_ts, last_position, last_pnl]
+        self.counters: Dict[Tuple[int, int, int, int], list] = {}
+
+    def _code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def log(self, timestamp: int, strategy_id: str, symbol: str, side: str,
+            reason: str, current_position: int, strategy_pnl: float):
+        """Record one rejected signal"""
+        self.count += 1
+        code = self._code
+
+        if self.mode == "aggregate":
+            key = (code(strategy_id), code(symbol), code(reason), code(side))
+            entry = self.counters.get(key)
+            if entry is None:
+                self.counters[key] = [1, timestamp, timestamp, current_position, strategy_pnl]
+            else:
+                entry[0] += 1
+                entry[2] = timestamp
+                entry[3] = current_position
+                entry[4] = strategy_pnl
+            return
+
+        self.timestamps.append(timestamp)
+        self.strategy_codes.append(code(strategy_id))
+        self.symbol_codes.append(code(symbol))
+        self.side_codes.append(code(side))
+        self.reason_codes.append(code(reason))
+        self.positions.append(current_position)
+        self.strategy_pnls.append(strategy_pnl)
+
+    def __len__(self) -> int:
+        """Number of rejections logged (in either mode)"""
+        return self.count
+
+    def counts(self) -> Dict[Tuple[str, str, str], int]:
+        """Rejections per (strategy_id, reason, side), all symbols together"""
+        s = self.strings
+        result: Dict[Tuple[str, str, str], int] = {}
+        if self.mode == "aggregate":
+            for (strategy, _, reason, side), entry in self.counters.items():
+                key = (s[strategy], s[reason], s[side])
+                result[key] = result.get(key, 0) + entry[0]
+            return result
+
+        for key in zip(self.strategy_codes, self.reason_codes, self.side_codes):
+            key = (s[key[0]], s[key[1]], s[key[2]])
+            result[key] = result.get(key, 0) + 1
+        return result
+
+    def rows(self) -> List[Dict]:
+        """
+        Materialize rejections as dicts (reporting only; builds a new list
+        on every call, so callers keep the result).
+
+        Aggregate rows use the first occurrence as 'timestamp' and add
+        'last_timestamp' and 'count'; position/PnL are from the last one.
+        """
+        s = self.strings
+
+        if self.mode == "aggregate":
+            return [
+                {
+                    'timestamp': first_ts,
+                    'last_timestamp': last_ts,
+                    'count': count,
+                    'strategy_id': s[strategy],
+                    'symbol': s[symbol],
+                    'side': s[side],
+                    'reason': s[reason],
+                    'current_position': position,
+                    'strategy_pnl': pnl,
+                }
+                for (strategy, symbol, reason, side), (count, first_ts, last_ts, position, pnl)
+                in self.counters.items()
+            ]
+
+        return [
+            {
+                'timestamp': ts,
+                'strategy_id': s[strategy],
+                'symbol': s[symbol],
+                'side': s[side],
+                'reason': s[reason],
+                'current_position': position,
+                'strategy_pnl': pnl,
+            }
+            for ts, strategy, symbol, side, reason, position, pnl in zip(
+                self.timestamps, self.strategy_codes, self.symbol_codes,
+                self.side_codes, self.reason_codes, self.positions, self.strategy_pnls
+            )
+        ]
+
+    def reset(self):
+        self.__init__(self.mode)
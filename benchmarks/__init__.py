@@ -0,0 +1,4 @@
+"""
+Standalone benchmarks - run from the repo root, e.g.
+    python -m benchmarks.bench_hot_objects
+"""
@@ -0,0 +1,70 @@
+"""
+Lot accounting throughput (target: 1M fills/sec).
+
+Random signed fills over many (strategy, symbol) positions, so most fills
+add to, partly close or flip a position - the worst case for FIFO lots.
+
+    python -m benchmarks.bench_accounting [n_fills] [n_strategies] [n_symbols]
+
+Batch timings are the best of three runs.
+"""
+import sys
+import time
+
+import numpy as np
+
+from execution.accounting import Ledger
+from execution.execution_engine import ExecutionEngine
+
+
+def main():
+    n_fills = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_strategies = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    n_symbols = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    rng = np.random.default_rng(0)
+    n_slots = n_strategies * n_symbols
+    picks = rng.integers(0, n_slots, n_fills)
+    quantities = rng.integers(1, 10, n_fills) * rng.choice([-1, 1], n_fills)
+    prices = np.round(100 + rng.normal(0, 1, n_fills), 2)
+    timestamps = np.arange(n_fills, dtype=np.int64)
+
+    print(f"{n_fills:,} fills over {n_slots:,} positions")
+    print(f"{'path':28s} {'fills/s':>12s}")
+    print("-" * 41)
+
+    for method in Ledger.METHODS:
+        best = float("inf")
+        for _ in range(3):
+            ledger = Ledger(method)
+            slots = np.array([
+                ledger.slot(ledger.strategy_code(f"s{i}"), ledger.symbol_code(f"SYM{j}"))
+                for i in range(n_strategies) for j in range(n_symbols)
+            ])
+            start = time.perf_counter()
+            ledger.record_many(slots[picks], quantities, prices, timestamps)
+            best = min(best, time.perf_counter() - start)
+        print(f"{'Ledger.record_many ' + method:28s} {n_fills / best:12,.0f}")
+
+    # Per-call paths, on a slice to keep the run short
+    n = min(n_fills, 200_000)
+    names = [(f"s{k // n_symbols}", f"SYM{k % n_symbols}") for k in picks[:n].tolist()]
+    rows = list(zip(names, quantities[:n].tolist(), prices[:n].tolist()))
+
+    ledger = Ledger()
+    record = ledger.record
+    start = time.perf_counter()
+    for (strategy_id, symbol), quantity, price in rows:
+        record(strategy_id, symbol, quantity, price)
+    print(f"{'Ledger.record':28s} {n / (time.perf_counter() - start):12,.0f}")
+
+    engine = ExecutionEngine()
+    execute = engine.execute_trade
+    start = time.perf_counter()
+    for (strategy_id, symbol), quantity, price in rows:
+        execute(strategy_id, symbol, quantity, price, 0)
+    print(f"{'ExecutionEngine.execute_trade':28s} {n / (time.perf_counter() - start):12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
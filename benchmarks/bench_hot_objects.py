@@ -0,0 +1,95 @@
+"""
+Construction time and memory of the per-bar hot objects.
+
+Compares the previous layouts (frozen dataclass Bar, plain dataclass Signal
+with a list-membership side check) against the slotted versions and
+pooled signals used now.
+
+    python -m benchmarks.bench_hot_objects
+"""
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+
+from core.signal import BUY, Signal
+from data.bar import Bar
+from strategies.base import BaseStrategy
+
+
+N = 200_000
+
+
+@dataclass(frozen=True)
+class OldBar:
+    timestamp: int
+    symbol: str
+    open: float
+    high: float
+    low: float
+    close: float
+    minute_of_day: int
+    session_day: int
+
+
+@dataclass
+class OldSignal:
+    strategy_id: str
+    symbol: str
+    side: str
+    timestamp: int
+    reason: str = ""
+
+    def __post_init__(self):
+        if self.side not in ["BUY", "SELL"]:
+            raise ValueError(f"Invalid side: {self.side}")
+
+
+class _Emitter(BaseStrategy):
+    def on_bar(self, bar):
+        return None
+
+
+def per_call_ns(fn, number=N) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def bytes_per_object(factory, count=50_000) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def main():
+    pooled = _Emitter("bench", "NIFTY")
+    pooled.reuse_signals = True
+
+    rows = [
+        ("Bar (frozen dataclass)",
+         per_call_ns(lambda: OldBar(1, "NIFTY", 1.0, 2.0, 0.5, 1.5, 555, 16444)),
+         bytes_per_object(lambda i: OldBar(i, "NIFTY", 1.0, 2.0, 0.5, 1.5, 555, 16444))),
+        ("Bar (slots)",
+         per_call_ns(lambda: Bar(1, "NIFTY", 1.0, 2.0, 0.5, 1.5, 555, 16444)),
+         bytes_per_object(lambda i: Bar(i, "NIFTY", 1.0, 2.0, 0.5, 1.5, 555, 16444))),
+        ("Signal (dataclass, str side)",
+         per_call_ns(lambda: OldSignal("s", "NIFTY", "BUY", 1, "r")),
+         bytes_per_object(lambda i: OldSignal("s", "NIFTY", "BUY", i, "r"))),
+        ("Signal (slots, Side enum)",
+         per_call_ns(lambda: Signal("s", "NIFTY", BUY, 1, "r")),
+         bytes_per_object(lambda i: Signal("s", "NIFTY", BUY, i, "r"))),
+        ("Signal (pooled via emit)",
+         per_call_ns(lambda: pooled.emit(BUY, 1, "r")),
+         0.0),
+    ]
+
+    print(f"{'object':32s} {'ns/construct':>14s} {'bytes/object':>14s}")
+    print("-" * 62)
+    for name, ns, size in rows:
+        print(f"{name:32s} {ns:14.1f} {size:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cold-start cost of the CLI and of a worker that loads the feed.
+
+Every measurement runs in a fresh interpreter (best of N) so module
+caches don't hide import time.
+
+    python -m benchmarks.bench_import_time [csv_path]
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+REPEAT = 5
+
+
+def cold(code: str) -> float:
+    """Best wall time (ms) of running `code` in a new interpreter"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True,
+                       stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "data/market_data.csv"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = str(Path(tmp) / "bars.npz")
+        load = ("from data.feed import MarketDataFeed; "
+                f"f = MarketDataFeed({csv_path!r}, 'NIFTY', cache={cache!r}); f.load()")
+
+        # Build the cache once
+        subprocess.run([sys.executable, "-c", load], check=True, stdout=subprocess.DEVNULL)
+
+        rows = [
+            ("python (empty)", cold("pass")),
+            ("import pandas", cold("import pandas")),
+            ("import main", cold("import main")),
+            ("registry: one strategy", cold(
+                "from strategies.registry import create_strategy; "
+                "create_strategy('opening_range')")),
+            ("feed from CSV (pandas)", cold(
+                "from data.feed import MarketDataFeed; "
+                f"MarketDataFeed({csv_path!r}, 'NIFTY').load()")),
+            ("feed from .npz cache", cold(load + "; import sys; assert 'pandas' not in sys.modules")),
+        ]
+
+    print(f"{'cold start':28s} {'ms':>8s}")
+    print("-" * 38)
+    for name, ms in rows:
+        print(f"{name:28s} {ms:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
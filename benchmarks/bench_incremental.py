@@ -0,0 +1,79 @@
+"""
+Daily update cost: full re-run vs incremental resume after appending one day.
+
+    python -m benchmarks.bench_incremental [years]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from analytics.metrics import Analytics
+from data.feed import MarketDataFeed
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from engine.incremental import IncrementalRunner
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.registry import create_strategy
+
+
+BARS_PER_DAY = 375
+
+
+def make_engine(path: Path) -> BacktestEngine:
+    strategies = [
+        create_strategy("ema_crossover", symbol="NIFTY"),
+        create_strategy("mean_reversion", symbol="NIFTY"),
+        create_strategy("opening_range", symbol="NIFTY"),
+    ]
+    risk_manager = RiskManager(max_position_size=10 ** 9, max_loss_per_strategy=-1e18)
+    return BacktestEngine(MarketDataFeed(str(path), "NIFTY"), strategies, risk_manager,
+                          ExecutionEngine(), Analytics(), verbose=False)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        history = tmp / "history.csv"
+        SyntheticMarket(years=years + 0.05, seed=11).write_csv("NIFTY", history)
+        lines = history.read_text().splitlines(keepends=True)
+
+        csv = tmp / "daily.csv"
+        csv.write_text("".join(lines[:-BARS_PER_DAY]))
+        state = tmp / "state.ckpt"
+
+        initial = timed(lambda: IncrementalRunner(make_engine(csv), state).run())
+
+        with open(csv, "a") as f:
+            f.write("".join(lines[-BARS_PER_DAY:]))
+
+        def full_run():
+            engine = make_engine(csv)
+            engine.data_feed.load()
+            engine.run()
+
+        full = timed(full_run)
+        runner = IncrementalRunner(make_engine(csv), state)
+        resumed = timed(runner.run)
+
+    print(f"{len(lines) - 1:,} bars of history, +{BARS_PER_DAY} appended")
+    print(f"  first run (writes checkpoint): {initial:7.2f} s")
+    print(f"  full re-run:                   {full:7.2f} s")
+    print(f"  incremental re-run:            {resumed:7.2f} s  "
+          f"({runner.bars_run} bars processed, resumed={runner.resumed})")
+
+
+if __name__ == "__main__":
+    main()
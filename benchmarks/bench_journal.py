@@ -0,0 +1,70 @@
+"""
+Journal overhead during a run and replay speed vs re-running the strategies.
+
+    python -m benchmarks.bench_journal [years]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from analytics.metrics import Analytics
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from engine.journal import Journal, replay
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.registry import create_strategy
+
+
+def make_engine(feed, journal=None) -> BacktestEngine:
+    strategies = [
+        create_strategy("ema_crossover", symbol="NIFTY"),
+        create_strategy("mean_reversion", symbol="NIFTY"),
+        create_strategy("opening_range", symbol="NIFTY"),
+    ]
+    # Loss limit that blocks strategies part-way: rejections as well as fills
+    risk_manager = RiskManager(max_position_size=10, max_loss_per_strategy=-5000,
+                               default_quantity=5)
+    return BacktestEngine(feed, strategies, risk_manager, ExecutionEngine(), Analytics(),
+                          verbose=False, journal=journal)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    feed = SyntheticMarket(years=years, seed=4).feed("NIFTY")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "run.journal"
+
+        plain = timed(lambda: make_engine(feed).run())
+
+        journal = Journal(path)
+        engine = make_engine(feed, journal)
+        journaled = timed(engine.run)
+        journal.close()
+        size = path.stat().st_size
+
+        result = None
+
+        def run_replay():
+            nonlocal result
+            result = replay(path)
+
+        replayed = timed(run_replay)
+
+    print(f"{len(feed):,} bars -> {len(journal):,} events ({size / 1e6:.1f} MB), "
+          f"{result.analytics.trade_count:,} fills, {result.analytics.skip_count:,} rejections")
+    print(f"  run without journal: {plain:7.3f} s")
+    print(f"  run with journal:    {journaled:7.3f} s  (+{(journaled / plain - 1) * 100:.1f}%)")
+    print(f"  replay from journal: {replayed:7.3f} s  ({plain / replayed:.0f}x faster than re-running)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Genetic search with pruning vs a full grid: optimum found and backtests spent.
+
+    python -m benchmarks.bench_optimizer [years] [n_workers] [seeds]
+"""
+import os
+import sys
+import time
+
+from data.synthetic import SyntheticMarket
+from engine.optimizer import Optimizer
+
+
+BASE = {"strategies": [{"name": "ema_crossover", "params": {}}], "risk": {"default_quantity": 5}}
+SPACE = {
+    "strategies.0.params.fast": range(2, 30, 2),
+    "strategies.0.params.slow": range(10, 100, 5),
+    "risk.max_loss_per_strategy": [-1000, -2000, -5000],
+}
+
+
+def fast_below_slow(params) -> bool:
+    return params["strategies.0.params.fast"] < params["strategies.0.params.slow"]
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 0.25
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    seeds = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    feed = SyntheticMarket(years=years, seed=4).feed("NIFTY")
+
+    def optimizer(**kwargs):
+        return Optimizer(feed, BASE, SPACE, constraint=fast_below_slow, n_workers=n_workers,
+                         verbose=False, **kwargs)
+
+    start = time.perf_counter()
+    grid = optimizer(prefix=None).grid()
+    grid_s = time.perf_counter() - start
+
+    ranked = sorted((e.score for e in grid.evaluations), reverse=True)
+    print(f"{len(feed):,} bars, {len(ranked)} valid combinations, {n_workers} workers")
+    print(f"  grid:    best {grid.best.score:10.2f}  {grid.backtests:4d} runs  "
+          f"{grid.backtest_equivalents:6.1f} backtests  {grid_s:7.2f} s")
+
+    for seed in range(seeds):
+        start = time.perf_counter()
+        result = optimizer().genetic(population=24, generations=20, seed=seed)
+        seconds = time.perf_counter() - start
+
+        rank = sum(score > result.best.score for score in ranked) + 1
+        print(f"  genetic: best {result.best.score:10.2f}  {result.backtests:4d} runs "
+              f"({result.pruned} pruned)  {result.backtest_equivalents:6.1f} backtests  "
+              f"{seconds:7.2f} s  rank {rank}/{len(ranked)} "
+              f"({result.backtest_equivalents / grid.backtest_equivalents:.0%} of the grid's work)")
+
+
+if __name__ == "__main__":
+    main()
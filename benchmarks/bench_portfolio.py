@@ -0,0 +1,59 @@
+"""
+Per-bar cost of many strategy variants: sequential vs portfolio mode.
+
+Portfolio mode steps same-class variants as one vectorized group, so its
+per-bar time should grow much more slowly than the variant count.
+
+    python -m benchmarks.bench_portfolio [n_bars] [variants ...]
+"""
+import sys
+import time
+
+from analytics.metrics import Analytics
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.ema_crossover import EMACrossoverStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+
+
+def make_strategies(n: int):
+    """n variants, half EMA crossover (fast, slow) and half mean reversion"""
+    strategies = []
+    for i in range(n):
+        if i % 2 == 0:
+            fast = 2 + (i // 2) % 20
+            slow = fast + 5 + (i // 40) % 40
+            strategies.append(EMACrossoverStrategy(fast=fast, slow=slow, strategy_id=f"ema_{i}"))
+        else:
+            strategies.append(MeanReversionStrategy(period=5 + (i // 2) % 60, strategy_id=f"mr_{i}"))
+    return strategies
+
+
+def run(feed, n: int, portfolio_mode: bool) -> float:
+    risk_manager = RiskManager(max_position_size=10 ** 9, max_loss_per_strategy=-1e18)
+    engine = BacktestEngine(feed, make_strategies(n), risk_manager, ExecutionEngine(),
+                            Analytics(), verbose=False, portfolio_mode=portfolio_mode)
+    start = time.perf_counter()
+    engine.run()
+    return time.perf_counter() - start
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    variants = [int(v) for v in sys.argv[2:]] or [10, 100, 500]
+
+    feed = SyntheticMarket(n_bars=n_bars, seed=1).feed("NIFTY")
+
+    print(f"{n_bars:,} bars, microseconds per bar")
+    print(f"{'variants':>8s} {'sequential':>12s} {'portfolio':>12s} {'speedup':>8s}")
+    print("-" * 44)
+    for n in variants:
+        sequential = run(feed, n, False) / n_bars * 1e6
+        portfolio = run(feed, n, True) / n_bars * 1e6
+        print(f"{n:8d} {sequential:12.1f} {portfolio:12.1f} {sequential / portfolio:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
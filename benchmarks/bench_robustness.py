@@ -0,0 +1,36 @@
+"""
+Monte Carlo robustness throughput (target: 10,000 sims x 100k trades in seconds).
+
+    python -m benchmarks.bench_robustness [n_sims] [n_trades] [n_workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from analytics.robustness import simulate
+
+
+def main():
+    n_sims = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_trades = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    n_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    pnl = np.random.default_rng(0).normal(0.5, 25.0, n_trades)
+
+    print(f"{n_sims:,} sims x {n_trades:,} trades")
+    print(f"{'method':12s} {'workers':>8s} {'s':>8s}")
+    print("-" * 30)
+    for method in ("bootstrap", "shuffle"):
+        for workers in sorted({1, n_workers}):
+            start = time.perf_counter()
+            report = simulate(pnl, n_sims=n_sims, method=method, n_workers=workers)
+            seconds = time.perf_counter() - start
+            print(f"{method:12s} {workers:8d} {seconds:8.2f}")
+
+    print("\nlast report:", {k: report[k] for k in ('total_pnl', 'max_drawdown', 'sharpe')})
+
+
+if __name__ == "__main__":
+    main()
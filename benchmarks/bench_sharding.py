@@ -0,0 +1,58 @@
+"""
+Multi-symbol backtest: one process over the merged feed vs per-symbol shards.
+
+    python -m benchmarks.bench_sharding [n_symbols] [years]
+
+Shards scale with cores up to n_symbols; on a single-core machine the
+sharded run only adds process start-up and merge cost.
+"""
+import os
+import sys
+import time
+
+from analytics.metrics import Analytics
+from data.multi_feed import MultiSymbolFeed
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from engine.sharding import ShardedBacktest
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.registry import create_strategy
+
+
+def make_engine(feed: MultiSymbolFeed) -> BacktestEngine:
+    strategies = []
+    for symbol in feed.symbols:
+        for name in ("ema_crossover", "mean_reversion", "opening_range"):
+            strategies.append(create_strategy(name, symbol=symbol,
+                                              strategy_id=f"{name}_{symbol}"))
+    risk_manager = RiskManager(max_position_size=10 ** 9, max_loss_per_strategy=-1e18)
+    return BacktestEngine(feed, strategies, risk_manager, ExecutionEngine(), Analytics(),
+                          verbose=False)
+
+
+def main():
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    years = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    market = SyntheticMarket(years=years, seed=6)
+    feed = MultiSymbolFeed(market.feeds([f"SYM{i}" for i in range(n_symbols)]))
+    print(f"{n_symbols} symbols, {len(feed):,} bars, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    single = make_engine(feed)
+    single.run()
+    base = time.perf_counter() - start
+    print(f"  single process:      {base:7.2f} s  ({single.analytics.trade_count:,} trades)")
+
+    for processes in sorted({2, n_symbols}):
+        start = time.perf_counter()
+        engine = make_engine(feed)
+        ShardedBacktest(engine, processes=processes).run()
+        elapsed = time.perf_counter() - start
+        assert engine.analytics.trade_count == single.analytics.trade_count
+        print(f"  sharded, {processes:2d} processes: {elapsed:7.2f} s  ({base / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
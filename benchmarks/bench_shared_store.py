@@ -0,0 +1,76 @@
+"""
+Memory of N concurrent workers: private feed copies vs one shared store.
+
+Each worker gets the same bars, runs a full pass over them and reports
+its private (anonymous) resident memory from /proc (Linux only).
+
+    python -m benchmarks.bench_shared_store [n_bars] [n_workers]
+"""
+import multiprocessing
+import sys
+import time
+
+from data.shared_store import SharedBarStore
+from data.synthetic import SyntheticMarket
+
+
+def private_mb() -> float:
+    """Anonymous (non-shared) resident memory of this process, MB"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _pass(feed) -> float:
+    total = 0.0
+    for bar in feed:
+        total += bar.close
+    return total
+
+
+def private_worker(n_bars: int):
+    # What each notebook / sweep worker does today: its own copy
+    baseline = private_mb()
+    feed = SyntheticMarket(n_bars=n_bars, seed=1).feed("NIFTY")
+    _pass(feed)
+    return private_mb() - baseline
+
+
+def shared_worker(name: str):
+    baseline = private_mb()
+    store = SharedBarStore.attach(name)
+    feed = store.feed("NIFTY")
+    _pass(feed)
+    return private_mb() - baseline
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    ctx = multiprocessing.get_context("spawn")
+
+    feed = SyntheticMarket(n_bars=n_bars, seed=1).feed("NIFTY")
+    dataset_mb = sum(getattr(feed, c).nbytes for c in feed._columns()) / 2 ** 20
+    print(f"{n_bars:,} bars ({dataset_mb:.0f} MB of columns), {n_workers} workers")
+    print(f"{'mode':10s} {'s':>7s} {'MB/worker':>10s} {'MB total':>10s}")
+    print("-" * 40)
+
+    start = time.perf_counter()
+    with ctx.Pool(n_workers) as pool:
+        used = pool.map(private_worker, [n_bars] * n_workers)
+    print(f"{'private':10s} {time.perf_counter() - start:7.1f} "
+          f"{max(used):10.0f} {sum(used):10.0f}")
+
+    with SharedBarStore.create([feed]) as store:
+        del feed
+        start = time.perf_counter()
+        with ctx.Pool(n_workers) as pool:
+            used = pool.map(shared_worker, [store.name] * n_workers)
+        print(f"{'shared':10s} {time.perf_counter() - start:7.1f} "
+              f"{max(used):10.0f} {sum(used) + dataset_mb:10.0f}  (incl. the one shared copy)")
+
+
+if __name__ == "__main__":
+    main()
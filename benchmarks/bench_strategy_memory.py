@@ -0,0 +1,91 @@
+"""
+Resident memory vs bars processed: bounded price history vs the previous
+append-every-close lists, for many strategy instances.
+
+    python -m benchmarks.bench_strategy_memory [instances] [bars]
+"""
+import gc
+import os
+import sys
+import time
+
+from data.synthetic import SyntheticMarket
+from strategies.ema_crossover import EMACrossoverStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+
+
+CHECKPOINTS = 4
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux /proc; peak RSS elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+class Unbounded:
+    """Previous layout: every close appended to a list for the whole run"""
+
+    def on_bar(self, bar):
+        self.closes.append(bar.close)
+        return super().on_bar(bar)
+
+
+class UnboundedEMA(Unbounded, EMACrossoverStrategy):
+    pass
+
+
+class UnboundedMeanReversion(Unbounded, MeanReversionStrategy):
+    pass
+
+
+def make(instances: int, unbounded: bool):
+    ema, mr = (UnboundedEMA, UnboundedMeanReversion) if unbounded else \
+        (EMACrossoverStrategy, MeanReversionStrategy)
+    strategies = []
+    for i in range(instances):
+        if i % 2:
+            strategy = ema(fast=5 + i % 10, slow=20 + i % 30, strategy_id=f"ema_{i}")
+        else:
+            strategy = mr(period=10 + i % 40, strategy_id=f"mr_{i}")
+        if unbounded:
+            strategy.closes = []
+        strategies.append(strategy)
+    return strategies
+
+
+def run(label: str, strategies, bars: list, total: int):
+    gc.collect()
+    base = rss_mb()
+    step = total // CHECKPOINTS
+    start = time.perf_counter()
+    print(f"{label}")
+    done = 0
+    while done < total:
+        for bar in bars[:min(step, total - done)]:
+            for strategy in strategies:
+                strategy.on_bar(bar)
+        done += min(step, total - done)
+        print(f"  {done:>10,} bars: RSS +{rss_mb() - base:7.1f} MB")
+    print(f"  ({time.perf_counter() - start:.1f} s)")
+
+
+def main():
+    instances = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+
+    # One fixed set of bar objects, replayed: data memory doesn't grow either
+    step = total // CHECKPOINTS
+    bars = list(SyntheticMarket(n_bars=step, seed=3).feed("NIFTY"))
+
+    print(f"{instances} strategy instances, {total:,} bars")
+    run("bounded history (PriceHistory)", make(instances, unbounded=False), bars, total)
+    run("unbounded lists (previous layout)", make(instances, unbounded=True), bars, total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Synthetic data generation throughput (target: 10M bars in seconds).
+
+    python -m benchmarks.bench_synthetic [n_bars]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from data.feed import MarketDataFeed
+from data.synthetic import SyntheticMarket
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    rows = []
+    for model in SyntheticMarket.MODELS:
+        market = SyntheticMarket(n_bars=n_bars, model=model, seed=1)
+        _, seconds = timed(lambda: market.arrays("NIFTY"))
+        rows.append((f"generate ({model})", seconds))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bars.npz"
+        _, seconds = timed(lambda: market.write_cache("NIFTY", path))
+        rows.append(("generate + write .npz", seconds))
+
+        feed = MarketDataFeed(str(path), "NIFTY")
+        _, seconds = timed(feed.load)
+        rows.append(("load .npz into feed", seconds))
+
+    print(f"{n_bars:,} bars")
+    print(f"{'step':24s} {'s':>8s} {'Mbars/s':>8s}")
+    print("-" * 42)
+    for name, seconds in rows:
+        print(f"{name:24s} {seconds:8.2f} {n_bars / seconds / 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
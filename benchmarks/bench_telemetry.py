@@ -0,0 +1,68 @@
+"""
+Telemetry overhead per bar, and what the recorded latencies look like.
+
+    python -m benchmarks.bench_telemetry [years] [sample_every]
+
+Overhead is the difference of the fastest of many interleaved runs: a
+single run varies by several percent here, far more than the telemetry.
+"""
+import sys
+import time
+
+from analytics.metrics import Analytics
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from engine.telemetry import Telemetry
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.registry import create_strategy
+
+
+def make_engine(feed, telemetry=None) -> BacktestEngine:
+    strategies = [
+        create_strategy("ema_crossover", symbol="NIFTY"),
+        create_strategy("mean_reversion", symbol="NIFTY"),
+        create_strategy("opening_range", symbol="NIFTY"),
+    ]
+    risk_manager = RiskManager(max_position_size=10, max_loss_per_strategy=-5000,
+                               default_quantity=5)
+    return BacktestEngine(feed, strategies, risk_manager, ExecutionEngine(), Analytics(),
+                          verbose=False, telemetry=telemetry)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 0.25
+    sample_every = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    feed = SyntheticMarket(years=years, seed=4).feed("NIFTY")
+    n = len(feed)
+
+    # Interleaved best-of-25, so drift hits both sides alike
+    telemetry = Telemetry(sample_every)
+    plain = with_telemetry = float("inf")
+    for _ in range(25):
+        plain = min(plain, timed(make_engine(feed).run))
+        telemetry.reset()
+        with_telemetry = min(with_telemetry, timed(make_engine(feed, telemetry).run))
+
+    print(f"{n:,} bars, timing 1 bar in {sample_every}")
+    print(f"  without telemetry: {plain / n * 1e6:6.2f} us/bar")
+    print(f"  with telemetry:    {with_telemetry / n * 1e6:6.2f} us/bar  "
+          f"({(with_telemetry / plain - 1) * 100:+.2f}%)")
+
+    print(f"  {'':<28}{'p50 us':>10}{'p99 us':>10}{'samples':>10}")
+    rows = [(f"stage:{k}", h) for k, h in telemetry.stages.items()]
+    rows += [(f"on_bar:{k}", h) for k, h in telemetry.strategy_time.items()]
+    rows += [(f"bar_to_fill:{k}", h) for k, h in telemetry.bar_to_fill.items()]
+    for label, histogram in rows:
+        q = histogram.quantiles((0.5, 0.99))
+        print(f"  {label:<28}{q[0.5] / 1e3:10.2f}{q[0.99] / 1e3:10.2f}{histogram.count:10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Tick -> bar throughput of the array-backed builders (target: several
+million ticks per second on one core).
+
+    python -m benchmarks.bench_ticks [n_ticks]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from data.ticks import (
+    TickBarBuilder, TimeBarBuilder, VolumeBarBuilder,
+    build_bars, iter_ticks, make_ticks, save_ticks,
+)
+
+
+def synthetic_ticks(n: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t0 = 1420775100 * 1_000_000_000
+    return make_ticks(
+        t0 + np.cumsum(rng.integers(1, 20_000_000, n)),
+        18000.0 + np.cumsum(rng.normal(0.0, 0.5, n)),
+        rng.integers(1, 100, n),
+    )
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    ticks = synthetic_ticks(n)
+
+    builders = [
+        ("time 1s", lambda: TimeBarBuilder("NIFTY", 1)),
+        ("volume 5000", lambda: VolumeBarBuilder("NIFTY", 5000)),
+        ("tick 100", lambda: TickBarBuilder("NIFTY", 100)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ticks.npy"
+        save_ticks(path, ticks)
+
+        print(f"{n:,} ticks ({ticks.nbytes / 1e6:.0f} MB), 1M-tick chunks from .npy")
+        print(f"{'builder':14s} {'bars':>10s} {'s':>8s} {'Mticks/s':>9s}")
+        print("-" * 44)
+        for name, make in builders:
+            start = time.perf_counter()
+            bars = build_bars(iter_ticks(path), make())
+            seconds = time.perf_counter() - start
+            print(f"{name:14s} {len(bars['closes']):10,d} {seconds:8.2f} {n / seconds / 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+File helpers shared by checkpoints, the result cache and metric exporters
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write(path: Union[str, Path], data: Union[bytes, str]):
+    """
+    Replace `path` with `data` in one step: written to a temporary file in
+    the same directory, then renamed over it, so readers never see a
+    partial file (the temporary file is removed if anything fails)
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
@@ -1,22 +1,38 @@
-
 from dataclasses import dataclass
-from datetime import datetime
+from enum import Enum
+
+
+class Side(str, Enum):
+    """Order side; compares equal to the plain "BUY"/"SELL" strings"""
+    BUY = "BUY"
+    SELL = "SELL"
+
+    def __str__(self):
+        return self.value
+
+
+# Module-level aliases avoid the enum attribute lookup in hot loops
+BUY = Side.BUY
+SELL = Side.SELL
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
    
     strategy_id: str
     symbol: str
-    side: str  # "BUY" or "SELL"
-    timestamp: datetime
+    side: Side  # Side.BUY or Side.SELL ("BUY"/"SELL" strings are converted)
+    timestamp: int  # Epoch nanoseconds
     reason: str = ""
     
     def __post_init__(self):
         """Validate signal fields"""
-        if self.side not in ["BUY", "SELL"]:
-            raise ValueError(f"Invalid side: {self.side}. Must be BUY or SELL")
+        if self.side.__class__ is not Side:
+            try:
+                self.side = Side(self.side)
+            except ValueError:
+                raise ValueError(f"Invalid side: {self.side}. Must be BUY or SELL") from None
     
     def __repr__(self):
         return (f"Signal(strategy={self.strategy_id}, symbol={self.symbol}, "
-                f"side={self.side}, reason='{self.reason}')")
\ No newline at end of file
+                f"side={self.side}, reason='{self.reason}')")
@@ -0,0 +1,84 @@
+"""
+Integer timestamp helpers
+
+Bars, signals and trades carry timestamps as int64 nanoseconds since the
+Unix epoch (UTC). Datetime objects are only built at reporting/export time.
+
+Timezones are passed around as IANA names (what feeds store and caches
+record) and resolved with get_tz() where a tzinfo is needed.
+"""
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional, Union
+from zoneinfo import ZoneInfo
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+
+# NSE local time (no DST): the default for feeds, bars and exports
+EXCHANGE_TZ_NAME = "Asia/Kolkata"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> tzinfo:
+    return ZoneInfo(name)
+
+
+def get_tz(tz: Union[str, tzinfo]) -> tzinfo:
+    """tzinfo for a zone name (a tzinfo is returned as is)"""
+    return _zone(tz) if isinstance(tz, str) else tz
+
+
+EXCHANGE_TZ = get_tz(EXCHANGE_TZ_NAME)
+
+
+def minute_of_day(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def from_datetime(dt: datetime, tz=EXCHANGE_TZ) -> int:
+    """Epoch nanoseconds; naive datetimes are taken as exchange-local time"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=get_tz(tz))
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * NS_PER_SECOND + delta.microseconds * 1000
+
+
+def to_datetime(ns: int, tz=EXCHANGE_TZ) -> datetime:
+    """Timezone-aware datetime (microsecond precision)"""
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).astimezone(get_tz(tz))
+
+
+def local_fields(dt: datetime, tz=EXCHANGE_TZ):
+    """(epoch ns, local minute of day, local day number) for one datetime"""
+    tz = get_tz(tz)
+    ns = from_datetime(dt, tz)
+    local = dt if dt.tzinfo is None else dt.astimezone(tz)
+    day = (local.date() - _EPOCH.date()).days
+    return ns, local.hour * 60 + local.minute, day
+
+
+def format_timestamp(ns: Optional[int], tz=EXCHANGE_TZ) -> str:
+    """Render an epoch-ns timestamp like '2015-01-09 09:15:00+05:30'"""
+    if ns is None:
+        return ""
+    return str(to_datetime(ns, tz))
+
+
+def utc_offset_ns(tz: Union[str, tzinfo] = EXCHANGE_TZ) -> int:
+    """
+    Fixed UTC offset of a timezone (name or tzinfo) in nanoseconds
+
+    Raises:
+        ValueError: If the zone's offset changes during the year (DST)
+    """
+    tz = get_tz(tz)
+    offsets = {tz.utcoffset(datetime(2015, month, 1)) for month in (1, 7)}
+    if len(offsets) > 1:
+        raise ValueError(f"Timezone {tz} has no fixed UTC offset (DST)")
+    offset, = offsets
+    return int(offset.total_seconds()) * NS_PER_SECOND
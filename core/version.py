@@ -0,0 +1,6 @@
+"""
+Package version - part of every result-cache fingerprint, so bump it
+whenever a change can alter backtest results or the layout of state
+saved in incremental-run checkpoints
+"""
+__version__ = "0.2.4"
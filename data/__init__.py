@@ -1,7 +1,16 @@
 """
 Data module
+
+MarketDataFeed is resolved lazily so importing `data.bar` (every strategy
+does) doesn't pull in numpy.
 """
 from .bar import Bar
-from .feed import MarketDataFeed
 
-__all__ = ['Bar', 'MarketDataFeed']
\ No newline at end of file
+__all__ = ['Bar', 'MarketDataFeed']
+
+
+def __getattr__(name):
+    if name == 'MarketDataFeed':
+        from .feed import MarketDataFeed
+        return MarketDataFeed
+    raise AttributeError(f"module 'data' has no attribute {name!r}")
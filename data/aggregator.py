@@ -0,0 +1,91 @@
+"""
+Incremental higher-timeframe bars built from the base (1-minute) feed
+
+Buckets are anchored at each session's first bar, so 15-minute bars on
+NSE cover 09:15-09:29, 09:30-09:44, ... and the last bucket of a session
+is closed at the session end even if it is short. A higher-timeframe bar
+is stamped with its first base bar's timestamp / minute (bars are stamped
+at their open) and is handed out on the base bar that completes it.
+"""
+from typing import Tuple
+
+from .bar import Bar
+
+
+class BarAggregator:
+
+    __slots__ = ("symbol", "minutes", "_day", "_anchor", "_bucket",
+                 "_timestamp", "_minute", "_open", "_high", "_low", "_close",
+                 "_volume", "_open_interest")
+
+    def __init__(self, symbol: str, minutes: int):
+        if minutes < 1:
+            raise ValueError(f"Invalid timeframe: {minutes}. Must be >= 1 minute")
+
+        self.symbol = symbol
+        self.minutes = minutes
+
+        self._day = None
+        self._anchor = 0
+        self._bucket = None   # None = no partial bar open
+
+        self._timestamp = 0
+        self._minute = 0
+        self._open = self._high = self._low = self._close = 0.0
+        self._volume = self._open_interest = 0.0
+
+    def update(self, bar: Bar, session_start: bool = False,
+               session_end: bool = False) -> Tuple[Bar, ...]:
+        """
+        Fold one base bar in
+
+        Returns:
+            Completed higher-timeframe bars (usually empty; two only when a
+            data gap closes the previous bucket and this bar ends its own)
+        """
+        completed = ()
+        minutes = self.minutes
+
+        if session_start or bar.session_day != self._day:
+            if self._bucket is not None:
+                completed = (self._emit(),)
+            self._day = bar.session_day
+            self._anchor = bar.minute_of_day
+
+        offset = bar.minute_of_day - self._anchor
+        bucket = offset // minutes
+
+        if self._bucket is not None and bucket != self._bucket:
+            # Missing base bars: the previous bucket is over
+            completed += (self._emit(),)
+
+        if self._bucket is None:
+            self._bucket = bucket
+            self._timestamp = bar.timestamp
+            self._minute = self._anchor + bucket * minutes
+            self._open = bar.open
+            self._high = bar.high
+            self._low = bar.low
+            self._volume = bar.volume
+        else:
+            if bar.high > self._high:
+                self._high = bar.high
+            if bar.low < self._low:
+                self._low = bar.low
+            self._volume += bar.volume
+        self._close = bar.close
+        self._open_interest = bar.open_interest
+
+        if session_end or offset % minutes == minutes - 1:
+            completed += (self._emit(),)
+
+        return completed
+
+    def _emit(self) -> Bar:
+        self._bucket = None
+        return Bar(self._timestamp, self.symbol, self._open, self._high, self._low,
+                   self._close, self._minute, self._day, self._volume, self._open_interest)
+
+    def reset(self):
+        self._day = None
+        self._bucket = None
@@ -1,12 +1,28 @@
 from dataclasses import dataclass
 from datetime import datetime
 
+from core.timestamps import EXCHANGE_TZ_NAME, local_fields
 
-@dataclass(frozen=True)
+
+@dataclass(slots=True)
 class Bar:
-    timestamp: datetime
+    """One OHLC bar; treat as read-only (not frozen to keep construction cheap)"""
+
+    timestamp: int       # Epoch nanoseconds (UTC)
     symbol: str
     open: float
     high: float
     low: float
     close: float
+    minute_of_day: int   # Exchange-local minute of day (9:15 -> 555)
+    session_day: int     # Exchange-local date as days since 1970-01-01
+    volume: float = 0.0          # 0 when the source has no volume column
+    open_interest: float = 0.0   # 0 when the source has no open-interest column
+
+    @classmethod
+    def from_datetime(cls, dt: datetime, symbol: str, open: float, high: float,
+                      low: float, close: float, tz=EXCHANGE_TZ_NAME,
+                      volume: float = 0.0, open_interest: float = 0.0) -> "Bar":
+        """Build a bar from a datetime (tests, notebooks, live adapters)"""
+        ns, minute, day = local_fields(dt, tz)
+        return cls(ns, symbol, open, high, low, close, minute, day, volume, open_interest)
@@ -0,0 +1,130 @@
+"""
+Market session calendar (trading hours, holidays, half-days)
+
+All vectorized helpers work on two parallel integer arrays computed once
+at load time:
+    days    - local session date as days since 1970-01-01
+    minutes - local minute of day (0..1439)
+"""
+from datetime import date, time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from core.timestamps import minute_of_day
+
+
+EPOCH = date(1970, 1, 1)
+
+# NSE closes on these dates every year when they fall on a weekday
+NSE_FIXED_HOLIDAYS = ((1, 26), (5, 1), (8, 15), (10, 2), (12, 25))
+
+
+def day_number(d: date) -> int:
+    """Days since 1970-01-01"""
+    return (d - EPOCH).days
+
+
+class SessionCalendar:
+
+    def __init__(self,
+                 open_time: time = time(9, 15),
+                 close_time: time = time(15, 30),
+                 holidays: Iterable[date] = (),
+                 half_days: Optional[Dict[date, time]] = None,
+                 fixed_holidays: Iterable[Tuple[int, int]] = (),
+                 weekend: Iterable[int] = (5, 6)):
+        """
+        Args:
+            open_time: Session open (local time)
+            close_time: Session close (local time, exclusive)
+            holidays: Full closures
+            half_days: Date -> early close time
+            fixed_holidays: (month, day) closures repeated every year
+            weekend: Weekday numbers (Monday=0) with no session
+        """
+        self.open_minute = minute_of_day(open_time)
+        self.close_minute = minute_of_day(close_time)
+        self.holidays = set(holidays)
+        self.half_days = dict(half_days or {})
+        self.fixed_holidays = tuple(fixed_holidays)
+        self.weekend = tuple(weekend)
+
+    # ------------------------------------------------------------
+    # Scalar queries
+    # ------------------------------------------------------------
+    def is_trading_day(self, d: date) -> bool:
+        if d.weekday() in self.weekend or d in self.holidays:
+            return False
+        return (d.month, d.day) not in self.fixed_holidays
+
+    def session_close(self, d: date) -> int:
+        """Close minute-of-day for a date (early close on half-days)"""
+        early = self.half_days.get(d)
+        return minute_of_day(early) if early is not None else self.close_minute
+
+    # ------------------------------------------------------------
+    # Vectorized helpers
+    # ------------------------------------------------------------
+    def session_mask(self, days: np.ndarray, minutes: np.ndarray) -> np.ndarray:
+        """Boolean mask of bars inside a trading session"""
+        days = np.asarray(days, dtype=np.int64)
+        minutes = np.asarray(minutes)
+
+        # 1970-01-01 was a Thursday (weekday 3)
+        weekday = (days + 3) % 7
+        mask = ~np.isin(weekday, self.weekend)
+
+        closed = [day_number(d) for d in self._closed_days(days)]
+        if closed:
+            mask &= ~np.isin(days, closed)
+
+        close = np.full(len(days), self.close_minute, dtype=np.int64)
+        for d, t in self.half_days.items():
+            close[days == day_number(d)] = minute_of_day(t)
+
+        mask &= (minutes >= self.open_minute) & (minutes < close)
+        return mask
+
+    def _closed_days(self, days: np.ndarray):
+        closed = set(self.holidays)
+        if self.fixed_holidays and len(days):
+            first = date.fromordinal(EPOCH.toordinal() + int(days.min()))
+            last = date.fromordinal(EPOCH.toordinal() + int(days.max()))
+            for year in range(first.year, last.year + 1):
+                for month, day in self.fixed_holidays:
+                    closed.add(date(year, month, day))
+        return closed
+
+    @staticmethod
+    def session_bounds(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices of the first and last bar of every session.
+
+        Args:
+            days: Session day number per bar, sorted ascending
+
+        Returns:
+            (starts, ends) integer index arrays of equal length
+        """
+        days = np.asarray(days)
+        if len(days) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        change = np.flatnonzero(days[1:] != days[:-1]) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change - 1, [len(days) - 1]))
+        return starts, ends
+
+
+def nse_calendar(holidays: Iterable[date] = (),
+                 half_days: Optional[Dict[date, time]] = None) -> SessionCalendar:
+    """NSE equity session 09:15-15:30 IST with its fixed-date holidays"""
+    return SessionCalendar(
+        open_time=time(9, 15),
+        close_time=time(15, 30),
+        holidays=holidays,
+        half_days=half_days,
+        fixed_holidays=NSE_FIXED_HOLIDAYS,
+    )
@@ -1,67 +1,292 @@
 """
 Market data feed - iterates bar-by-bar
+
+pandas is only imported when a CSV has to be parsed; the binary .npz
+cache is read with numpy alone, which keeps worker start-up cheap.
 """
-import pandas as pd
-from typing import Iterator, Optional
+import hashlib
+import numpy as np
+from typing import Iterator, Optional, Union
 from pathlib import Path
-from datetime import datetime
+from core.timestamps import EXCHANGE_TZ_NAME
 from .bar import Bar
+from .calendar import SessionCalendar
+
+
+BASE_COLUMNS = ('timestamps', 'opens', 'highs', 'lows', 'closes', 'minutes', 'session_days')
+
+# Optional per-bar columns: attribute -> accepted CSV headers
+OPTIONAL_COLUMNS = {
+    'volumes': ('volume',),
+    'open_interests': ('open_interest', 'oi'),
+}
 
 
 class MarketDataFeed:
-   
-    def __init__(self, csv_path: str, symbol: str):
-        
+
+    def __init__(self, csv_path: str, symbol: str,
+                 calendar: Optional[SessionCalendar] = None,
+                 tz: str = EXCHANGE_TZ_NAME,
+                 cache: Union[bool, str] = False):
+        """
+        Args:
+            csv_path: OHLC CSV (or a .npz cache written by save_cache)
+            symbol: Symbol stamped on every bar
+            calendar: Optional session calendar to drop out-of-session bars
+            tz: Exchange timezone (naive CSV timestamps are taken as local)
+            cache: True to keep a binary cache next to the CSV, or a cache path
+        """
         self.csv_path = Path(csv_path)
         self.symbol = symbol
-        self.data: Optional[pd.DataFrame] = None
+        self.calendar = calendar
+        self.tz = tz
+        if cache is True:
+            self.cache_path: Optional[Path] = self.csv_path.with_suffix(".bars.npz")
+        else:
+            self.cache_path = Path(cache) if cache else None
         self._current_index = 0
-        
+
+        # Columnar data: epoch-ns timestamps and float64 prices
+        self.timestamps: Optional[np.ndarray] = None
+        self.opens: Optional[np.ndarray] = None
+        self.highs: Optional[np.ndarray] = None
+        self.lows: Optional[np.ndarray] = None
+        self.closes: Optional[np.ndarray] = None
+
+        # Optional columns (None when the source doesn't have them)
+        self.volumes: Optional[np.ndarray] = None
+        self.open_interests: Optional[np.ndarray] = None
+
+        # Local session date (days since epoch) and minute of day per bar
+        self.session_days: Optional[np.ndarray] = None
+        self.minutes: Optional[np.ndarray] = None
+
+        # Index of the first / last bar of each session
+        self.session_starts: Optional[np.ndarray] = None
+        self.session_ends: Optional[np.ndarray] = None
+
+        # Rows of the parsed CSV were already in time order (append-only files)
+        self.source_sorted: Optional[bool] = None
+
+        self._rows = None
+        self._content_hash: Optional[str] = None
+
+    @classmethod
+    def from_arrays(cls, symbol: str, timestamps, opens, highs, lows, closes,
+                    minutes, session_days, volumes=None, open_interests=None,
+                    calendar: Optional[SessionCalendar] = None,
+                    tz: str = EXCHANGE_TZ_NAME,
+                    source: str = "<memory>") -> "MarketDataFeed":
+        """Feed over columns that are already in memory (no file involved)"""
+        feed = cls(source, symbol, calendar=calendar, tz=tz)
+        feed.timestamps = np.asarray(timestamps, dtype=np.int64)
+        feed.opens = np.asarray(opens, dtype=np.float64)
+        feed.highs = np.asarray(highs, dtype=np.float64)
+        feed.lows = np.asarray(lows, dtype=np.float64)
+        feed.closes = np.asarray(closes, dtype=np.float64)
+        feed.minutes = np.asarray(minutes, dtype=np.int64)
+        feed.session_days = np.asarray(session_days, dtype=np.int64)
+        if volumes is not None:
+            feed.volumes = np.asarray(volumes, dtype=np.float64)
+        if open_interests is not None:
+            feed.open_interests = np.asarray(open_interests, dtype=np.float64)
+        feed._build_sessions()
+        return feed
+
     def load(self):
-        """Load CSV into memory"""
+        """Load bars into memory (binary cache when fresh, else parse the CSV)"""
         if not self.csv_path.exists():
             raise FileNotFoundError(f"Data file not found: {self.csv_path}")
-        
-        self.data = pd.read_csv(self.csv_path)
-        
+
+        if self.csv_path.suffix == ".npz":
+            self.load_cache(self.csv_path)
+        elif self.cache_path is not None and self._cache_is_fresh():
+            self.load_cache(self.cache_path)
+        else:
+            self._parse_csv()
+            if self.cache_path is not None:
+                self.save_cache(self.cache_path)
+
+        self._build_sessions()
+
+        print(f"✅ Loaded {len(self)} bars from {self.csv_path}")
+
+    def _parse_csv(self, source=None):
+        """Parse the CSV (or a file-like `source` in the same format) into columnar arrays"""
+        import pandas as pd
+
+        data = pd.read_csv(self.csv_path if source is None else source)
+
         # Ensure timestamp column exists
-        if 'timestamp' not in self.data.columns:
+        if 'timestamp' not in data.columns:
             raise ValueError("CSV must have 'timestamp' column")
-        
-        # Convert timestamp to datetime
-        self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
-        
+
+        # Convert timestamp to UTC epoch nanoseconds + exchange-local wall clock
+        ts = pd.to_datetime(data['timestamp'])
+        if ts.dt.tz is None:
+            ts = ts.dt.tz_localize(self.tz)
+        else:
+            ts = ts.dt.tz_convert(self.tz)
+
+        local = ts.dt.tz_localize(None).values.astype('datetime64[m]').astype(np.int64)
+        utc = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+        timestamps = utc.values.astype('datetime64[ns]').astype(np.int64)
+
         # Sort by timestamp
-        self.data = self.data.sort_values('timestamp').reset_index(drop=True)
-        
-        print(f"✅ Loaded {len(self.data)} bars from {self.csv_path}")
-        
+        self.source_sorted = bool((timestamps[1:] >= timestamps[:-1]).all())
+        order = np.argsort(timestamps, kind='stable')
+
+        self.timestamps = timestamps[order]
+        self.opens = data['open'].to_numpy(dtype=np.float64)[order]
+        self.highs = data['high'].to_numpy(dtype=np.float64)[order]
+        self.lows = data['low'].to_numpy(dtype=np.float64)[order]
+        self.closes = data['close'].to_numpy(dtype=np.float64)[order]
+
+        for name, headers in OPTIONAL_COLUMNS.items():
+            header = next((h for h in headers if h in data.columns), None)
+            values = None
+            if header is not None:
+                values = data[header].to_numpy(dtype=np.float64)[order]
+            setattr(self, name, values)
+
+        local = local[order]
+        self.session_days = local // 1440
+        self.minutes = local - self.session_days * 1440
+
+    # ------------------------------------------------------------
+    # Binary cache
+    # ------------------------------------------------------------
+    def save_cache(self, path: Union[str, Path]):
+        """Write the columnar arrays (pre-calendar) to an .npz file"""
+        # In-memory feeds have no source file to validate against
+        if self.csv_path.exists():
+            stat = self.csv_path.stat()
+            size, mtime = stat.st_size, stat.st_mtime_ns
+        else:
+            size = mtime = -1
+        optional = {name: getattr(self, name) for name in OPTIONAL_COLUMNS
+                    if getattr(self, name) is not None}
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                timestamps=self.timestamps, opens=self.opens, highs=self.highs,
+                lows=self.lows, closes=self.closes, minutes=self.minutes,
+                session_days=self.session_days, **optional,
+                source_size=np.int64(size),
+                source_mtime_ns=np.int64(mtime),
+                tz=np.str_(self.tz),
+            )
+
+    def load_cache(self, path: Union[str, Path]):
+        """Read columnar arrays from an .npz cache"""
+        with np.load(path) as data:
+            for name in BASE_COLUMNS:
+                setattr(self, name, data[name])
+            for name in OPTIONAL_COLUMNS:
+                setattr(self, name, data[name] if name in data.files else None)
+
+    def _cache_is_fresh(self) -> bool:
+        """Cache exists and was written from the current CSV contents"""
+        if not self.cache_path.exists():
+            return False
+        stat = self.csv_path.stat()
+        with np.load(self.cache_path) as data:
+            return (int(data['source_size']) == stat.st_size
+                    and int(data['source_mtime_ns']) == stat.st_mtime_ns
+                    and str(data['tz']) == self.tz)
+
+    def _build_sessions(self):
+        """Precompute session segmentation (and drop out-of-session bars)"""
+        if self.calendar is not None:
+            mask = self.calendar.session_mask(self.session_days, self.minutes)
+            if not mask.all():
+                for name in self._columns():
+                    setattr(self, name, getattr(self, name)[mask])
+
+        self.session_starts, self.session_ends = \
+            SessionCalendar.session_bounds(self.session_days)
+        self._rows = None
+        self._content_hash = None
+
+    def content_hash(self) -> str:
+        """sha256 of the loaded bars (independent of file path / format)"""
+        if self.timestamps is None:
+            raise RuntimeError("Data not loaded. Call load() first.")
+
+        if self._content_hash is None:
+            digest = hashlib.sha256(self.symbol.encode())
+            for name in self._columns():
+                digest.update(name.encode())
+                digest.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def _columns(self):
+        """Names of the per-bar columns present (base + loaded optional ones)"""
+        return BASE_COLUMNS + tuple(
+            name for name in OPTIONAL_COLUMNS if getattr(self, name) is not None
+        )
+
+    def to_frame(self):
+        """Columns as a DataFrame with exchange-local timestamps (reporting only)"""
+        import pandas as pd
+
+        frame = pd.DataFrame({
+            'timestamp': pd.to_datetime(self.timestamps, utc=True).tz_convert(self.tz),
+            'open': self.opens,
+            'high': self.highs,
+            'low': self.lows,
+            'close': self.closes,
+        })
+        for name, headers in OPTIONAL_COLUMNS.items():
+            if getattr(self, name) is not None:
+                frame[headers[0]] = getattr(self, name)
+        return frame
+
     def __iter__(self) -> Iterator[Bar]:
         """Iterator protocol"""
-        if self.data is None:
+        if self.timestamps is None:
             raise RuntimeError("Data not loaded. Call load() first.")
-        
+
+        # Plain Python lists: per-bar list indexing is much cheaper than numpy scalars
+        if self._rows is None:
+            self._rows = self._row_lists(0, len(self.timestamps))
+
         self._current_index = 0
         return self
-    
+
+    def _row_lists(self, start: int, end: int):
+        """Columns [start, end) as Python lists (the layout __next__ reads)"""
+        rows = slice(start, end)
+        extra = None
+        if self.volumes is not None or self.open_interests is not None:
+            zeros = [0.0] * (end - start)
+            extra = tuple(
+                getattr(self, name)[rows].tolist() if getattr(self, name) is not None else zeros
+                for name in OPTIONAL_COLUMNS
+            )
+        return (
+            self.timestamps[rows].tolist(), self.opens[rows].tolist(), self.highs[rows].tolist(),
+            self.lows[rows].tolist(), self.closes[rows].tolist(), self.minutes[rows].tolist(),
+            self.session_days[rows].tolist(), extra,
+        )
+
     def __next__(self) -> Bar:
         """Get next bar"""
-        if self._current_index >= len(self.data):
+        i = self._current_index
+        if i >= len(self.timestamps):
             raise StopIteration
-        
-        row = self.data.iloc[self._current_index]
-        self._current_index += 1
-        
-        return Bar(
-            symbol=self.symbol,
-            timestamp=row['timestamp'],
-            open=float(row['open']),
-            high=float(row['high']),
-            low=float(row['low']),
-            close=float(row['close']),
-            
-        )
-    
+
+        self._current_index = i + 1
+        ts, o, h, l, c, minute, day, extra = self._rows
+
+        if extra is None:
+            return Bar(ts[i], self.symbol, o[i], h[i], l[i], c[i], minute[i], day[i])
+
+        volume, oi = extra
+        return Bar(ts[i], self.symbol, o[i], h[i], l[i], c[i], minute[i], day[i],
+                   volume[i], oi[i])
+
     def __len__(self) -> int:
         """Total number of bars"""
-        return len(self.data) if self.data is not None else 0
\ No newline at end of file
+        return len(self.timestamps) if self.timestamps is not None else 0
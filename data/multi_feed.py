@@ -0,0 +1,119 @@
+"""
+Several single-symbol feeds merged into one time-ordered bar stream
+
+    feed = MultiSymbolFeed([nifty, banknifty])
+    engine = BacktestEngine(feed, strategies, ...)
+
+Bars with equal timestamps come out in the order the feeds were given.
+Session starts / ends are each symbol's own (mapped to merged indices);
+day_starts marks the first bar of each exchange day across all symbols.
+The source feeds stay available in `feeds` (engine.sharding runs them
+one per process).
+"""
+from typing import Iterable, List, Mapping, Union
+
+import numpy as np
+
+from .bar import Bar
+from .feed import BASE_COLUMNS, OPTIONAL_COLUMNS, MarketDataFeed
+
+
+FeedsArg = Union[Mapping[str, MarketDataFeed], Iterable[MarketDataFeed]]
+
+
+class MultiSymbolFeed(MarketDataFeed):
+
+    def __init__(self, feeds: FeedsArg):
+        """
+        Args:
+            feeds: Single-symbol feeds (loaded here if they aren't yet)
+        """
+        if isinstance(feeds, Mapping):
+            feeds = list(feeds.values())
+        feeds: List[MarketDataFeed] = list(feeds)
+        if not feeds:
+            raise ValueError("MultiSymbolFeed needs at least one feed")
+
+        symbols = [feed.symbol for feed in feeds]
+        if len(set(symbols)) != len(symbols):
+            raise ValueError(f"Duplicate symbols: {symbols}")
+        if len({feed.tz for feed in feeds}) > 1:
+            raise ValueError("All feeds must use the same exchange timezone")
+
+        super().__init__(f"<merged:{'+'.join(symbols)}>", "+".join(symbols), tz=feeds[0].tz)
+        self.symbols = symbols
+        self.feeds = {feed.symbol: feed for feed in feeds}
+
+        self.symbol_codes = None
+        self.day_starts = None
+        self.load()
+
+    def load(self):
+        """Load any unloaded source feed and (re)build the merged columns"""
+        for feed in self.feeds.values():
+            if feed.timestamps is None:
+                feed.load()
+        self._merge()
+
+    def _merge(self):
+        feeds = list(self.feeds.values())
+        lengths = [len(feed) for feed in feeds]
+        n = sum(lengths)
+
+        # Stable sort: equal timestamps keep the feed order
+        codes = np.repeat(np.arange(len(feeds), dtype=np.int32), lengths)
+        order = np.argsort(np.concatenate([feed.timestamps for feed in feeds]), kind="stable")
+
+        for name in BASE_COLUMNS:
+            setattr(self, name, np.concatenate([getattr(feed, name) for feed in feeds])[order])
+        for name in OPTIONAL_COLUMNS:
+            if all(getattr(feed, name) is None for feed in feeds):
+                setattr(self, name, None)
+                continue
+            values = [getattr(feed, name) if getattr(feed, name) is not None
+                      else np.zeros(len(feed)) for feed in feeds]
+            setattr(self, name, np.concatenate(values)[order])
+        self.symbol_codes = codes[order]
+
+        # Merged index of every source row
+        position = np.empty(n, dtype=np.int64)
+        position[order] = np.arange(n)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self.session_starts = np.sort(np.concatenate(
+            [position[offset + feed.session_starts] for feed, offset in zip(feeds, offsets)]))
+        self.session_ends = np.sort(np.concatenate(
+            [position[offset + feed.session_ends] for feed, offset in zip(feeds, offsets)]))
+
+        days = self.session_days
+        self.day_starts = np.flatnonzero(np.concatenate(([n > 0], days[1:] != days[:-1])))
+
+        self._rows = None
+        self._content_hash = None
+
+    def _columns(self):
+        return super()._columns() + ("symbol_codes",)
+
+    def __iter__(self):
+        if self.timestamps is None:
+            raise RuntimeError("Data not loaded. Call load() first.")
+        if self._rows is None:
+            names = np.array(self.symbols, dtype=object)
+            self._rows = self._row_lists(0, len(self.timestamps)) + (
+                names[self.symbol_codes].tolist(),)
+        self._current_index = 0
+        return self
+
+    def __next__(self) -> Bar:
+        i = self._current_index
+        if i >= len(self.timestamps):
+            raise StopIteration
+
+        self._current_index = i + 1
+        ts, o, h, l, c, minute, day, extra, symbols = self._rows
+
+        if extra is None:
+            return Bar(ts[i], symbols[i], o[i], h[i], l[i], c[i], minute[i], day[i])
+
+        volume, oi = extra
+        return Bar(ts[i], symbols[i], o[i], h[i], l[i], c[i], minute[i], day[i],
+                   volume[i], oi[i])
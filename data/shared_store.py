@@ -0,0 +1,252 @@
+"""
+Bars in POSIX shared memory for concurrent research workers
+
+One process publishes the columns of a set of feeds into a named
+shared-memory block; notebooks and sweep workers attach by name and get
+read-only MarketDataFeeds whose arrays point straight into the block, so
+N workers use about one copy of the data instead of N:
+
+    # publisher (keeps the block alive until it exits / unlinks)
+    store = SharedBarStore.create([nifty, banknifty], name="bars_2015")
+
+    # any worker
+    store = SharedBarStore.attach("bars_2015")
+    feed = store.feed("NIFTY")
+
+Block layout: an 8-byte header length, a JSON header (symbol -> column ->
+offset / dtype / length), then every column 64-byte aligned.
+"""
+import json
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from core.timestamps import EXCHANGE_TZ_NAME
+from .bar import Bar
+from .calendar import SessionCalendar
+from .feed import MarketDataFeed
+
+
+ALIGNMENT = 64
+_LENGTH = struct.Struct("<Q")
+
+FeedsArg = Union[Mapping[str, MarketDataFeed], Iterable[MarketDataFeed]]
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+
+    # Older versions register every attach with the resource tracker, which
+    # then unlinks the block when the attaching worker exits
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedFeed(MarketDataFeed):
+    """
+    Read-only feed over columns in a SharedBarStore
+
+    Bars are turned into Python lists `chunk_rows` at a time instead of all
+    at once, so iterating doesn't build a private copy of the whole feed.
+    """
+
+    chunk_rows = 65_536
+
+    def __init__(self, store: "SharedBarStore", symbol: str,
+                 calendar: Optional[SessionCalendar] = None,
+                 tz: str = EXCHANGE_TZ_NAME):
+        super().__init__(f"<shared:{store.name}/{symbol}>", symbol, calendar=calendar, tz=tz)
+        self.store = store   # keeps the mapping alive while the feed is
+        self._chunk_start = self._chunk_end = 0
+
+    def load(self):
+        """Nothing to read: the columns are already mapped"""
+
+    def __iter__(self):
+        if self.timestamps is None:
+            raise RuntimeError("Data not loaded. Call load() first.")
+        self._current_index = 0
+        self._chunk_start = self._chunk_end = 0
+        return self
+
+    def __next__(self):
+        i = self._current_index
+        if i >= self._chunk_end:
+            n = len(self.timestamps)
+            if i >= n:
+                raise StopIteration
+            end = min(i + self.chunk_rows, n)
+            self._rows = self._row_lists(i, end)
+            self._chunk_start, self._chunk_end = i, end
+
+        self._current_index = i + 1
+        j = i - self._chunk_start
+        ts, o, h, l, c, minute, day, extra = self._rows
+
+        if extra is None:
+            return Bar(ts[j], self.symbol, o[j], h[j], l[j], c[j], minute[j], day[j])
+
+        volume, oi = extra
+        return Bar(ts[j], self.symbol, o[j], h[j], l[j], c[j], minute[j], day[j],
+                   volume[j], oi[j])
+
+
+class SharedBarStore:
+
+    def __init__(self, shm: shared_memory.SharedMemory, header: Dict, owner: bool):
+        self._shm = shm
+        self.header = header
+        self.owner = owner
+        self._closed = False
+
+    # ------------------------------------------------------------
+    # Publish / attach
+    # ------------------------------------------------------------
+    @classmethod
+    def create(cls, feeds: FeedsArg, name: Optional[str] = None) -> "SharedBarStore":
+        """
+        Copy the feeds' columns into a new shared block (loading them first
+        if needed). The creating store owns the block: unlink() or leaving
+        a `with` block removes it.
+        """
+        if isinstance(feeds, Mapping):
+            feeds = list(feeds.values())
+        feeds: List[MarketDataFeed] = list(feeds)
+
+        symbols = {}
+        offset = 0
+        for feed in feeds:
+            if feed.symbol in symbols:
+                raise ValueError(f"Duplicate symbol in shared store: {feed.symbol}")
+            if feed.timestamps is None:
+                feed.load()
+
+            columns = {}
+            for column in feed._columns():
+                values = getattr(feed, column)
+                offset = _align(offset)
+                columns[column] = {"offset": offset, "dtype": values.dtype.str}
+                offset += values.nbytes
+            symbols[feed.symbol] = {"length": len(feed), "tz": feed.tz, "columns": columns}
+
+        header = {"symbols": symbols}
+        encoded = json.dumps(header).encode()
+        data_start = _align(_LENGTH.size + len(encoded))
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(data_start + offset, 1))
+        try:
+            _LENGTH.pack_into(shm.buf, 0, len(encoded))
+            shm.buf[_LENGTH.size:_LENGTH.size + len(encoded)] = encoded
+            header["data_start"] = data_start
+
+            store = cls(shm, header, owner=True)
+            for feed in feeds:
+                for column, view in store._views(feed.symbol, writeable=True).items():
+                    view[:] = getattr(feed, column)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return store
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedBarStore":
+        """Map an existing store read-only (raises FileNotFoundError if absent)"""
+        shm = _open(name)
+        (length,) = _LENGTH.unpack_from(shm.buf, 0)
+        header = json.loads(bytes(shm.buf[_LENGTH.size:_LENGTH.size + length]))
+        header["data_start"] = _align(_LENGTH.size + length)
+        return cls(shm, header, owner=False)
+
+    # ------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.header["symbols"])
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    def _views(self, symbol: str, writeable: bool = False) -> Dict[str, np.ndarray]:
+        if self._closed:
+            raise RuntimeError("Shared store is closed")
+        if symbol not in self.header["symbols"]:
+            raise KeyError(f"Unknown symbol: {symbol}. Available: {self.symbols}")
+
+        entry = self.header["symbols"][symbol]
+        start = self.header["data_start"]
+        views = {}
+        for column, spec in entry["columns"].items():
+            view = np.ndarray(entry["length"], dtype=np.dtype(spec["dtype"]),
+                              buffer=self._shm.buf, offset=start + spec["offset"])
+            view.flags.writeable = writeable
+            views[column] = view
+        return views
+
+    def feed(self, symbol: str, calendar: Optional[SessionCalendar] = None) -> SharedFeed:
+        """
+        Zero-copy, read-only feed for one symbol
+
+        A calendar filter has to copy the in-session rows, so pass one only
+        when the published bars still contain out-of-session rows.
+        """
+        feed = SharedFeed(self, symbol, calendar=calendar,
+                          tz=self.header["symbols"].get(symbol, {}).get("tz", EXCHANGE_TZ_NAME))
+        for column, view in self._views(symbol).items():
+            setattr(feed, column, view)
+        feed._build_sessions()
+        return feed
+
+    def feeds(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, SharedFeed]:
+        return {symbol: self.feed(symbol) for symbol in (symbols or self.symbols)}
+
+    # ------------------------------------------------------------
+    # Lifetime
+    # ------------------------------------------------------------
+    def close(self):
+        """
+        Unmap the block in this process. Feeds handed out must be dropped
+        first (numpy views into a closed mapping are not allowed).
+        """
+        if not self._closed:
+            self._shm.close()
+            self._closed = True
+
+    def unlink(self):
+        """Remove the block (owner only); attached workers keep their mapping"""
+        if not self.owner:
+            raise RuntimeError("Only the creating process can unlink a shared store")
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedBarStore":
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.close()
+        finally:
+            if self.owner:
+                self.unlink()
+
+    def __repr__(self) -> str:
+        return f"SharedBarStore({self.name!r}, symbols={self.symbols}, {self.nbytes:,} bytes)"
@@ -0,0 +1,266 @@
+"""
+Deterministic synthetic 1-minute OHLC bars for benchmarks and scale tests
+
+Everything is generated with whole-array numpy operations (no per-bar
+Python), so ten million bars take a few seconds:
+
+    market = SyntheticMarket(n_bars=10_000_000, seed=7)
+    feed = market.feed("NIFTY")                # in-memory MarketDataFeed
+    market.write_cache("NIFTY", "nifty.npz")   # MarketDataFeed("nifty.npz", ...)
+    market.write_csv("NIFTY", "nifty.csv")
+
+Price model per bar (log space):
+    close = open * exp((mu - sigma^2 / 2) dt + sigma sqrt(dt) z)
+with sigma scaled by a U-shaped intraday volatility smile and, for the
+"regime" model, by a calm/volatile Markov regime drawn per day. The first
+bar of each session opens with an overnight gap from the previous close.
+"""
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from core.timestamps import EXCHANGE_TZ_NAME, NS_PER_MINUTE, utc_offset_ns
+from .calendar import SessionCalendar, day_number, nse_calendar
+from .feed import MarketDataFeed
+
+
+MINUTES_PER_YEAR = 252 * 375
+
+COLUMNS = ('timestamps', 'opens', 'highs', 'lows', 'closes', 'minutes', 'session_days')
+
+
+class SyntheticMarket:
+
+    MODELS = ("gbm", "regime")
+
+    def __init__(self,
+                 start: date = date(2015, 1, 1),
+                 years: float = 1.0,
+                 n_bars: Optional[int] = None,
+                 calendar: Optional[SessionCalendar] = None,
+                 model: str = "gbm",
+                 start_price: float = 18000.0,
+                 annual_drift: float = 0.08,
+                 annual_vol: float = 0.18,
+                 smile: float = 1.5,
+                 gap_vol: float = 0.004,
+                 regime_vol_multiplier: float = 2.5,
+                 regime_switch_prob: float = 0.05,
+                 tick_size: float = 0.05,
+                 base_volume: float = 5000.0,
+                 tz: str = EXCHANGE_TZ_NAME,
+                 seed: int = 42):
+        """
+        Args:
+            start: First calendar date
+            years: Length of the sample (ignored when n_bars is given)
+            n_bars: Exact number of bars per symbol
+            calendar: Session calendar (default: NSE 09:15-15:30 IST)
+            model: "gbm" or "regime" (calm/volatile switching)
+            start_price: First open
+            annual_drift / annual_vol: GBM parameters
+            smile: Extra volatility at the open/close vs. midday
+            gap_vol: Stdev of the overnight log gap
+            regime_vol_multiplier: Volatility scale in the volatile regime
+            regime_switch_prob: Per-day probability of leaving a regime
+            tick_size: Prices are rounded to this tick
+            base_volume: Mean volume per bar (0 = no volume column)
+            tz: Exchange timezone the calendar's session times are in
+            seed: Same seed + symbol -> identical bars
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Invalid model: {model}. Must be one of {self.MODELS}")
+
+        self.start = start
+        self.years = years
+        self.n_bars = n_bars
+        self.calendar = calendar or nse_calendar()
+        self.model = model
+        self.start_price = start_price
+        self.annual_drift = annual_drift
+        self.annual_vol = annual_vol
+        self.smile = smile
+        self.gap_vol = gap_vol
+        self.regime_vol_multiplier = regime_vol_multiplier
+        self.regime_switch_prob = regime_switch_prob
+        self.tick_size = tick_size
+        self.base_volume = base_volume
+        self.tz = tz
+        self._offset = utc_offset_ns(tz) // NS_PER_MINUTE
+        self.seed = seed
+
+        self._grid = None
+
+    # ------------------------------------------------------------
+    # Session grid (shared by every symbol)
+    # ------------------------------------------------------------
+    def _session_grid(self):
+        """(session_days, minutes, first-bar-of-session flags) for every bar"""
+        if self._grid is not None:
+            return self._grid
+
+        cal = self.calendar
+        first = day_number(self.start)
+        if self.n_bars is not None:
+            # ~250 sessions per 365 days plus slack for holidays / half-days
+            span = int(self.n_bars / (cal.close_minute - cal.open_minute) * 365 / 240) + 30
+        else:
+            span = int(round(self.years * 365.25))
+
+        days = np.arange(first, first + span, dtype=np.int64)
+        opens = np.full(len(days), cal.open_minute, dtype=np.int64)
+        days = days[cal.session_mask(days, opens)]
+
+        closes = np.full(len(days), cal.close_minute, dtype=np.int64)
+        for d, t in cal.half_days.items():
+            closes[days == day_number(d)] = t.hour * 60 + t.minute
+        counts = closes - cal.open_minute
+
+        total = int(counts.sum())
+        if self.n_bars is not None:
+            if total < self.n_bars:
+                raise ValueError("Session grid too short for n_bars")
+            total = self.n_bars
+
+        session_days = np.repeat(days, counts)[:total]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        offset = np.arange(total, dtype=np.int64) - np.repeat(starts, counts)[:total]
+        minutes = cal.open_minute + offset
+
+        self._grid = (session_days, minutes, offset == 0)
+        return self._grid
+
+    def _rng(self, symbol: str) -> np.random.Generator:
+        # Independent, order-free stream per symbol
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+
+    # ------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------
+    def arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Columnar bars for one symbol (MarketDataFeed column names)"""
+        session_days, minutes, session_open = self._session_grid()
+        n = len(minutes)
+        rng = self._rng(symbol)
+        cal = self.calendar
+
+        # Intraday U-shaped volatility, normalized to mean 1 over a session
+        x = (minutes - cal.open_minute) / max(cal.close_minute - cal.open_minute - 1, 1)
+        sigma = (1.0 + self.smile * (2.0 * x - 1.0) ** 2) / (1.0 + self.smile / 3.0)
+        sigma *= self.annual_vol / np.sqrt(MINUTES_PER_YEAR)
+
+        mu = np.full(n, self.annual_drift / MINUTES_PER_YEAR)
+
+        if self.model == "regime":
+            volatile = self._regimes(rng, session_days)
+            sigma = np.where(volatile, sigma * self.regime_vol_multiplier, sigma)
+            mu = np.where(volatile, -mu, mu)
+
+        z = rng.standard_normal((3, n))
+        returns = mu - 0.5 * sigma ** 2 + sigma * z[0]
+
+        gaps = np.where(session_open, self.gap_vol * rng.standard_normal(n), 0.0)
+        gaps[0] = 0.0
+
+        log_close = np.log(self.start_price) + np.cumsum(returns + gaps)
+        log_open = log_close - returns
+
+        opens = np.exp(log_open)
+        closes = np.exp(log_close)
+        body_high = np.maximum(opens, closes)
+        body_low = np.minimum(opens, closes)
+        highs = body_high * np.exp(0.5 * sigma * np.abs(z[1]))
+        lows = body_low * np.exp(-0.5 * sigma * np.abs(z[2]))
+
+        if self.tick_size:
+            tick = self.tick_size
+            opens, highs, lows, closes = (
+                np.round(a / tick) * tick for a in (opens, highs, lows, closes)
+            )
+            # Keep high/low outside the body after rounding
+            highs = np.maximum(highs, np.maximum(opens, closes))
+            lows = np.minimum(lows, np.minimum(opens, closes))
+
+        timestamps = (session_days * 1440 + minutes - self._offset) * NS_PER_MINUTE
+
+        bars = {
+            'timestamps': timestamps,
+            'opens': opens,
+            'highs': highs,
+            'lows': lows,
+            'closes': closes,
+            'minutes': minutes,
+            'session_days': session_days,
+        }
+
+        if self.base_volume:
+            # Same U-shape as volatility, lognormal noise (mean base_volume)
+            shape = sigma / sigma.mean()
+            noise = rng.lognormal(-0.125, 0.5, n)
+            bars['volumes'] = np.round(self.base_volume * shape * noise)
+
+        return bars
+
+    def _regimes(self, rng: np.random.Generator, session_days: np.ndarray) -> np.ndarray:
+        """Per-bar volatile flag from a two-state regime drawn per session"""
+        unique_days, day_index = np.unique(session_days, return_inverse=True)
+        n_days = len(unique_days)
+
+        # Geometric run lengths, alternating calm / volatile
+        lengths = rng.geometric(self.regime_switch_prob, size=n_days)
+        states = np.arange(n_days) % 2 == 1
+        per_day = np.repeat(states, lengths)[:n_days]
+        return per_day[day_index]
+
+    def feed(self, symbol: str) -> MarketDataFeed:
+        """In-memory feed for one symbol"""
+        return MarketDataFeed.from_arrays(symbol, **self.arrays(symbol), tz=self.tz,
+                                          source=f"<synthetic:{symbol}>")
+
+    def feeds(self, symbols: Iterable[str]) -> Dict[str, MarketDataFeed]:
+        return {symbol: self.feed(symbol) for symbol in symbols}
+
+    # ------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------
+    def write_cache(self, symbol: str, path: Union[str, Path]):
+        """Write the binary .npz format MarketDataFeed loads directly"""
+        data = self.arrays(symbol)
+        with open(path, "wb") as f:
+            np.savez(
+                f, **data,
+                source_size=np.int64(-1),
+                source_mtime_ns=np.int64(-1),
+                tz=np.str_(self.tz),
+            )
+
+    def write_csv(self, symbol: str, path: Union[str, Path], chunk_size: int = 1_000_000):
+        """Write timestamp,open,high,low,close[,volume] rows with UTC-offset timestamps"""
+        data = self.arrays(symbol)
+        local = (data['session_days'] * 1440 + data['minutes']).astype('datetime64[m]')
+        sign, offset = "+-"[self._offset < 0], abs(self._offset)
+        stamps = np.char.add(np.datetime_as_string(local, unit='s'),
+                             f"{sign}{offset // 60:02d}:{offset % 60:02d}")
+        stamps = np.char.replace(stamps, "T", " ")
+
+        with open(path, "w") as f:
+            has_volume = 'volumes' in data
+            f.write("timestamp,open,high,low,close" + (",volume\n" if has_volume else "\n"))
+            for lo in range(0, len(stamps), chunk_size):
+                hi = lo + chunk_size
+                block = np.column_stack((
+                    stamps[lo:hi],
+                    *(np.char.mod("%.2f", data[name][lo:hi])
+                      for name in ('opens', 'highs', 'lows', 'closes')),
+                    *((np.char.mod("%d", data['volumes'][lo:hi]),) if has_volume else ()),
+                ))
+                np.savetxt(f, block, fmt="%s", delimiter=",")
+
+
+def generate_feed(symbol: str = "NIFTY", n_bars: int = 100_000, seed: int = 42,
+                  **params) -> MarketDataFeed:
+    """Shortcut: in-memory feed of n_bars synthetic bars"""
+    return SyntheticMarket(n_bars=n_bars, seed=seed, **params).feed(symbol)
@@ -0,0 +1,298 @@
+"""
+Tick data: compact records, bulk readers and incremental bar builders
+
+Ticks are kept as a numpy structured array (TICK_DTYPE, 20 bytes each)
+and never become Python objects. Bar builders consume ticks a chunk at a
+time, reduce each chunk with whole-array ops and carry only the open
+(partial) bar to the next chunk, so bars come out the same whatever the
+chunk size:
+
+    builder = TimeBarBuilder("NIFTY", seconds=5)
+    feed = TickBarFeed("ticks.npy", "NIFTY", builder)
+    feed.load()
+    for bar in feed: ...
+
+File formats:
+    .npy  - np.save of a TICK_DTYPE array (memory-mapped when read)
+    .csv  - timestamp,price,size (naive timestamps are exchange-local)
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from core.timestamps import EXCHANGE_TZ_NAME, NS_PER_MINUTE, NS_PER_SECOND, utc_offset_ns
+from .calendar import SessionCalendar
+from .feed import MarketDataFeed
+
+
+TICK_DTYPE = np.dtype([('timestamp', '<i8'), ('price', '<f8'), ('size', '<i4')])
+
+BAR_COLUMNS = ('timestamps', 'opens', 'highs', 'lows', 'closes', 'volumes', 'tick_counts')
+
+
+def make_ticks(timestamps, prices, sizes) -> np.ndarray:
+    """Pack parallel columns into a TICK_DTYPE array"""
+    ticks = np.empty(len(timestamps), dtype=TICK_DTYPE)
+    ticks['timestamp'] = timestamps
+    ticks['price'] = prices
+    ticks['size'] = sizes
+    return ticks
+
+
+def save_ticks(path: Union[str, Path], ticks: np.ndarray):
+    """Write ticks as .npy"""
+    np.save(path, np.asarray(ticks, dtype=TICK_DTYPE))
+
+
+def iter_ticks(path: Union[str, Path], chunk_size: int = 1_000_000,
+               tz: str = EXCHANGE_TZ_NAME) -> Iterator[np.ndarray]:
+    """Yield TICK_DTYPE chunks of a tick file, in file order"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Tick file not found: {path}")
+
+    if path.suffix == ".npy":
+        ticks = np.load(path, mmap_mode='r')
+        if ticks.dtype != TICK_DTYPE:
+            raise ValueError(f"Unexpected tick dtype {ticks.dtype}, expected {TICK_DTYPE}")
+        for start in range(0, len(ticks), chunk_size):
+            yield np.asarray(ticks[start:start + chunk_size])
+        return
+
+    if path.suffix != ".csv":
+        raise ValueError(f"Unsupported tick format: {path.suffix}. Use .npy or .csv")
+
+    import pandas as pd
+
+    for frame in pd.read_csv(path, chunksize=chunk_size):
+        ts = pd.to_datetime(frame['timestamp'])
+        if ts.dt.tz is None:
+            ts = ts.dt.tz_localize(tz)
+        ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+        yield make_ticks(
+            ts.values.astype('datetime64[ns]').astype(np.int64),
+            frame['price'].to_numpy(dtype=np.float64),
+            frame['size'].to_numpy(dtype=np.int32),
+        )
+
+
+def load_ticks(path: Union[str, Path], tz: str = EXCHANGE_TZ_NAME) -> np.ndarray:
+    """Whole tick file as one array"""
+    chunks = list(iter_ticks(path, tz=tz))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=TICK_DTYPE)
+
+
+# ------------------------------------------------------------
+# Bar builders
+# ------------------------------------------------------------
+def _empty_bars() -> Dict[str, np.ndarray]:
+    return {
+        name: np.empty(0, dtype=np.float64 if name in ('opens', 'highs', 'lows', 'closes')
+                       else np.int64)
+        for name in BAR_COLUMNS
+    }
+
+
+class BarBuilder(ABC):
+    """
+    Base class: subclasses assign each tick a non-decreasing bucket id;
+    consecutive ticks with the same id form one bar.
+    """
+
+    def __init__(self, symbol: str, tz: str = EXCHANGE_TZ_NAME):
+        self.symbol = symbol
+        self.set_tz(tz)
+        self._partial: Optional[Dict[str, np.ndarray]] = None
+        self._partial_bucket = None
+
+    def set_tz(self, tz: str):
+        """Exchange timezone that local-time bucketing is aligned to"""
+        self.tz = tz
+        self._utc_offset = utc_offset_ns(tz)
+
+    @abstractmethod
+    def _buckets(self, ticks: np.ndarray) -> np.ndarray:
+        pass
+
+    def _stamp(self, buckets: np.ndarray, first_timestamps: np.ndarray) -> np.ndarray:
+        """Bar timestamps (default: first tick of the bar)"""
+        return first_timestamps
+
+    def update(self, ticks: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Fold a chunk of ticks in
+
+        Returns:
+            Columns (BAR_COLUMNS) of the bars completed by this chunk; the
+            last, still open bar is carried until a later tick or flush()
+        """
+        n = len(ticks)
+        if n == 0:
+            return _empty_bars()
+
+        price = ticks['price']
+        size = ticks['size'].astype(np.int64)
+        bucket = self._buckets(ticks)
+
+        change = np.flatnonzero(bucket[1:] != bucket[:-1]) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change - 1, [n - 1]))
+        buckets = bucket[starts]
+
+        bars = {
+            'timestamps': self._stamp(buckets, ticks['timestamp'][starts]),
+            'opens': price[starts],
+            'highs': np.maximum.reduceat(price, starts),
+            'lows': np.minimum.reduceat(price, starts),
+            'closes': price[ends],
+            'volumes': np.add.reduceat(size, starts),
+            'tick_counts': ends - starts + 1,
+        }
+
+        partial = self._partial
+        if partial is not None:
+            if buckets[0] == self._partial_bucket:
+                # First group continues the carried bar
+                bars['timestamps'][0] = partial['timestamps'][0]
+                bars['opens'][0] = partial['opens'][0]
+                bars['highs'][0] = max(bars['highs'][0], partial['highs'][0])
+                bars['lows'][0] = min(bars['lows'][0], partial['lows'][0])
+                bars['volumes'][0] += partial['volumes'][0]
+                bars['tick_counts'][0] += partial['tick_counts'][0]
+            else:
+                bars = {k: np.concatenate((partial[k], v)) for k, v in bars.items()}
+
+        # Last bar stays open
+        self._partial = {k: v[-1:].copy() for k, v in bars.items()}
+        self._partial_bucket = buckets[-1]
+        return {k: v[:-1] for k, v in bars.items()}
+
+    def flush(self) -> Dict[str, np.ndarray]:
+        """Close and return the open bar (end of data)"""
+        partial = self._partial
+        self._partial = None
+        self._partial_bucket = None
+        return partial if partial is not None else _empty_bars()
+
+    def reset(self):
+        self._partial = None
+        self._partial_bucket = None
+
+
+class TimeBarBuilder(BarBuilder):
+    """Fixed clock intervals, aligned to exchange-local time (9:15:00, 9:15:05, ...)"""
+
+    def __init__(self, symbol: str, seconds: int = 60, tz: str = EXCHANGE_TZ_NAME):
+        super().__init__(symbol, tz)
+        if seconds <= 0:
+            raise ValueError(f"Invalid interval: {seconds}. Must be > 0 seconds")
+        self.seconds = seconds
+        self._width = seconds * NS_PER_SECOND
+
+    def _buckets(self, ticks: np.ndarray) -> np.ndarray:
+        return (ticks['timestamp'] + self._utc_offset) // self._width
+
+    def _stamp(self, buckets: np.ndarray, first_timestamps: np.ndarray) -> np.ndarray:
+        return buckets * self._width - self._utc_offset
+
+
+class VolumeBarBuilder(BarBuilder):
+    """A new bar once `volume` units have traded (ticks are never split)"""
+
+    def __init__(self, symbol: str, volume: int):
+        super().__init__(symbol)
+        if volume <= 0:
+            raise ValueError(f"Invalid volume: {volume}. Must be > 0")
+        self.volume = volume
+        self._traded = 0
+
+    def _buckets(self, ticks: np.ndarray) -> np.ndarray:
+        traded = self._traded + np.cumsum(ticks['size'], dtype=np.int64)
+        self._traded = int(traded[-1])
+        # Bucket of the volume traded *before* each tick
+        return (traded - ticks['size']) // self.volume
+
+    def reset(self):
+        super().reset()
+        self._traded = 0
+
+
+class TickBarBuilder(BarBuilder):
+    """A new bar every `count` ticks"""
+
+    def __init__(self, symbol: str, count: int):
+        super().__init__(symbol)
+        if count <= 0:
+            raise ValueError(f"Invalid count: {count}. Must be > 0")
+        self.count = count
+        self._seen = 0
+
+    def _buckets(self, ticks: np.ndarray) -> np.ndarray:
+        index = np.arange(self._seen, self._seen + len(ticks), dtype=np.int64)
+        self._seen += len(ticks)
+        return index // self.count
+
+    def reset(self):
+        super().reset()
+        self._seen = 0
+
+
+def build_bars(ticks: Iterator[np.ndarray], builder: BarBuilder) -> Dict[str, np.ndarray]:
+    """Run a builder over tick chunks and concatenate every bar (incl. the last)"""
+    parts: List[Dict[str, np.ndarray]] = [builder.update(chunk) for chunk in ticks]
+    parts.append(builder.flush())
+    return {name: np.concatenate([p[name] for p in parts]) for name in BAR_COLUMNS}
+
+
+class TickBarFeed(MarketDataFeed):
+    """MarketDataFeed whose bars are built from a tick file"""
+
+    def __init__(self, path: str, symbol: str, builder: BarBuilder,
+                 calendar: Optional[SessionCalendar] = None,
+                 tz: str = EXCHANGE_TZ_NAME,
+                 chunk_size: int = 1_000_000):
+        """
+        Args:
+            path: Tick file (.npy or .csv)
+            symbol: Symbol stamped on every bar
+            builder: Time / volume / tick-count bar builder (aligned to `tz`)
+            calendar: Optional session calendar; out-of-session ticks are dropped
+            tz: Exchange timezone (naive CSV timestamps, sessions, time bars)
+            chunk_size: Ticks per read / reduction step
+        """
+        super().__init__(path, symbol, calendar=calendar, tz=tz)
+        self.builder = builder
+        self.builder.set_tz(tz)
+        self._utc_offset = utc_offset_ns(tz)
+        self.chunk_size = chunk_size
+
+        self.volumes: Optional[np.ndarray] = None
+        self.tick_counts: Optional[np.ndarray] = None
+
+    def _in_session(self, chunks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        for ticks in chunks:
+            local = (ticks['timestamp'] + self._utc_offset) // NS_PER_MINUTE
+            days = local // 1440
+            mask = self.calendar.session_mask(days, local - days * 1440)
+            yield ticks if mask.all() else ticks[mask]
+
+    def load(self):
+        """Stream the tick file through the builder"""
+        chunks = iter_ticks(self.csv_path, self.chunk_size, self.tz)
+        if self.calendar is not None:
+            chunks = self._in_session(chunks)
+
+        self.builder.reset()
+        bars = build_bars(chunks, self.builder)
+        for name, values in bars.items():
+            setattr(self, name, values)
+
+        local = (self.timestamps + self._utc_offset) // NS_PER_MINUTE
+        self.session_days = local // 1440
+        self.minutes = local - self.session_days * 1440
+
+        self._build_sessions()
+
+        print(f"✅ Built {len(self)} bars from ticks in {self.csv_path}")
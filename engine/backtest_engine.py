@@ -1,9 +1,14 @@
 
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional, Tuple
+from core.signal import BUY, SELL, Signal
+from data.aggregator import BarAggregator
 from data.feed import MarketDataFeed
 from strategies.base import BaseStrategy
 from risk.risk_manager import RiskManager
+from risk.exit_manager import ExitManager
 from execution.execution_engine import ExecutionEngine
+from execution.fill_models import CloseFillModel
 from execution.models import Position
 from analytics.metrics import Analytics
 
@@ -16,51 +21,267 @@ class BacktestEngine:
                  strategies: List[BaseStrategy],
                  risk_manager: RiskManager,
                  execution_engine: ExecutionEngine,
-                 analytics: Analytics):
+                 analytics: Analytics,
+                 exit_manager: Optional[ExitManager] = None,
+                 fill_model=None,
+                 verbose: bool = True,
+                 portfolio_mode: bool = False,
+                 journal=None,
+                 telemetry=None):
         
         self.data_feed = data_feed
         self.strategies = strategies
         self.risk_manager = risk_manager
         self.execution_engine = execution_engine
         self.analytics = analytics
+
+        # Price at which approved market orders fill (default: bar close)
+        self.fill_model = fill_model or CloseFillModel()
+
+        # Per-trade / progress console output
+        self.verbose = verbose
         
         self.bars_processed = 0
+
+        # Optional engine.journal.Journal: every signal, risk decision and fill
+        self.journal = journal
+
+        # Optional engine.telemetry.Telemetry: latency histograms and counters
+        self.telemetry = telemetry
+        self._bar_start = 0   # perf_counter_ns at the start of a sampled bar, else 0
+
+        # Portfolio mode: same-class variants are stepped as one vectorized group
+        self.portfolio_mode = portfolio_mode
+        self.groups = []
+        self.single_strategies = strategies
+        self.group_of = {}
+        if portfolio_mode:
+            from .portfolio import group_strategies
+
+            self.groups, self.single_strategies = group_strategies(strategies)
+            for group in self.groups:
+                for strategy in group.strategies:
+                    self.group_of[strategy.strategy_id] = group
+
+        # Position of each strategy: grouped signals are handed on in this order
+        self.strategy_order = {s.strategy_id: i for i, s in enumerate(strategies)}
+
+        # Protective exits: only created when some strategy declares a rule
+        self.strategies_by_id = {s.strategy_id: s for s in strategies}
+        self.exit_manager = exit_manager
+        for strategy in strategies:
+            if strategy.exit_rule is None:
+                continue
+            if self.exit_manager is None:
+                self.exit_manager = ExitManager()
+            self.exit_manager.register(strategy.strategy_id, strategy.exit_rule)
+
+        # Higher-timeframe bars: one shared aggregator per (symbol, timeframe)
+        self.aggregators: Dict[Tuple[str, int], BarAggregator] = {}
+        self.htf_subscribers: Dict[str, List[Tuple[BarAggregator, List[BaseStrategy]]]] = {}
+        subscribers: Dict[Tuple[str, int], List[BaseStrategy]] = {}
+        for strategy in strategies:
+            for minutes in strategy.timeframes:
+                key = (strategy.symbol, minutes)
+                if key not in self.aggregators:
+                    self.aggregators[key] = BarAggregator(strategy.symbol, minutes)
+                    subscribers[key] = []
+                    self.htf_subscribers.setdefault(strategy.symbol, []).append(
+                        (self.aggregators[key], subscribers[key])
+                    )
+                subscribers[key].append(strategy)
         
-    def run(self):
+    def run(self, snapshot_at: Optional[int] = None, on_snapshot=None):
+        """
+        Args:
+            snapshot_at: Feed index at which on_snapshot() is called, before
+                         that bar is processed (used by engine.incremental)
+        """
        
-        print("=" * 80)
-        print("🚀 BACKTEST ENGINE STARTING")
-        print("=" * 80)
-        print(f"Strategies: {[s.strategy_id for s in self.strategies]}")
-        print(f"Total bars: {len(self.data_feed)}")
-        print("=" * 80)
+        if self.verbose:
+            print("=" * 80)
+            print("🚀 BACKTEST ENGINE STARTING")
+            print("=" * 80)
+            print(f"Strategies: {[s.strategy_id for s in self.strategies]}")
+            print(f"Total bars: {len(self.data_feed)}")
+            print("=" * 80)
         
         # Iterate through each bar
-        for bar in self.data_feed:
+        exit_manager = self.exit_manager
+        fill_price = self.fill_model.fill_price
+        session_start, session_end, day_start = self._session_flags()
+        htf_subscribers = self.htf_subscribers
+        strategies = self.strategies
+        single_strategies = self.single_strategies
+        groups = self.groups
+
+        # Multi-symbol feeds: each bar only goes to its symbol's strategies
+        routes = self._symbol_routes()
+        no_route = ((), (), ())
+
+        # Telemetry: strategies, stages and fills are timed on sampled bars only
+        telemetry = self.telemetry
+        sample_every = telemetry.sample_every if telemetry is not None else 0
+        perf_ns = time.perf_counter_ns
+
+        for i, bar in enumerate(self.data_feed):
+            if i == snapshot_at:
+                on_snapshot()
+
             self.bars_processed += 1
+
+            if routes is not None:
+                strategies, single_strategies, groups = routes.get(bar.symbol, no_route)
+
+            bar_singles, bar_groups = single_strategies, groups
+            sampled = sample_every and i % sample_every == 0
+            if sampled:
+                bar_start = self._bar_start = perf_ns()
+                bar_singles = telemetry.timed(single_strategies)
+                bar_groups = telemetry.timed(groups)
+
+            if day_start[i]:
+                self.risk_manager.on_session_start(bar)
+            if session_start[i]:
+                for strategy in strategies:
+                    strategy.on_session_start(bar)
+
+            # Mark portfolio-level risk aggregates to this bar
+            self.risk_manager.on_bar(bar)
+
+            # Protective exits first: one pass over armed brackets for this symbol
+            if exit_manager is not None:
+                for strategy_id, price, reason in exit_manager.on_bar(bar):
+                    self._process_exit(strategy_id, bar, price, reason)
+            if sampled:
+                pre_trade_end = perf_ns()
+
+            # Completed higher-timeframe bars go out before the base bar
+            if htf_subscribers:
+                for aggregator, subscribed in htf_subscribers.get(bar.symbol, ()):
+                    for htf_bar in aggregator.update(bar, session_start[i], session_end[i]):
+                        for strategy in subscribed:
+                            strategy.on_htf_bar(aggregator.minutes, htf_bar)
             
             # Process bar with each strategy
-            for strategy in self.strategies:
-                # Strategy generates signal (or None)
-                signal = strategy.on_bar(bar)
-                
-                if signal is None:
-                    continue
-                
-                # Signal generated - process it
-                self._process_signal(signal, bar.close)
+            if bar_groups:
+                self._step_portfolio(bar, bar_singles, bar_groups, fill_price)
+            else:
+                for strategy in bar_singles:
+                    # Strategy generates signal (or None)
+                    signal = strategy.on_bar(bar)
+
+                    if signal is None:
+                        continue
+
+                    # Signal generated - process it
+                    self._process_signal(signal, fill_price(signal.side, bar))
+
+            if session_end[i]:
+                for strategy in strategies:
+                    strategy.on_session_end(bar)
+
+            if sampled:
+                telemetry.on_sampled_bar(bar_start, pre_trade_end, perf_ns(), self.bars_processed)
+                self._bar_start = 0
             
             # Progress indicator
-            if self.bars_processed % 100 == 0:
+            if self.verbose and self.bars_processed % 100 == 0:
                 print(f"📊 Processed {self.bars_processed} bars...")
         
-        print("=" * 80)
-        print(f"✅ BACKTEST COMPLETE - Processed {self.bars_processed} bars")
-        print("=" * 80)
-        
-        # Final summary
-        self._print_summary()
+        # Push any partially filled export batches to disk
+        self.analytics.flush()
+        if self.journal is not None:
+            self.journal.flush()
+        if telemetry is not None:
+            telemetry.bars = self.bars_processed
+
+        for group in self.groups:
+            group.sync()
+
+        if self.verbose:
+            print("=" * 80)
+            print(f"✅ BACKTEST COMPLETE - Processed {self.bars_processed} bars")
+            print("=" * 80)
+            
+            # Final summary
+            self._print_summary()
     
+    def _session_flags(self):
+        """
+        Per-bar session start/end flags from the feed's precomputed indices,
+        plus exchange-day start flags (the same as session starts unless the
+        feed merges several symbols)
+        """
+        n = len(self.data_feed)
+        start = [False] * n
+        end = [False] * n
+
+        starts = getattr(self.data_feed, 'session_starts', None)
+        ends = getattr(self.data_feed, 'session_ends', None)
+        if starts is None or ends is None:
+            return start, end, start
+
+        for i in starts.tolist():
+            start[i] = True
+        for i in ends.tolist():
+            end[i] = True
+
+        day_starts = getattr(self.data_feed, 'day_starts', None)
+        if day_starts is None:
+            return start, end, start
+
+        day = [False] * n
+        for i in day_starts.tolist():
+            day[i] = True
+        return start, end, day
+
+    def _symbol_routes(self):
+        """symbol -> (strategies, single strategies, groups), None for single-symbol feeds"""
+        if getattr(self.data_feed, 'symbols', None) is None:
+            return None
+
+        routes = {}
+        for symbol in self.data_feed.symbols:
+            routes[symbol] = (
+                [s for s in self.strategies if s.symbol == symbol],
+                [s for s in self.single_strategies if s.symbol == symbol],
+                [g for g in self.groups if g.symbol == symbol],
+            )
+        return routes
+
+    def _step_portfolio(self, bar, singles, groups, fill_price):
+        """
+        Portfolio mode: step the groups first, then hand their signals on
+        interleaved with the single strategies' in strategy order, so risk
+        and execution see them in the same order as a sequential run
+        """
+        pending = []
+        for group in groups:
+            if group.symbol == bar.symbol:
+                pending.extend(group.on_bar(bar))
+
+        order = self.strategy_order
+        if len(pending) > 1:
+            pending.sort(key=lambda signal: order[signal.strategy_id])
+        next_pending = 0
+
+        for strategy in singles:
+            if next_pending < len(pending):
+                position = order[strategy.strategy_id]
+                while (next_pending < len(pending)
+                       and order[pending[next_pending].strategy_id] < position):
+                    signal = pending[next_pending]
+                    next_pending += 1
+                    self._process_signal(signal, fill_price(signal.side, bar))
+
+            signal = strategy.on_bar(bar)
+            if signal is not None:
+                self._process_signal(signal, fill_price(signal.side, bar))
+
+        for signal in pending[next_pending:]:
+            self._process_signal(signal, fill_price(signal.side, bar))
+
     def _process_signal(self, signal, current_price: float):
         
         strategy_id = signal.strategy_id
@@ -69,12 +290,24 @@ class BacktestEngine:
 
         position = self.execution_engine.get_position(strategy_id, symbol)
         
+        journal = self.journal
+        if journal is not None:
+            journal.signal(signal, position.quantity, current_price)
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.on_signal(strategy_id)
 
         approved_qty = self.risk_manager.approve(signal, position)
         
         # Step 3: Execute or skip based on approval
         if approved_qty == 0:
             # Trade rejected by risk manager
+            strategy_pnl = self.risk_manager.get_strategy_pnl(strategy_id)
+            if journal is not None:
+                journal.reject(signal, self.risk_manager.last_rule, position.quantity,
+                               strategy_pnl)
+            if telemetry is not None:
+                telemetry.on_reject(strategy_id, self.risk_manager.last_rule)
             self.analytics.log_skipped_trade(
                 timestamp=signal.timestamp,
                 strategy_id=strategy_id,
@@ -82,9 +315,13 @@ class BacktestEngine:
                 side=signal.side,
                 reason="Risk manager rejected",
                 current_position=position.quantity,
-                strategy_pnl=self.risk_manager.get_strategy_pnl(strategy_id)
+                strategy_pnl=strategy_pnl
             )
             return
+
+        if journal is not None:
+            journal.approve(signal, approved_qty, self.risk_manager.last_rule,
+                            self.risk_manager.get_strategy_pnl(strategy_id))
         
         # Step 4: Trade approved - execute it
         # Determine actual quantity based on side
@@ -97,6 +334,7 @@ class BacktestEngine:
             return
         
         # Execute the trade
+        prev_qty, prev_avg = position.quantity, position.average_price
         trade = self.execution_engine.execute_trade(
             strategy_id=strategy_id,
             symbol=symbol,
@@ -109,13 +347,68 @@ class BacktestEngine:
         if trade:
             # Log successful trade
             self.analytics.log_trade(trade)
+            if journal is not None:
+                journal.fill(trade)
+            if telemetry is not None:
+                telemetry.on_fill(strategy_id, self._bar_start)
             
             # If trade closed a position, update strategy PnL in risk manager
             if trade.realized_pnl != 0:
                 self.risk_manager.update_strategy_pnl(strategy_id, trade.realized_pnl)
+            self.risk_manager.on_fill(trade, position, prev_qty, prev_avg)
+
+            if self.exit_manager is not None:
+                self.exit_manager.on_fill(trade, position)
             
-            print(f"✅ TRADE: {signal.side} {abs(quantity)} {symbol} @ {current_price:.2f} "
-                  f"[{strategy_id}] - {signal.reason}")
+            if self.verbose:
+                print(f"✅ TRADE: {signal.side} {abs(quantity)} {symbol} @ {current_price:.2f} "
+                      f"[{strategy_id}] - {signal.reason}")
+
+    def _process_exit(self, strategy_id: str, bar, price: float, reason: str):
+        """Flatten a position on a protective exit (bypasses entry risk checks)"""
+        position = self.execution_engine.get_position(strategy_id, bar.symbol)
+        quantity = -position.quantity
+
+        if quantity == 0:
+            return
+
+        side = BUY if quantity > 0 else SELL
+        prev_qty, prev_avg = position.quantity, position.average_price
+        trade = self.execution_engine.execute_trade(
+            strategy_id=strategy_id,
+            symbol=bar.symbol,
+            quantity=quantity,
+            price=price,
+            timestamp=bar.timestamp,
+            signal_reason=reason
+        )
+
+        if trade is None:
+            return
+
+        self.analytics.log_trade(trade)
+        if self.journal is not None:
+            self.journal.fill(trade, exit=True)
+        if self.telemetry is not None:
+            self.telemetry.on_fill(strategy_id, self._bar_start)
+
+        if trade.realized_pnl != 0:
+            self.risk_manager.update_strategy_pnl(strategy_id, trade.realized_pnl)
+        self.risk_manager.on_fill(trade, position, prev_qty, prev_avg)
+
+        self.exit_manager.on_fill(trade, position)
+
+        strategy = self.strategies_by_id.get(strategy_id)
+        if strategy is not None:
+            # Grouped strategies keep their state in the group
+            target = self.group_of.get(strategy_id, strategy)
+            target.on_protective_exit(
+                Signal(strategy_id, bar.symbol, side, bar.timestamp, reason)
+            )
+
+        if self.verbose:
+            print(f"🛑 EXIT: {side} {abs(quantity)} {bar.symbol} @ {price:.2f} "
+                  f"[{strategy_id}] - {reason}")
     
     def _print_summary(self):
         """Print final summary"""
@@ -141,8 +434,8 @@ class BacktestEngine:
         
         print("\n📊 ANALYTICS:")
         print("-" * 80)
-        print(f"  Total trades executed: {len(self.analytics.trades)}")
-        print(f"  Total signals skipped: {len(self.analytics.skipped_trades)}")
+        print(f"  Total trades executed: {self.analytics.trade_count}")
+        print(f"  Total signals skipped: {self.analytics.skip_count}")
         
         # Calculate total PnL
         total_realized = sum(self.risk_manager.strategy_pnl.values())
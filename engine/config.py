@@ -0,0 +1,236 @@
+"""
+Run configuration: load JSON/TOML/YAML files and build engine components
+
+Layout (JSON shown; TOML/YAML use the same keys):
+
+    {
+      "feeds": {"nifty": {"path": "data/market_data.csv", "symbol": "NIFTY"}},
+      "defaults": {"risk": {"max_position_size": 5000}},
+      "runs": [
+        {
+          "name": "baseline",
+          "feed": "nifty",
+          "strategies": [{"name": "ema_crossover", "params": {"fast": 10}}],
+          "risk": {"default_quantity": 5, "portfolio": {...}, "sizer": {...}},
+          "fill_model": {"type": "slippage", "slippage_bps": 1.0},
+          "portfolio_mode": false,
+          "accounting": "fifo",
+          "outputs": {"dir": "output/baseline"}
+        }
+      ]
+    }
+
+A file without "runs" is treated as a single run. A feed can also attach
+to a published data.shared_store block: {"shared": "<name>", "symbol": "NIFTY"}.
+Adding "journal": "events.journal" to "outputs" also writes an event
+journal of the run (see engine.journal).
+"""
+import copy
+import hashlib
+import json
+from datetime import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from core.version import __version__
+from execution.fill_models import FILL_MODELS
+from risk.exit_manager import ExitRule
+from risk.portfolio_risk import PortfolioRiskEngine
+from risk.position_sizing import FixedFractionalSizer, KellySizer, VolatilityTargetSizer
+from risk.risk_manager import RiskManager
+from strategies.registry import create_strategy
+
+
+SIZERS = {
+    "fixed_fractional": FixedFractionalSizer,
+    "volatility_target": VolatilityTargetSizer,
+    "kelly": KellySizer,
+}
+
+DEFAULT_OUTPUTS = {
+    "dir": "output",
+    "trades": "trades.csv",
+    "skipped": "skipped_trades.csv",
+    "metrics": "metrics.csv",
+}
+
+
+def load_config(path: Union[str, Path]) -> Dict:
+    """Read a JSON, TOML or YAML config file"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Config file not found: {path}")
+
+    suffix = path.suffix.lower()
+
+    if suffix == ".json":
+        with open(path) as f:
+            return json.load(f)
+
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("YAML configs require PyYAML: pip install pyyaml") from e
+        with open(path) as f:
+            return yaml.safe_load(f)
+
+    raise ValueError(f"Unsupported config format: {suffix}. Use .json, .toml or .yaml")
+
+
+def expand_runs(config: Dict) -> List[Dict]:
+    """Resolve the list of runs, merging "defaults" into each one"""
+    defaults = config.get("defaults", {})
+    runs = config.get("runs")
+
+    if runs is None:
+        single = {k: v for k, v in config.items() if k not in ("feeds", "defaults")}
+        runs = [single]
+
+    resolved = []
+    for i, run in enumerate(runs):
+        merged = _merge(copy.deepcopy(defaults), run)
+        merged.setdefault("name", f"run_{i}")
+        merged["outputs"] = {**DEFAULT_OUTPUTS, **merged.get("outputs", {})}
+        if "dir" not in run.get("outputs", {}):
+            merged["outputs"]["dir"] = str(Path(merged["outputs"]["dir"]) / merged["name"])
+        resolved.append(merged)
+
+    return resolved
+
+
+def _merge(base: Dict, override: Dict) -> Dict:
+    """Recursive dict merge (override wins)"""
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            base[key] = _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def config_hash(run: Dict, feed_spec: Optional[Dict] = None) -> str:
+    """
+    Stable hash of everything that affects results (name/outputs excluded)
+
+    Args:
+        feed_spec: Resolved spec of the run's feed (symbol, tz, calendar, ...);
+                   the run itself only names the feed
+    """
+    relevant = {k: v for k, v in run.items() if k not in ("name", "outputs")}
+    relevant["feed_spec"] = feed_spec
+    relevant["version"] = __version__
+    blob = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+# ------------------------------------------------------------
+# Component builders
+# ------------------------------------------------------------
+def build_strategies(specs: List[Dict], default_symbol: str) -> List:
+    """Instantiate strategies through the registry"""
+    strategies = []
+    seen = set()
+
+    for spec in specs:
+        params = _convert_params(dict(spec.get("params", {})))
+        params.setdefault("symbol", default_symbol)
+        if "id" in spec:
+            params["strategy_id"] = spec["id"]
+
+        strategy = create_strategy(spec["name"], **params)
+
+        if strategy.strategy_id in seen:
+            raise ValueError(
+                f"Duplicate strategy_id: {strategy.strategy_id}. Give each instance an \"id\""
+            )
+        seen.add(strategy.strategy_id)
+        strategies.append(strategy)
+
+    return strategies
+
+
+def _convert_params(params: Dict) -> Dict:
+    """Turn config primitives into the objects strategies expect"""
+    for key, value in params.items():
+        if key.endswith("_time") and isinstance(value, str):
+            params[key] = time.fromisoformat(value)
+
+    rule = params.get("exit_rule")
+    if isinstance(rule, dict):
+        rule = dict(rule)
+        if isinstance(rule.get("exit_time"), str):
+            rule["exit_time"] = time.fromisoformat(rule["exit_time"])
+        params["exit_rule"] = ExitRule(**rule)
+
+    return params
+
+
+def build_risk_manager(spec: Dict) -> RiskManager:
+    spec = dict(spec or {})
+    portfolio = spec.pop("portfolio", None)
+    sizer = spec.pop("sizer", None)
+
+    if portfolio is not None:
+        portfolio = PortfolioRiskEngine(**portfolio)
+
+    if sizer is not None:
+        sizer = dict(sizer)
+        kind = sizer.pop("type")
+        if kind not in SIZERS:
+            raise ValueError(f"Unknown sizer: {kind}. Available: {sorted(SIZERS)}")
+        sizer = SIZERS[kind](**sizer)
+
+    return RiskManager(portfolio=portfolio, sizer=sizer, **spec)
+
+
+def build_fill_model(spec: Dict):
+    spec = dict(spec or {"type": "close"})
+    kind = spec.pop("type", "close")
+    if kind not in FILL_MODELS:
+        raise ValueError(f"Unknown fill model: {kind}. Available: {sorted(FILL_MODELS)}")
+    return FILL_MODELS[kind](**spec)
+
+
+def build_ledger(method: Optional[str]):
+    """Lot accounting ("fifo" / "average"), or None to use plain positions"""
+    if not method:
+        return None
+    from execution.accounting import Ledger
+
+    return Ledger(method)
+
+
+def build_engine(run: Dict, feed, **extra):
+    """
+    BacktestEngine for one expanded run over a loaded feed
+
+    Args:
+        extra: BacktestEngine arguments that don't come from the run
+               config (analytics, journal, verbose, ...); they override
+               the defaults built here
+    """
+    from analytics.metrics import Analytics
+    from execution.execution_engine import ExecutionEngine
+    from .backtest_engine import BacktestEngine
+
+    kwargs = dict(
+        data_feed=feed,
+        strategies=build_strategies(run.get("strategies", []), feed.symbol),
+        risk_manager=build_risk_manager(run.get("risk", {})),
+        execution_engine=ExecutionEngine(ledger=build_ledger(run.get("accounting"))),
+        analytics=Analytics(),
+        fill_model=build_fill_model(run.get("fill_model")),
+        verbose=False,
+        portfolio_mode=run.get("portfolio_mode", False),
+    )
+    kwargs.update(extra)
+    return BacktestEngine(**kwargs)
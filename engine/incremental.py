@@ -0,0 +1,280 @@
+"""
+Incremental re-runs for append-only CSV files
+
+    engine = BacktestEngine(MarketDataFeed("data/nifty.csv", "NIFTY"), ...)  # not loaded
+    IncrementalRunner(engine, ".backtest_state/nifty.ckpt").run()
+
+A run saves a checkpoint of the whole engine state (strategies, positions,
+risk PnL, analytics, exits, aggregators) as it was just before the first
+bar of the last session, plus the byte offset of that bar's CSV row. The
+next run checks that the file was only appended to, parses the bytes from
+that offset on and resumes from the checkpoint. The last session is
+always replayed because appended rows can extend it (its final bar is
+only a session end once the file says so), which keeps the result
+identical to a full re-run while the work done follows the new data.
+
+A full run happens instead when there's no usable checkpoint: the setup
+(strategies, risk, execution, fill model, exits) changed, any byte before the
+offset changed, or the CSV isn't in time order.
+"""
+import hashlib
+import io
+import json
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from core.files import atomic_write
+from core.version import __version__
+from .result_cache import setup
+
+
+# Read size when hashing the file prefix
+CHUNK_BYTES = 1 << 20
+
+
+def _get_state(obj):
+    if hasattr(obj, "__getstate__"):
+        return obj.__getstate__()
+    return obj.__dict__.copy()
+
+
+def _set_state(obj, state):
+    if hasattr(obj, "__setstate__"):
+        obj.__setstate__(state)
+        return
+    slots = None
+    if isinstance(state, tuple):
+        state, slots = state
+    if state:
+        obj.__dict__.clear()
+        obj.__dict__.update(state)
+    for name, value in (slots or {}).items():
+        setattr(obj, name, value)
+
+
+class _StatePickler(pickle.Pickler):
+    """Pickles root objects' state; references between roots become ids"""
+
+    def __init__(self, file, refs: Dict[int, int]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.refs = refs
+
+    def persistent_id(self, obj):
+        return self.refs.get(id(obj))
+
+
+class _StateUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, objects: List):
+        super().__init__(file)
+        self.objects = objects
+
+    def persistent_load(self, pid):
+        return self.objects[pid]
+
+
+class IncrementalRunner:
+
+    def __init__(self, engine, state_path: Union[str, Path]):
+        """
+        Args:
+            engine: Freshly constructed BacktestEngine whose MarketDataFeed
+                    has not been loaded yet (the runner loads all or part of it)
+            state_path: Checkpoint file (created / replaced after each run)
+        """
+        if engine.journal is not None:
+            raise ValueError("Incremental runs can't write a journal: events before "
+                             "the checkpoint would be missing from it")
+        self.engine = engine
+        self.feed = engine.data_feed
+        self.state_path = Path(state_path)
+
+        # Resumed or full run, and how many bars this run processed
+        self.resumed = False
+        self.bars_run = 0
+
+    # ------------------------------------------------------------
+    # Engine state
+    # ------------------------------------------------------------
+    def _objects(self) -> List:
+        """
+        Roots: objects whose state is saved and later written back in place,
+        so references callers hold (strategies, analytics, ...) stay valid.
+        Live objects (feed, streaming writers, telemetry) are referenced, never saved.
+        """
+        engine = self.engine
+        analytics = engine.analytics
+        roots = [engine, *engine.strategies, engine.risk_manager,
+                 engine.execution_engine, analytics]
+        live = [engine.data_feed, analytics.trade_writer, analytics.skip_writer,
+                engine.telemetry]
+        return roots, [obj for obj in live if obj is not None]
+
+    def _snapshot(self) -> bytes:
+        roots, live = self._objects()
+        refs = {id(obj): i for i, obj in enumerate(roots + live)}
+
+        buffer = io.BytesIO()
+        _StatePickler(buffer, refs).dump([_get_state(obj) for obj in roots])
+        return buffer.getvalue()
+
+    def _restore(self, blob: bytes):
+        roots, live = self._objects()
+        states = _StateUnpickler(io.BytesIO(blob), roots + live).load()
+        for obj, state in zip(roots, states):
+            _set_state(obj, state)
+
+    def _setup_hash(self) -> str:
+        payload = setup(self.engine)
+        payload["symbol"] = self.feed.symbol
+        payload["tz"] = self.feed.tz
+        payload["calendar"] = repr(self.feed.calendar)
+        blob = json.dumps(payload, sort_keys=True)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    # ------------------------------------------------------------
+    # Checkpoint file
+    # ------------------------------------------------------------
+    def _read_checkpoint(self, setup_hash: str) -> Optional[Dict]:
+        if not self.state_path.exists():
+            return None
+        try:
+            with open(self.state_path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        if (checkpoint.get("version") != __version__
+                or checkpoint.get("setup") != setup_hash):
+            return None
+        return checkpoint
+
+    def _write_checkpoint(self, checkpoint: Dict):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+
+        atomic_write(self.state_path, pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _appended(self, checkpoint: Dict, path: Path) -> bool:
+        """True if the file still starts with the checkpointed bytes"""
+        offset = checkpoint["offset"]
+        if path.stat().st_size < checkpoint["size"]:
+            return False
+
+        with open(path, "rb") as f:
+            header = f.readline()
+
+        return (header == checkpoint["header"]
+                and self._check_hash(path, offset) == checkpoint["check"])
+
+    @staticmethod
+    def _check_hash(path: Path, offset: int) -> str:
+        """sha256 of every byte before offset (any edit to the history shows)"""
+        digest = hashlib.sha256()
+        left = offset
+        with open(path, "rb") as f:
+            while left > 0:
+                chunk = f.read(min(CHUNK_BYTES, left))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                left -= len(chunk)
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------
+    def _read(self, path: Path, offset: Optional[int]):
+        """(header line, bytes from offset - or from the first row - to the end, base offset)"""
+        with open(path, "rb") as f:
+            header = f.readline()
+            if offset is not None:
+                f.seek(offset)
+            base = f.tell()
+            return header, f.read(), base
+
+    def run(self):
+        """Resume from the checkpoint when possible, else run everything"""
+        feed = self.feed
+        engine = self.engine
+        path = feed.csv_path
+
+        # Hashed before any state is restored or the run mutates it
+        setup_hash = self._setup_hash()
+
+        checkpoint = self._read_checkpoint(setup_hash)
+        offset = None
+        if checkpoint is not None and self._appended(checkpoint, path):
+            offset = checkpoint["offset"]
+
+        header, body, base = self._read(path, offset)
+        feed._parse_csv(io.BytesIO(header + body))
+
+        if offset is not None and not (
+                feed.source_sorted and len(feed.timestamps)
+                and int(feed.timestamps[0]) == checkpoint["first_timestamp"]):
+            # The rows at the offset are not the ones checkpointed
+            offset = None
+            header, body, base = self._read(path, None)
+            feed._parse_csv(io.BytesIO(header + body))
+
+        self.resumed = offset is not None
+        if self.resumed:
+            verbose = engine.verbose
+            self._restore(checkpoint["state"])
+            engine.verbose = verbose
+
+        # CSV row -> byte offset map, taken before the calendar drops rows
+        raw_timestamps = feed.timestamps
+        line_starts = None
+        if feed.source_sorted and self._row_count(body) == len(raw_timestamps):
+            line_starts = self._line_starts(body)
+
+        feed._build_sessions()
+        if self.resumed:
+            print(f"♻️  Resuming from checkpoint: {len(feed)} bars from byte {base:,}")
+        else:
+            print(f"✅ Loaded {len(feed)} bars from {path}")
+
+        # Next checkpoint: just before the first bar of the last session
+        snapshot = {}
+        snapshot_at = None
+        if line_starts is not None and len(feed) > 0:
+            snapshot_at = int(feed.session_starts[-1])
+            row = int(np.searchsorted(raw_timestamps, feed.timestamps[snapshot_at], side="left"))
+            snapshot["offset"] = base + int(line_starts[row])
+            snapshot["first_timestamp"] = int(raw_timestamps[row])
+
+        def on_snapshot():
+            snapshot["state"] = self._snapshot()
+
+        start_bars = engine.bars_processed
+        engine.run(snapshot_at=snapshot_at, on_snapshot=on_snapshot)
+        self.bars_run = engine.bars_processed - start_bars
+
+        if "state" not in snapshot:
+            # This file can't be resumed (unsorted / irregular rows)
+            self.state_path.unlink(missing_ok=True)
+            return
+
+        self._write_checkpoint({
+            "version": __version__,
+            "setup": setup_hash,
+            "header": header,
+            "size": base + len(body),
+            "check": self._check_hash(path, snapshot["offset"]),
+            **snapshot,
+        })
+
+    @staticmethod
+    def _line_starts(body: bytes) -> np.ndarray:
+        """Byte offset of each line in body"""
+        newlines = np.flatnonzero(np.frombuffer(body, dtype=np.uint8) == 10)
+        return np.concatenate(([0], newlines + 1))
+
+    @staticmethod
+    def _row_count(body: bytes) -> int:
+        """Data rows in body (one per line, no blank lines expected)"""
+        return body.count(b"\n") + (1 if body and not body.endswith(b"\n") else 0)
@@ -0,0 +1,322 @@
+"""
+Event-sourced journal of signals, risk decisions and fills
+
+    journal = Journal("runs/nifty.journal")
+    engine = BacktestEngine(..., journal=journal)
+    engine.run()
+    journal.close()
+
+    result = replay("runs/nifty.journal")      # positions + analytics, no strategies
+    python -m engine.journal runs/nifty.journal
+
+The journal is append-only and binary: a 16-byte header, then one 48-byte
+record per event (layout in RECORD / RECORD_DTYPE). Strategy ids,
+symbols, signal reasons and rule names are interned; the strings live in
+a sidecar file (<path>.strings, one JSON string per line, code = line
+number) that is always written before the records that use them.
+
+Events:
+    SIGNAL   - a strategy signal (quantity = position before, price = fill price)
+    APPROVE  - risk approval (quantity = approved size, reason = downsizing rule)
+    REJECT   - risk rejection (reason = the rule that fired, quantity =
+               position, value = strategy PnL at the time)
+    FILL     - executed trade (signed quantity, value = realized PnL)
+    EXIT     - fill from a protective exit (no signal / approval before it)
+
+The engine packs records into a batch buffer; full batches are written by
+a background thread so the run doesn't wait on the disk.
+"""
+import json
+import queue
+import struct
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from analytics.metrics import Analytics
+from core.signal import BUY, SELL
+from execution.execution_engine import ExecutionEngine
+from execution.models import Trade
+
+
+MAGIC = b"BTJRNL\x00\x01"
+VERSION = 1
+
+SIGNAL, APPROVE, REJECT, FILL, EXIT = range(5)
+KIND_NAMES = ("signal", "approve", "reject", "fill", "exit")
+
+# timestamp, quantity, price, value, strategy, symbol, reason, kind, side (+2 pad)
+RECORD = struct.Struct("<qqddIIIBb2x")
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("quantity", "<i8"),
+    ("price", "<f8"),
+    ("value", "<f8"),
+    ("strategy", "<u4"),
+    ("symbol", "<u4"),
+    ("reason", "<u4"),
+    ("kind", "u1"),
+    ("side", "i1"),
+    ("pad", "V2"),
+])
+HEADER = struct.Struct("<8sII")   # magic, version, record size
+
+# Reason of replayed skips, as logged by the engine
+SKIP_REASON = "Risk manager rejected"
+
+
+def _strings_path(path: Path) -> Path:
+    return path.with_name(path.name + ".strings")
+
+
+class Journal:
+    """Append-only event writer (one file per run)"""
+
+    def __init__(self, path: Union[str, Path], batch_events: int = 8192):
+        """
+        Args:
+            path: Journal file (replaced if it exists)
+            batch_events: Events packed per batch handed to the writer thread
+        """
+        self.path = Path(path)
+        self.batch_events = batch_events
+        self.events = 0
+        self.closed = False
+
+        # Interned strings; codes not yet handed to the writer start at _sent
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._sent = 0
+
+        self._batch = bytearray(RECORD.size * batch_events)
+        self._pending = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._strings_file = open(_strings_path(self.path), "w", encoding="utf-8")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+        self._error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=8)
+        self._thread = threading.Thread(target=self._write_loop, name="journal-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------
+    # Events (called by the engine)
+    # ------------------------------------------------------------
+    def _code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def _append(self, kind: int, timestamp: int, strategy_id: str, symbol: str,
+                side: int, quantity: int, price: float, value: float, reason: str):
+        code = self._code
+        RECORD.pack_into(self._batch, self._pending * RECORD.size,
+                         timestamp, quantity, price, value,
+                         code(strategy_id), code(symbol), code(reason), kind, side)
+        self._pending += 1
+        self.events += 1
+        if self._pending == self.batch_events:
+            self._submit()
+
+    def signal(self, signal, position_qty: int, price: float):
+        self._append(SIGNAL, signal.timestamp, signal.strategy_id, signal.symbol,
+                     1 if signal.side is BUY else -1, position_qty, price, 0.0, signal.reason)
+
+    def approve(self, signal, quantity: int, rule: str, strategy_pnl: float):
+        self._append(APPROVE, signal.timestamp, signal.strategy_id, signal.symbol,
+                     1 if signal.side is BUY else -1, quantity, 0.0, strategy_pnl, rule)
+
+    def reject(self, signal, rule: str, position_qty: int, strategy_pnl: float):
+        self._append(REJECT, signal.timestamp, signal.strategy_id, signal.symbol,
+                     1 if signal.side is BUY else -1, position_qty, 0.0, strategy_pnl, rule)
+
+    def fill(self, trade: Trade, exit: bool = False):
+        self._append(EXIT if exit else FILL, trade.timestamp, trade.strategy_id, trade.symbol,
+                     1 if trade.quantity > 0 else -1, trade.quantity, trade.price,
+                     trade.realized_pnl, trade.reason)
+
+    # ------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------
+    def _submit(self):
+        if self._error is not None:
+            raise RuntimeError(f"Journal writer failed: {self._error}") from self._error
+        if not self._pending:
+            return
+        new_strings = self.strings[self._sent:]
+        self._sent = len(self.strings)
+        self._queue.put((new_strings, bytes(self._batch[:self._pending * RECORD.size])))
+        self._pending = 0
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    strings, records = item
+                    if strings:
+                        # Strings first: a record never refers to an unwritten code
+                        self._strings_file.write("".join(json.dumps(s) + "\n" for s in strings))
+                        self._strings_file.flush()
+                    self._file.write(records)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Hand the current batch to the writer and wait until it's on disk"""
+        if self.closed:
+            return
+        self._submit()
+        self._queue.join()
+        self._file.flush()
+        if self._error is not None:
+            raise RuntimeError(f"Journal writer failed: {self._error}") from self._error
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            self._file.close()
+            self._strings_file.close()
+            self.closed = True
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.events
+
+
+# ------------------------------------------------------------
+# Reading / replay
+# ------------------------------------------------------------
+def read_journal(path: Union[str, Path]) -> Tuple[np.ndarray, List[str]]:
+    """(records as a structured array, interned strings)"""
+    path = Path(path)
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION, RECORD.size):
+        raise ValueError(f"Not a version {VERSION} journal: {path}")
+
+    records = np.fromfile(path, dtype=RECORD_DTYPE, offset=HEADER.size)
+    with open(_strings_path(path), encoding="utf-8") as f:
+        strings = [json.loads(line) for line in f]
+    return records, strings
+
+
+@dataclass
+class JournalReplay:
+    """State rebuilt from a journal"""
+    execution_engine: ExecutionEngine
+    analytics: Analytics
+    strategy_pnl: Dict[str, float]
+    events: int
+    # (strategy_id, rule) -> rejected signals
+    rejections: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+
+def replay(path: Union[str, Path], analytics: Optional[Analytics] = None) -> JournalReplay:
+    """
+    Rebuild positions, trades, skipped signals and strategy PnL from a
+    journal. Fills are applied with their journaled realized PnL, so the
+    result matches the run whatever accounting method it used.
+    """
+    records, strings = read_journal(path)
+    analytics = analytics if analytics is not None else Analytics()
+    execution_engine = ExecutionEngine()
+
+    kinds = records["kind"]
+    events = np.flatnonzero(kinds != SIGNAL)
+    events = events[kinds[events] != APPROVE]
+
+    columns = records[events]
+    strategy_pnl: Dict[str, float] = {}
+    for code in np.unique(records["strategy"][kinds == SIGNAL]).tolist():
+        strategy_pnl[strings[code]] = 0.0
+
+    rejections: Dict[Tuple[str, str], int] = {}
+    get_position = execution_engine.get_position
+    trades = execution_engine.trades
+    log_trade = analytics.log_trade
+    log_skip = analytics.log_skipped_trade
+
+    for kind, ts, strategy, symbol, side, quantity, price, value, reason in zip(
+            columns["kind"].tolist(), columns["timestamp"].tolist(),
+            columns["strategy"].tolist(), columns["symbol"].tolist(),
+            columns["side"].tolist(), columns["quantity"].tolist(),
+            columns["price"].tolist(), columns["value"].tolist(),
+            columns["reason"].tolist()):
+        strategy_id = strings[strategy]
+        symbol = strings[symbol]
+
+        if kind == REJECT:
+            log_skip(ts, strategy_id, symbol, BUY if side > 0 else SELL, SKIP_REASON,
+                     quantity, value)
+            key = (strategy_id, strings[reason])
+            rejections[key] = rejections.get(key, 0) + 1
+            continue
+
+        position = get_position(strategy_id, symbol)
+        if quantity > 0:
+            position.buy(quantity, price)
+        else:
+            position.sell(-quantity, price)
+
+        trade = Trade(strategy_id, symbol, BUY if quantity > 0 else SELL, quantity,
+                      price, ts, value, strings[reason])
+        trades.append(trade)
+        log_trade(trade)
+        if value != 0:
+            strategy_pnl[strategy_id] = strategy_pnl.get(strategy_id, 0.0) + value
+
+    return JournalReplay(execution_engine, analytics, strategy_pnl, len(records), rejections)
+
+
+def _print_replay(path: str):
+    result = replay(path)
+    print(f"📜 {path}: {result.events:,} events, {result.analytics.trade_count:,} fills, "
+          f"{result.analytics.skip_count:,} rejections")
+
+    print("\nPOSITIONS")
+    print("-" * 80)
+    for (strategy_id, symbol), position in result.execution_engine.positions.items():
+        print(f"  {strategy_id:25s} {symbol:10s} Qty={position.quantity:+d} "
+              f"AvgPrice={position.average_price:.2f}")
+
+    print("\nSTRATEGY PnL")
+    print("-" * 80)
+    for strategy_id, pnl in result.strategy_pnl.items():
+        print(f"  {strategy_id:25s}: {pnl:+10.2f}")
+
+    if result.rejections:
+        print("\nREJECTIONS BY RULE")
+        print("-" * 80)
+        for (strategy_id, rule), count in sorted(result.rejections.items()):
+            print(f"  {strategy_id:25s} {rule or '-':25s} {count:,}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a backtest event journal")
+    parser.add_argument("journal", help="Journal file written with --journal / Journal()")
+    _print_replay(parser.parse_args().journal)
@@ -0,0 +1,446 @@
+"""
+Parameter search over backtests: genetic algorithm with early pruning
+
+    base = {"strategies": [{"name": "ema_crossover", "params": {}}],
+            "risk": {"default_quantity": 5}}
+    space = {
+        "strategies.0.params.fast": range(2, 30),
+        "strategies.0.params.slow": range(10, 100, 5),
+        "risk.max_loss_per_strategy": [-1000, -2000, -5000],
+    }
+    search = Optimizer(feed, base, space, objective="total_pnl", n_workers=4,
+                       constraint=lambda p: p["strategies.0.params.fast"] < p["strategies.0.params.slow"])
+    result = search.genetic(population=24, generations=15)
+    result.best.params, result.best.score
+
+`base` uses the engine.config run layout ("strategies", "risk",
+"fill_model", "accounting", "portfolio_mode"); every key of `space` is a
+dotted path into it, with the values to try. grid() runs every
+combination through the same machinery, for comparison.
+
+Cost controls:
+    pool     - candidates of a generation run in a process pool; the feed
+               is sent to each worker once
+    pruning  - a run is checked after the first `prefix` of the bars
+               (rounded to a session start) and stopped there when its
+               objective is below the `prune_quantile` of what completed
+               runs scored at the same point (median pruning, once
+               `warmup` runs have completed)
+    caching  - every evaluation is kept by run config, so a candidate the
+               search revisits costs nothing; with a ResultCache, completed
+               runs are also reused across searches and processes
+
+Pruning thresholds are fixed per generation, so results don't depend on
+n_workers.
+"""
+import copy
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from analytics.metrics import Analytics
+from analytics.robustness import path_stats, trade_pnls
+from data.feed import MarketDataFeed
+from execution.models import Trade
+from .config import build_engine, config_hash
+from .result_cache import BacktestResult, ResultCache
+
+
+# ------------------------------------------------------------
+# Objectives (higher is better)
+# ------------------------------------------------------------
+def _metric(name: str) -> Callable[[List[Trade]], float]:
+    def objective(trades: List[Trade]) -> float:
+        return float(Analytics().calculate_metrics(trades, "all")[name])
+    return objective
+
+
+def _sharpe(trades: List[Trade]) -> float:
+    """Per-trade Sharpe of the closed trades"""
+    pnl = trade_pnls(trades)
+    if len(pnl) < 2:
+        return 0.0
+    return float(path_stats(pnl)[2][0])
+
+
+def _pnl_to_drawdown(trades: List[Trade]) -> float:
+    """Total PnL over max drawdown (drawdowns under 1 count as 1)"""
+    pnl = trade_pnls(trades)
+    if not len(pnl):
+        return 0.0
+    totals, max_dd, _ = path_stats(pnl)
+    return float(totals[0] / max(max_dd[0], 1.0))
+
+
+OBJECTIVES = {
+    "total_pnl": _metric("total_pnl"),
+    "win_rate": _metric("win_rate"),
+    "avg_win": _metric("avg_win"),
+    "sharpe": _sharpe,
+    "pnl_to_drawdown": _pnl_to_drawdown,
+}
+
+Objective = Union[str, Callable[[List[Trade]], float]]
+
+
+def objective_value(trades: List[Trade], objective: Objective = "total_pnl") -> float:
+    """
+    Score a list of trades
+
+    Args:
+        objective: Name in OBJECTIVES, or a picklable function of the trades
+    """
+    if callable(objective):
+        return float(objective(trades))
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}. Available: {sorted(OBJECTIVES)}")
+    return OBJECTIVES[objective](trades)
+
+
+# ------------------------------------------------------------
+# Runs
+# ------------------------------------------------------------
+def apply_params(base: Dict, params: Dict) -> Dict:
+    """Copy of a run config with each dotted-path param set"""
+    run = copy.deepcopy(base)
+    for path, value in params.items():
+        target = run
+        keys = path.split(".")
+        for key in keys[:-1]:
+            target = target[int(key)] if isinstance(target, list) else target.setdefault(key, {})
+        last = keys[-1]
+        if isinstance(target, list):
+            target[int(last)] = value
+        else:
+            target[last] = value
+    return run
+
+
+class _Pruned(Exception):
+    pass
+
+
+# Per-process evaluation context (set by the pool initializer)
+_worker: Dict = {}
+
+
+def _init_worker(feed: MarketDataFeed, cache: Optional[ResultCache]):
+    _worker["feed"] = feed
+    _worker["cache"] = cache
+
+
+def _evaluate(run: Dict, checkpoint: Optional[int], threshold: Optional[float],
+              objective: Objective) -> Tuple:
+    """Worker: (score, prefix score, pruned, cached, bars run, trades)"""
+    feed, cache = _worker["feed"], _worker["cache"]
+    engine = build_engine(run, feed)
+
+    key = None
+    if cache is not None:
+        key = cache.key(engine)
+        result = cache.get(key)
+        if result is not None:
+            return objective_value(result.trades, objective), None, False, True, 0, len(result.trades)
+
+    prefix_score = []
+
+    def check():
+        score = objective_value(engine.analytics.trades, objective)
+        prefix_score.append(score)
+        if threshold is not None and score < threshold:
+            raise _Pruned
+
+    try:
+        engine.run(snapshot_at=checkpoint, on_snapshot=check)
+    except _Pruned:
+        return -math.inf, prefix_score[0], True, False, engine.bars_processed, \
+            len(engine.analytics.trades)
+
+    if cache is not None:
+        cache.put(BacktestResult.from_engine(key, engine))
+
+    trades = engine.analytics.trades
+    return (objective_value(trades, objective), prefix_score[0] if prefix_score else None,
+            False, False, engine.bars_processed, len(trades))
+
+
+# ------------------------------------------------------------
+# Results
+# ------------------------------------------------------------
+@dataclass
+class Evaluation:
+    """One candidate's outcome"""
+    params: Dict
+    score: float                    # Objective over the whole feed (-inf when pruned)
+    prefix_score: Optional[float]   # Objective at the pruning checkpoint
+    pruned: bool = False
+    cached: bool = False            # Served from a ResultCache, not run
+    bars: int = 0                   # Bars actually processed
+    trades: int = 0
+
+
+@dataclass
+class OptimizationResult:
+    best: Optional[Evaluation]
+    evaluations: List[Evaluation] = field(default_factory=list)
+    feed_bars: int = 0
+    generations: int = 0
+
+    @property
+    def backtests(self) -> int:
+        """Runs started (completed or pruned; cache hits excluded)"""
+        return sum(1 for e in self.evaluations if not e.cached)
+
+    @property
+    def pruned(self) -> int:
+        return sum(1 for e in self.evaluations if e.pruned)
+
+    @property
+    def backtest_equivalents(self) -> float:
+        """Bars processed, in full-feed backtests"""
+        return sum(e.bars for e in self.evaluations) / self.feed_bars if self.feed_bars else 0.0
+
+    def top(self, n: int = 10) -> List[Evaluation]:
+        return sorted(self.evaluations, key=lambda e: e.score, reverse=True)[:n]
+
+
+# ------------------------------------------------------------
+# Search
+# ------------------------------------------------------------
+class Optimizer:
+
+    def __init__(self, feed: MarketDataFeed, base: Dict, space: Dict[str, Iterable],
+                 objective: Objective = "total_pnl",
+                 constraint: Optional[Callable[[Dict], bool]] = None,
+                 prefix: Optional[float] = 0.3,
+                 prune_quantile: float = 0.5,
+                 warmup: int = 8,
+                 n_workers: int = 1,
+                 cache: Optional[ResultCache] = None,
+                 verbose: bool = True):
+        """
+        Args:
+            feed: Loaded market data every candidate runs on
+            base: Run config (engine.config layout) the params are applied to
+            space: Dotted path -> values to try
+            objective: Name in OBJECTIVES or a picklable function of the trades
+            constraint: Skip param sets for which this returns False
+            prefix: Fraction of bars after which runs can be pruned (None: never)
+            prune_quantile: Prune runs scoring below this quantile at the checkpoint
+            warmup: Completed runs needed before anything is pruned
+            n_workers: > 1 evaluates candidates in a process pool
+            cache: Also reuse / store completed runs in this ResultCache
+        """
+        if feed.timestamps is None:
+            feed.load()
+        self.feed = feed
+        self.base = base
+        self.names = list(space)
+        self.values: List[List] = [
+            [v.item() if isinstance(v, np.generic) else v for v in values]
+            for values in space.values()
+        ]
+        if not self.names or any(not values for values in self.values):
+            raise ValueError("Every parameter in the space needs at least one value")
+        apply_params(base, self.params(tuple(0 for _ in self.names)))   # bad paths fail here
+
+        if not callable(objective) and objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}. Available: {sorted(OBJECTIVES)}")
+        self.objective = objective
+        self.constraint = constraint
+        self.prune_quantile = prune_quantile
+        self.warmup = warmup
+        self.n_workers = n_workers
+        self.cache = cache
+        self.verbose = verbose
+
+        self.checkpoint = self._checkpoint(prefix) if prefix else None
+
+        # config hash -> Evaluation, for every candidate evaluated so far
+        self.evaluated: Dict[str, Evaluation] = {}
+
+    def _checkpoint(self, prefix: float) -> int:
+        """First session start at or after `prefix` of the bars"""
+        target = int(len(self.feed) * prefix)
+        starts = getattr(self.feed, "session_starts", None)
+        if starts is not None and len(starts):
+            later = starts[starts >= target]
+            if len(later):
+                return int(later[0])
+        return target
+
+    def params(self, genome: Sequence[int]) -> Dict:
+        return {name: values[i] for name, values, i in zip(self.names, self.values, genome)}
+
+    def valid(self, genome: Sequence[int]) -> bool:
+        return self.constraint is None or bool(self.constraint(self.params(genome)))
+
+    @property
+    def size(self) -> int:
+        """Combinations in the space (before the constraint)"""
+        return math.prod(len(values) for values in self.values)
+
+    # ------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------
+    @contextmanager
+    def _pool(self):
+        if self.n_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                     initargs=(self.feed, self.cache)) as pool:
+                yield pool
+        else:
+            _init_worker(self.feed, self.cache)
+            try:
+                yield None
+            finally:
+                _worker.clear()
+
+    def _threshold(self) -> Optional[float]:
+        if self.checkpoint is None:
+            return None
+        scores = [e.prefix_score for e in self.evaluated.values()
+                  if not e.pruned and e.prefix_score is not None]
+        if len(scores) < self.warmup:
+            return None
+        return float(np.quantile(scores, self.prune_quantile))
+
+    def evaluate(self, genomes: List[Sequence[int]], pool=None) -> List[Evaluation]:
+        """Evaluations for a batch of genomes (already evaluated ones are reused)"""
+        runs = {}
+        for genome in genomes:
+            params = self.params(genome)
+            run = apply_params(self.base, params)
+            key = config_hash(run)
+            if key not in self.evaluated and key not in runs:
+                runs[key] = (params, run)
+
+        if runs:
+            threshold = self._threshold()
+            jobs = [(run, self.checkpoint, threshold, self.objective) for _, run in runs.values()]
+            if pool is None:
+                outcomes = [_evaluate(*job) for job in jobs]
+            else:
+                outcomes = list(pool.map(_evaluate, *zip(*jobs)))
+            for (key, (params, _)), outcome in zip(runs.items(), outcomes):
+                self.evaluated[key] = Evaluation(params, *outcome)
+
+        return [self.evaluated[config_hash(apply_params(self.base, self.params(g)))]
+                for g in genomes]
+
+    def _result(self, best: Optional[Evaluation], generations: int) -> OptimizationResult:
+        return OptimizationResult(best=best, evaluations=list(self.evaluated.values()),
+                                  feed_bars=len(self.feed), generations=generations)
+
+    # ------------------------------------------------------------
+    # Strategies
+    # ------------------------------------------------------------
+    def grid(self) -> OptimizationResult:
+        """Every valid combination (pruning still applies)"""
+        genomes = [g for g in itertools.product(*(range(len(v)) for v in self.values))
+                   if self.valid(g)]
+        with self._pool() as pool:
+            evaluations = self.evaluate(genomes, pool)
+        best = max(evaluations, key=lambda e: e.score, default=None)
+        return self._result(best, 1)
+
+    def genetic(self, population: int = 24, generations: int = 20, elite: int = 2,
+                tournament: int = 3, crossover_rate: float = 0.9,
+                mutation_rate: float = 0.2, patience: int = 5,
+                max_backtests: Optional[int] = None, seed: int = 0) -> OptimizationResult:
+        """
+        Genetic search: tournament selection, uniform crossover, mutation
+        by a few steps along each value list, elitism
+
+        Args:
+            population: Candidates per generation
+            generations: Upper bound on generations
+            elite: Best candidates carried over unchanged
+            patience: Stop after this many generations without a better best
+            max_backtests: Stop once this many runs were started
+            seed: Seed for the search (results are reproducible)
+        """
+        rng = np.random.default_rng(seed)
+        genomes = self._fill([], population, rng)
+
+        best = None
+        stale = 0
+        generation = 0
+        with self._pool() as pool:
+            while genomes and generation < generations:
+                generation += 1
+                evaluations = self.evaluate(genomes, pool)
+
+                leader = max(evaluations, key=lambda e: e.score)
+                if best is None or leader.score > best.score:
+                    best, stale = leader, 0
+                else:
+                    stale += 1
+
+                started = sum(1 for e in self.evaluated.values() if not e.cached)
+                if self.verbose:
+                    pruned = sum(1 for e in self.evaluated.values() if e.pruned)
+                    print(f"🧬 Generation {generation}: best {best.score:.2f} "
+                          f"{best.params} ({started} runs, {pruned} pruned)")
+
+                if stale >= patience or (max_backtests is not None and started >= max_backtests):
+                    break
+                genomes = self._breed(genomes, [e.score for e in evaluations], population,
+                                      elite, tournament, crossover_rate, mutation_rate, rng)
+
+        return self._result(best, generation)
+
+    def _seen(self, genome) -> bool:
+        return config_hash(apply_params(self.base, self.params(genome))) in self.evaluated
+
+    def _fill(self, genomes: List[tuple], population: int, rng) -> List[tuple]:
+        """Top a generation up with random, valid, not yet evaluated genomes"""
+        taken = set(genomes)
+        for _ in range(population * 50):
+            if len(genomes) >= population:
+                break
+            genome = tuple(int(rng.integers(len(values))) for values in self.values)
+            if genome in taken or not self.valid(genome) or self._seen(genome):
+                continue
+            genomes.append(genome)
+            taken.add(genome)
+        return genomes
+
+    def _breed(self, genomes, scores, population, elite, tournament, crossover_rate,
+               mutation_rate, rng) -> List[tuple]:
+        order = sorted(range(len(genomes)), key=lambda i: scores[i], reverse=True)
+        children = [genomes[i] for i in order[:elite]]
+        taken = set(children)
+
+        def select():
+            picks = rng.integers(len(genomes), size=min(tournament, len(genomes)))
+            return genomes[max(picks, key=lambda i: scores[i])]
+
+        for _ in range(population * 20):
+            if len(children) >= population:
+                break
+            a, b = select(), select()
+            if rng.random() < crossover_rate:
+                child = [x if rng.random() < 0.5 else y for x, y in zip(a, b)]
+            else:
+                child = list(a)
+
+            for j, values in enumerate(self.values):
+                if len(values) > 1 and rng.random() < mutation_rate:
+                    step = int(round(rng.normal(0, max(1.0, len(values) / 10))))
+                    step = step or (1 if rng.random() < 0.5 else -1)
+                    child[j] = min(max(child[j] + step, 0), len(values) - 1)
+
+            child = tuple(child)
+            if child in taken or not self.valid(child) or self._seen(child):
+                continue
+            children.append(child)
+            taken.add(child)
+
+        # Converged population: explore at random instead
+        return self._fill(children, population, rng)
@@ -0,0 +1,256 @@
+"""
+Vectorized strategy groups for portfolio mode
+
+BacktestEngine(portfolio_mode=True) replaces every set of two or more
+strategies of the same (vectorizable) class and symbol with one group.
+A group keeps the state of all its variants in numpy arrays and steps
+them with one array update per bar, so the per-bar cost follows the number
+of distinct lookback periods, not the number of variants.
+
+Indicator values are computed as dot products over a shared price window.
+Where the summation order could flip a comparison (values within rounding
+of each other), those few variants are recomputed exactly the way the
+strategy does it, so signals match sequential mode bar for bar. Signals
+are still created by each strategy's emit(), with its own id, and go
+through the normal risk and execution path.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.signal import BUY, SELL, Signal
+from data.bar import Bar
+from strategies.base import BaseStrategy
+from strategies.history import PriceHistory
+from strategies.ema_crossover import EMACrossoverStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+
+
+# Relative distance below which a vectorized comparison is re-checked
+TIE_TOLERANCE = 1e-9
+
+
+class StrategyGroup(ABC):
+    """Variants of one strategy class on one symbol, stepped together"""
+
+    def __init__(self, strategies: Sequence[BaseStrategy]):
+        self.strategies = list(strategies)
+        self.symbol = self.strategies[0].symbol
+        self.slots = {s.strategy_id: i for i, s in enumerate(self.strategies)}
+
+        n = len(self.strategies)
+        self.in_position = np.zeros(n, dtype=bool)
+
+    def _window_buffer(self, size: int):
+        """Shared history of the last `size` closes"""
+        self.window = size
+        self.prices = PriceHistory(size)
+
+    def _push(self, price: float) -> np.ndarray:
+        """Add a price, return the last `window` prices (oldest first)"""
+        self.prices.append(price)
+        return self.prices.window()
+
+    @abstractmethod
+    def on_bar(self, bar: Bar) -> List[Signal]:
+        pass
+
+    def _emit(self, buy: np.ndarray, sell: np.ndarray, timestamp: int,
+              buy_reason: str, sell_reason: str) -> List[Signal]:
+        signals = []
+        for slot in np.flatnonzero(buy | sell).tolist():
+            strategy = self.strategies[slot]
+            if buy[slot]:
+                signals.append(strategy.emit(BUY, timestamp, buy_reason))
+            else:
+                signals.append(strategy.emit(SELL, timestamp, sell_reason))
+        return signals
+
+    def on_protective_exit(self, signal: Signal):
+        slot = self.slots[signal.strategy_id]
+        self.in_position[slot] = False
+        self.strategies[slot].on_protective_exit(signal)
+
+    def sync(self):
+        """
+        Copy group state back onto the strategy objects (end of run), so
+        they can be inspected or stepped on their own from there
+        """
+        count = self.prices.count
+        for strategy, in_position in zip(self.strategies, self.in_position.tolist()):
+            strategy.in_position = in_position
+            strategy.prices.load(self.prices.last(strategy.lookback).tolist(), count)
+
+
+class EMACrossoverGroup(StrategyGroup):
+    """
+    EMACrossoverStrategy variants
+
+    Each strategy's EMA is seeded with the oldest price of its window and
+    run over the last `period` prices, i.e. a fixed set of weights per
+    period. One (periods x window) matrix-vector product per bar gives
+    every distinct period's EMA; variants index into it.
+    """
+
+    def __init__(self, strategies: Sequence[EMACrossoverStrategy]):
+        super().__init__(strategies)
+
+        fast = np.array([s.fast for s in self.strategies])
+        slow = np.array([s.slow for s in self.strategies])
+        periods = np.unique(np.concatenate((fast, slow)))
+
+        self.fast_index = np.searchsorted(periods, fast)
+        self.slow_index = np.searchsorted(periods, slow)
+        self.fast = fast
+        self.warmup = slow + 1
+        self.min_warmup = int(self.warmup.min())
+
+        self._window_buffer(int(periods.max()))
+        self.weights = np.zeros((len(periods), self.window))
+        for row, period in enumerate(periods.tolist()):
+            alpha = 2 / (period + 1)
+            w = alpha * (1 - alpha) ** np.arange(period - 1, -1, -1, dtype=np.float64)
+            w[0] = (1 - alpha) ** (period - 1)
+            self.weights[row, self.window - period:] = w
+
+        n = len(self.strategies)
+        self.prev_fast = np.zeros(n)
+        self.prev_slow = np.zeros(n)
+        self.has_prev = np.zeros(n, dtype=bool)
+
+    def on_bar(self, bar: Bar) -> List[Signal]:
+        window = self._push(bar.close)
+        count = self.prices.count
+        if count < self.min_warmup:
+            return []
+
+        emas = self.weights @ window
+        fast = emas[self.fast_index]
+        slow = emas[self.slow_index]
+
+        warm = count >= self.warmup
+
+        # Near-equal EMAs: recompute with the strategy's own loop so the
+        # crossover test sees exactly the values sequential mode would.
+        # Same for fast > slow variants before `fast` prices exist: the
+        # strategy then runs its EMA over the shorter history.
+        near = warm & (np.abs(fast - slow) <= TIE_TOLERANCE * abs(bar.close))
+        if count < self.window:
+            near |= warm & (self.fast > count)
+        if near.any():
+            prices = window[max(self.window - count, 0):].tolist()
+            for slot in np.flatnonzero(near).tolist():
+                strategy = self.strategies[slot]
+                fast[slot] = strategy._ema(prices[-strategy.fast:], strategy.fast)
+                slow[slot] = strategy._ema(prices[-strategy.slow:], strategy.slow)
+
+        ready = warm & self.has_prev
+        in_position = self.in_position
+
+        buy = ready & ~in_position & (self.prev_fast <= self.prev_slow) & (fast > slow)
+        sell = ready & in_position & (self.prev_fast >= self.prev_slow) & (fast < slow)
+        in_position[buy] = True
+        in_position[sell] = False
+
+        np.copyto(self.prev_fast, fast, where=warm)
+        np.copyto(self.prev_slow, slow, where=warm)
+        self.has_prev |= warm
+
+        if not (buy.any() or sell.any()):
+            return []
+        return self._emit(buy, sell, bar.timestamp,
+                          "EMA bullish crossover", "EMA bearish crossover")
+
+    def sync(self):
+        """Also hands back the last EMAs (equal to the strategy's own up to rounding)"""
+        super().sync()
+        has_prev = self.has_prev.tolist()
+        for strategy, fast, slow, known in zip(self.strategies, self.prev_fast.tolist(),
+                                               self.prev_slow.tolist(), has_prev):
+            strategy.prev_fast = fast if known else None
+            strategy.prev_slow = slow if known else None
+
+
+class MeanReversionGroup(StrategyGroup):
+    """MeanReversionStrategy variants: every distinct SMA from one 0/1 matrix product"""
+
+    def __init__(self, strategies: Sequence[MeanReversionStrategy]):
+        super().__init__(strategies)
+
+        period = np.array([s.period for s in self.strategies])
+        periods = np.unique(period)
+
+        self.index = np.searchsorted(periods, period)
+        self.warmup = period
+        self.min_warmup = int(period.min())
+
+        self._window_buffer(int(periods.max()))
+        self.mask = np.zeros((len(periods), self.window))
+        for row, p in enumerate(periods.tolist()):
+            self.mask[row, self.window - p:] = 1.0
+        self.periods = periods.astype(np.float64)
+        self.period = period
+
+    def on_bar(self, bar: Bar) -> List[Signal]:
+        price = bar.close
+        window = self._push(price)
+        count = self.prices.count
+        if count < self.min_warmup:
+            return []
+
+        sma = ((self.mask @ window) / self.periods)[self.index]
+        warm = count >= self.warmup
+
+        # price == sma is a real case (flat windows): redo near-ties with np.mean
+        near = warm & (np.abs(sma - price) <= TIE_TOLERANCE * abs(price))
+        for slot in np.flatnonzero(near).tolist():
+            sma[slot] = np.mean(window[-self.period[slot]:])
+
+        in_position = self.in_position
+
+        buy = warm & ~in_position & (price < sma)
+        sell = warm & in_position & (price >= sma)
+        in_position[buy] = True
+        in_position[sell] = False
+
+        if not (buy.any() or sell.any()):
+            return []
+        return self._emit(buy, sell, bar.timestamp,
+                          "Mean reversion entry", "Mean reversion exit")
+
+
+# Strategy class -> group implementation (exact class match only: a
+# subclass may override on_bar)
+VECTORIZED_GROUPS = {
+    EMACrossoverStrategy: EMACrossoverGroup,
+    MeanReversionStrategy: MeanReversionGroup,
+}
+
+
+def register_group(strategy_class: type, group_class: type):
+    VECTORIZED_GROUPS[strategy_class] = group_class
+
+
+def group_strategies(strategies: Sequence[BaseStrategy],
+                     min_group_size: int = 2) -> Tuple[List[StrategyGroup], List[BaseStrategy]]:
+    """
+    Split strategies into vectorized groups and the ones run one by one
+
+    Returns:
+        (groups, singles) - singles keep their original order
+    """
+    buckets: Dict[Tuple[type, str], List[BaseStrategy]] = {}
+    for strategy in strategies:
+        if type(strategy) in VECTORIZED_GROUPS:
+            buckets.setdefault((type(strategy), strategy.symbol), []).append(strategy)
+
+    groups = []
+    grouped = set()
+    for (cls, _), members in buckets.items():
+        if len(members) >= min_group_size:
+            groups.append(VECTORIZED_GROUPS[cls](members))
+            grouped.update(id(s) for s in members)
+
+    singles = [s for s in strategies if id(s) not in grouped]
+    return groups, singles
@@ -0,0 +1,234 @@
+"""
+Content-addressed cache of backtest results
+
+A result is keyed by a fingerprint of everything that can change it:
+the loaded bars, each strategy's class and constructor params, the risk
+manager / execution / fill model configuration and the package version.
+Entries live on disk as one pickle per key; the least recently used ones
+are evicted once the directory grows past max_bytes.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import date, time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from core.files import atomic_write
+from core.version import __version__
+from execution.models import Trade
+
+
+def describe(obj):
+    """JSON-able description of a config object: class + constructor args"""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (time, date)):
+        return obj.isoformat()
+    if isinstance(obj, (list, tuple)):
+        return [describe(v) for v in obj]
+    if isinstance(obj, dict):
+        return {str(k): describe(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+
+    if is_dataclass(obj):
+        params = {f.name: getattr(obj, f.name) for f in fields(obj)}
+    elif hasattr(obj, "get_params"):
+        params = obj.get_params()
+    else:
+        params = {
+            name: getattr(obj, name)
+            for name in inspect.signature(type(obj).__init__).parameters
+            if name != "self" and hasattr(obj, name)
+        }
+
+    cls = type(obj)
+    return {"class": f"{cls.__module__}.{cls.__qualname__}", "params": describe(params)}
+
+
+def fingerprint(engine) -> str:
+    """
+    Cache key for a (not yet run) BacktestEngine
+
+    Strategies and the risk manager must be freshly constructed: only
+    their constructor params are hashed, not their runtime state.
+    """
+    payload = setup(engine)
+    payload["data"] = engine.data_feed.content_hash()
+    blob = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def setup(engine) -> Dict:
+    """Everything that defines a run except its data (JSON-able)"""
+    exit_rules = engine.exit_manager.rules if engine.exit_manager is not None else None
+
+    return {
+        "version": __version__,
+        "strategies": [describe(s) for s in engine.strategies],
+        "risk": describe(engine.risk_manager),
+        "execution": describe(engine.execution_engine),
+        "fill_model": describe(engine.fill_model),
+        "exit_rules": describe(exit_rules),
+    }
+
+
+@dataclass
+class BacktestResult:
+    """Trades and metrics of one backtest (fresh or from the cache)"""
+    key: str
+    trades: List[Trade]
+    metrics: List[Dict]
+    strategy_pnl: Dict[str, float]
+    bars_processed: int
+    skip_count: int
+    cached: bool = False
+
+    @classmethod
+    def from_engine(cls, key: str, engine) -> "BacktestResult":
+        analytics = engine.analytics
+        if not analytics.keep_in_memory:
+            raise ValueError("Result caching needs Analytics(keep_in_memory=True)")
+
+        strategy_ids = [s.strategy_id for s in engine.strategies]
+        metrics = [
+            analytics.calculate_metrics(
+                [t for t in analytics.trades if t.strategy_id == sid], sid
+            )
+            for sid in strategy_ids
+        ]
+
+        return cls(
+            key=key,
+            trades=list(analytics.trades),
+            metrics=metrics,
+            strategy_pnl={sid: engine.risk_manager.get_strategy_pnl(sid) for sid in strategy_ids},
+            bars_processed=engine.bars_processed,
+            skip_count=analytics.skip_count,
+        )
+
+
+class ResultCache:
+    """
+    On-disk LRU cache of BacktestResults
+
+    Usage:
+        cache = ResultCache(".backtest_cache", max_bytes=256 * 1024 * 1024)
+        result = cache.run(engine)               # runs once, then served from disk
+        result = cache.run(engine, bypass=True)  # always re-run (refreshes the entry)
+    """
+
+    SUFFIX = ".result.pkl"
+
+    def __init__(self, directory: Union[str, Path] = ".backtest_cache",
+                 max_bytes: int = 512 * 1024 * 1024,
+                 enabled: bool = True):
+        """
+        Args:
+            directory: Where entries are stored
+            max_bytes: Total size above which least recently used entries are evicted
+            enabled: False turns the cache into a pass-through
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def key(self, engine) -> str:
+        return fingerprint(engine)
+
+    def get(self, key: str) -> Optional[BacktestResult]:
+        """Stored result for key (None on a miss)"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except Exception:
+            # Truncated / written by an incompatible version: drop it
+            path.unlink(missing_ok=True)
+            return None
+
+        # Touch so eviction sees it as recently used
+        os.utime(path)
+        result.cached = True
+        return result
+
+    def put(self, result: BacktestResult):
+        """Store a result atomically, then enforce the size bound"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        atomic_write(self._path(result.key),
+                     pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+
+        self._evict(keep=result.key)
+
+    def run(self, engine, bypass: bool = False) -> BacktestResult:
+        """
+        Return the cached result for engine, running it on a miss
+
+        Args:
+            engine: Freshly constructed BacktestEngine
+            bypass: Skip the lookup and re-run (the new result is still stored)
+        """
+        key = self.key(engine)
+
+        if self.enabled and not bypass:
+            result = self.get(key)
+            if result is not None:
+                self.hits += 1
+                if engine.verbose:
+                    print(f"♻️  Using cached result {key[:12]} ({len(result.trades)} trades)")
+                return result
+
+        self.misses += 1
+        engine.run()
+        result = BacktestResult.from_engine(key, engine)
+
+        if self.enabled:
+            self.put(result)
+        return result
+
+    # ------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------
+    def _entries(self) -> List[tuple]:
+        if not self.directory.exists():
+            return []
+        return [(p, p.stat()) for p in self.directory.glob(f"*{self.SUFFIX}")]
+
+    def _evict(self, keep: Optional[str] = None):
+        """Delete least recently used entries until under max_bytes"""
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime_ns)
+        total = sum(stat.st_size for _, stat in entries)
+        keep_path = self._path(keep) if keep else None
+
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def size_bytes(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def clear(self):
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
@@ -0,0 +1,202 @@
+"""
+Config-driven runner: many runs from one file, one loaded feed per data source
+"""
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Union
+
+from analytics.export import SKIP_COLUMNS, TRADE_COLUMNS, open_writer
+from analytics.metrics import Analytics
+from data.feed import MarketDataFeed
+from .config import build_engine, config_hash, expand_runs, load_config
+
+
+MANIFEST = "manifest.json"
+
+
+def file_hash(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FeedPool:
+    """Loads each data source at most once and shares it across runs"""
+
+    def __init__(self, specs: Dict[str, Dict]):
+        self.specs = specs
+        self.feeds: Dict[str, MarketDataFeed] = {}
+        self.hashes: Dict[str, str] = {}
+        self.stores = {}
+
+    def _spec(self, ref) -> Dict:
+        if isinstance(ref, dict):
+            return ref
+        if ref not in self.specs:
+            raise KeyError(f"Unknown feed: {ref}. Defined feeds: {sorted(self.specs)}")
+        return self.specs[ref]
+
+    def _key(self, ref) -> str:
+        return ref if isinstance(ref, str) else json.dumps(ref, sort_keys=True)
+
+    def data_hash(self, ref) -> str:
+        key = self._key(ref)
+        if key not in self.hashes:
+            spec = self._spec(ref)
+            if "shared" in spec:
+                self.hashes[key] = self.get(ref).content_hash()
+            else:
+                self.hashes[key] = file_hash(spec["path"])
+        return self.hashes[key]
+
+    def get(self, ref) -> MarketDataFeed:
+        key = self._key(ref)
+        if key not in self.feeds:
+            spec = dict(self._spec(ref))
+            if "shared" in spec:
+                # {"shared": "<store name>", "symbol": ...}: attach, no copy
+                self.feeds[key] = self._store(spec["shared"]).feed(spec.get("symbol", "NIFTY"))
+                return self.feeds[key]
+
+            feed = MarketDataFeed(
+                csv_path=spec.pop("path"),
+                symbol=spec.pop("symbol", "NIFTY"),
+                **spec
+            )
+            feed.load()
+            self.feeds[key] = feed
+        return self.feeds[key]
+
+    def _store(self, name: str):
+        if name not in self.stores:
+            from data.shared_store import SharedBarStore
+
+            self.stores[name] = SharedBarStore.attach(name)
+        return self.stores[name]
+
+
+def read_manifest(out_dir: Union[str, Path]):
+    path = Path(out_dir) / MANIFEST
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def run_config(config: Union[str, Path, Dict], force: bool = False) -> List[Dict]:
+    """
+    Execute every run described by a config
+
+    Args:
+        config: Config file path or already-parsed dict
+        force: Re-run even when an identical manifest already exists
+
+    Returns:
+        One manifest dict per run (with "skipped": True for cache hits)
+    """
+    if not isinstance(config, dict):
+        config = load_config(config)
+
+    feeds = FeedPool(config.get("feeds", {}))
+    manifests = []
+
+    for run in expand_runs(config):
+        feed_ref = run.get("feed")
+        if feed_ref is None:
+            raise ValueError(f"Run {run['name']} has no feed")
+
+        chash = config_hash(run, feeds._spec(feed_ref))
+        dhash = feeds.data_hash(feed_ref)
+        out_dir = Path(run["outputs"]["dir"])
+
+        previous = read_manifest(out_dir)
+        if (not force and previous is not None
+                and previous.get("config_hash") == chash
+                and previous.get("data_hash") == dhash
+                and _outputs_present(previous)):
+            print(f"⏭️  {run['name']}: identical run already in {out_dir} (skipped)")
+            manifests.append({**previous, "skipped": True})
+            continue
+
+        manifests.append(_execute(run, feeds, chash, dhash, out_dir))
+
+    return manifests
+
+
+def _outputs_present(manifest: Dict) -> bool:
+    """Every file a manifest lists as an output still exists"""
+    return all(Path(path).exists() for path in manifest.get("outputs", {}).values())
+
+
+def _execute(run: Dict, feeds: FeedPool, chash: str, dhash: str, out_dir: Path) -> Dict:
+    started = time.perf_counter()
+
+    feed = feeds.get(run["feed"])
+    loaded = time.perf_counter()
+
+    outputs = run["outputs"]
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    analytics = Analytics(
+        trade_writer=open_writer(str(out_dir / outputs["trades"]), TRADE_COLUMNS),
+        skip_writer=open_writer(str(out_dir / outputs["skipped"]), SKIP_COLUMNS),
+        skip_mode=run.get("skip_mode", "full"),
+    )
+    journal = None
+    if "journal" in outputs:
+        from .journal import Journal
+        journal = Journal(out_dir / outputs["journal"])
+
+    engine = build_engine(run, feed, analytics=analytics, journal=journal,
+                          verbose=run.get("verbose", False))
+    engine.run()
+    finished = time.perf_counter()
+
+    analytics.close()
+    if journal is not None:
+        journal.close()
+    strategy_ids = [s.strategy_id for s in engine.strategies]
+    risk_manager = engine.risk_manager
+    analytics.export_metrics_csv(str(out_dir / outputs["metrics"]), strategy_ids)
+    exported = time.perf_counter()
+
+    manifest = {
+        "name": run["name"],
+        "config_hash": chash,
+        "data_hash": dhash,
+        "config": run,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "timings": {
+            "load_s": round(loaded - started, 6),
+            "run_s": round(finished - loaded, 6),
+            "export_s": round(exported - finished, 6),
+            "total_s": round(exported - started, 6),
+        },
+        "bars": engine.bars_processed,
+        "trades": analytics.trade_count,
+        "skipped_signals": analytics.skip_count,
+        "strategy_pnl": {sid: risk_manager.get_strategy_pnl(sid) for sid in strategy_ids},
+        "metrics": [
+            analytics.calculate_metrics(
+                [t for t in analytics.trades if t.strategy_id == sid], sid
+            )
+            for sid in strategy_ids
+        ],
+        "outputs": {key: str(out_dir / name) for key, name in outputs.items() if key != "dir"},
+        "skipped": False,
+    }
+
+    with open(out_dir / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+    total = sum(manifest["strategy_pnl"].values())
+    print(f"✅ {run['name']}: {manifest['trades']} trades, PnL {total:+.2f} "
+          f"in {manifest['timings']['total_s']:.2f}s -> {out_dir}")
+
+    return manifest
@@ -0,0 +1,364 @@
+"""
+Run telemetry: counters, latency histograms and a Prometheus-text exporter
+
+    telemetry = Telemetry(sample_every=128)
+    engine = BacktestEngine(..., telemetry=telemetry)
+    with PrometheusExporter(telemetry, port=9108):   # GET /metrics
+        engine.run()
+
+    FileExporter(telemetry, "metrics/backtest.prom", interval=5.0)  # textfile scrapers
+
+What is measured:
+    strategy compute time   - each strategy's (or group's) on_bar, per strategy
+    bar stage time          - whole bar; pre_trade (session hooks, risk marks,
+                              protective exits); strategies (higher-timeframe
+                              bars, on_bar calls, risk checks and fills)
+    bar-to-fill latency     - start of the bar to the executed trade, per strategy
+                              (fills on sampled bars)
+    counters                - bars, signals, fills, rejections per (strategy, rule)
+
+Timings use perf_counter_ns and are only taken on one bar in
+`sample_every`: reading the clock on every bar alone
+would cost ~1% of a bar. Unsampled bars pay one flag lookup, so the
+overhead stays well under 1%. Counters are exact.
+
+Single writer, no locks: the engine thread is the only one that mutates
+counters and histograms; exporters copy plain ints / lists, which the
+GIL keeps consistent per element.
+"""
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from core.files import atomic_write
+
+perf_ns = time.perf_counter_ns
+
+
+# Histogram layout: values below 2**SUB_BITS get one bucket each, every
+# power of two above that is split into HALF buckets (~3% precision)
+SUB_BITS = 6
+SUB = 1 << SUB_BITS
+HALF = SUB // 2
+MAX_SHIFT = 36          # values above ~2**42 ns (73 min) land in the last bucket
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+STAGES = ("bar", "pre_trade", "strategies")
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of integer nanoseconds
+
+    Recording is O(1) (bit_length + one list increment); quantiles walk
+    the buckets and report the highest value a bucket can hold.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (SUB + MAX_SHIFT * HALF)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value: int) -> int:
+        if value < SUB:
+            return value if value > 0 else 0
+        shift = value.bit_length() - SUB_BITS
+        if shift > MAX_SHIFT:
+            return SUB + MAX_SHIFT * HALF - 1
+        return SUB + (shift - 1) * HALF + (value >> shift) - HALF
+
+    @staticmethod
+    def bucket_high(index: int) -> int:
+        """Largest value recorded into bucket `index`"""
+        if index < SUB:
+            return index
+        shift, offset = divmod(index - SUB, HALF)
+        shift += 1
+        return ((offset + HALF + 1) << shift) - 1
+
+    def record(self, value: int):
+        if value < SUB:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - SUB_BITS
+            index = (SUB + (shift - 1) * HALF + (value >> shift) - HALF
+                     if shift <= MAX_SHIFT else SUB + MAX_SHIFT * HALF - 1)
+        self.counts[index] += 1
+
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def quantiles(self, qs: Iterable[float] = QUANTILES) -> Dict[float, int]:
+        """Value at each quantile (ns); 0 for an empty histogram"""
+        counts = list(self.counts)   # one consistent copy while the engine keeps recording
+        total = sum(counts)
+        result = {}
+        if not total:
+            return {q: 0 for q in qs}
+
+        for q in sorted(qs):
+            target = max(1, int(q * total + 0.5))
+            seen = 0
+            for index, n in enumerate(counts):
+                seen += n
+                if seen >= target:
+                    result[q] = min(self.bucket_high(index), self.max)
+                    break
+        return result
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        if other.count and (not self.count or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _Timed:
+    """Stand-in for a strategy / group on sampled bars: times on_bar"""
+
+    __slots__ = ("target", "symbol", "strategy_id", "histogram")
+
+    def __init__(self, target, histogram: LatencyHistogram):
+        self.target = target
+        self.symbol = target.symbol
+        self.strategy_id = getattr(target, "strategy_id", None)
+        self.histogram = histogram
+
+    def on_bar(self, bar):
+        start = perf_ns()
+        result = self.target.on_bar(bar)
+        self.histogram.record(perf_ns() - start)
+        return result
+
+
+class Telemetry:
+
+    def __init__(self, sample_every: int = 128):
+        """
+        Args:
+            sample_every: Time strategies, stages and fills on one bar in
+                          this many (1 = every bar)
+        """
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be >= 1, got {sample_every}")
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        self.started = time.time()
+        self._started_ns = perf_ns()
+
+        # Bars processed (refreshed on sampled bars and at the end of a run)
+        self.bars = 0
+        self.signals: Dict[str, int] = defaultdict(int)
+        self.fills: Dict[str, int] = defaultdict(int)
+        self.rejections: Dict[Tuple[str, str], int] = defaultdict(int)
+
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+        self.strategy_time: Dict[str, LatencyHistogram] = {}
+        self.bar_to_fill: Dict[str, LatencyHistogram] = {}
+
+        # id(list) -> (list, timed stand-ins) for the engine's strategy lists
+        self._timed: Dict[int, tuple] = {}
+
+    # ------------------------------------------------------------
+    # Recording (engine thread)
+    # ------------------------------------------------------------
+    def timed(self, targets: List) -> List[_Timed]:
+        """Timing stand-ins for a strategy or group list (built once per list)"""
+        entry = self._timed.get(id(targets))
+        if entry is None or entry[0] is not targets:
+            proxies = []
+            for target in targets:
+                # Groups are labelled by class and their first member
+                label = getattr(target, "strategy_id", None) or \
+                    f"{type(target).__name__}:{target.strategies[0].strategy_id}"
+                histogram = self.strategy_time.setdefault(label, LatencyHistogram())
+                proxies.append(_Timed(target, histogram))
+            entry = self._timed[id(targets)] = (targets, proxies)
+        return entry[1]
+
+    def on_sampled_bar(self, start: int, pre_trade_end: int, end: int, bars: int):
+        stages = self.stages
+        stages["bar"].record(end - start)
+        stages["pre_trade"].record(pre_trade_end - start)
+        stages["strategies"].record(end - pre_trade_end)
+        self.bars = bars
+
+    def on_signal(self, strategy_id: str):
+        self.signals[strategy_id] += 1
+
+    def on_reject(self, strategy_id: str, rule: str):
+        self.rejections[strategy_id, rule] += 1
+
+    def on_fill(self, strategy_id: str, bar_start: int = 0):
+        """bar_start: perf_counter_ns when the bar began (0 on unsampled bars)"""
+        self.fills[strategy_id] += 1
+        if not bar_start:
+            return
+        histogram = self.bar_to_fill.get(strategy_id)
+        if histogram is None:
+            histogram = self.bar_to_fill[strategy_id] = LatencyHistogram()
+        histogram.record(perf_ns() - bar_start)
+
+    def __getstate__(self):
+        # Stand-ins are rebuilt on demand (and hold the engine's lists)
+        state = self.__dict__.copy()
+        state["_timed"] = {}
+        return state
+
+    # ------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------
+    def bars_per_second(self) -> float:
+        elapsed = (perf_ns() - self._started_ns) / 1e9
+        return self.bars / elapsed if elapsed > 0 else 0.0
+
+    def render(self, prefix: str = "backtest") -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{prefix}_{name} {value}")
+
+        def summary(name, help_text, histograms, label):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} summary")
+            for key, histogram in list(histograms.items()):
+                for q, value in histogram.quantiles().items():
+                    lines.append(f'{prefix}_{name}{{{label}="{_escape(key)}",quantile="{q}"}} '
+                                 f"{value / 1e9:.9f}")
+                lines.append(f'{prefix}_{name}_sum{{{label}="{_escape(key)}"}} '
+                             f"{histogram.total / 1e9:.9f}")
+                lines.append(f'{prefix}_{name}_count{{{label}="{_escape(key)}"}} {histogram.count}')
+
+        metric("bars_total", "counter", "Bars processed", [((), self.bars)])
+        metric("bars_per_second", "gauge", "Bars processed per second since start",
+               [((), f"{self.bars_per_second():.3f}")])
+        metric("signals_total", "counter", "Signals generated",
+               [((("strategy", k),), v) for k, v in list(self.signals.items())])
+        metric("fills_total", "counter", "Trades executed",
+               [((("strategy", k),), v) for k, v in list(self.fills.items())])
+        metric("rejections_total", "counter", "Signals rejected by the risk manager",
+               [((("strategy", s), ("rule", r or "none")), v)
+                for (s, r), v in list(self.rejections.items())])
+
+        summary("stage_seconds", f"Time per bar stage (1 in {self.sample_every} bars)",
+                self.stages, "stage")
+        summary("strategy_seconds", f"Strategy on_bar time (1 in {self.sample_every} bars)",
+                self.strategy_time, "strategy")
+        summary("bar_to_fill_seconds", "Start of bar processing to executed trade",
+                self.bar_to_fill, "strategy")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ------------------------------------------------------------
+# Exporters
+# ------------------------------------------------------------
+class PrometheusExporter:
+    """Serves Telemetry.render() at http://host:port/metrics from a daemon thread"""
+
+    def __init__(self, telemetry: Telemetry, port: int = 9108, host: str = "127.0.0.1"):
+        self.telemetry = telemetry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = telemetry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="telemetry-http", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful with port=0)"""
+        return self._server.server_address[1]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "PrometheusExporter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FileExporter:
+    """
+    Rewrites a Prometheus text file every `interval` seconds (atomically,
+    for textfile collectors / tail-style scrapers) and once more on close
+    """
+
+    def __init__(self, telemetry: Telemetry, path: Union[str, Path], interval: float = 5.0):
+        self.telemetry = telemetry
+        self.path = Path(path)
+        self.interval = interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="telemetry-file", daemon=True)
+        self._thread.start()
+
+    def write(self):
+        atomic_write(self.path, self.telemetry.render())
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def close(self):
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join()
+            self.write()
+
+    def __enter__(self) -> "FileExporter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,265 @@
+"""
+Position and PnL accounting with lot tracking
+
+Strategy ids and symbols are interned to small integers once. A position
+is then a slot in flat per-field lists, found with two list indexes
+(book[strategy][symbol]) instead of hashing a tuple on every fill.
+
+Each slot keeps its open lots in a deque, oldest first. A lot is a
+(signed quantity, entry price) tuple. Closing fills are matched against
+the deque:
+    fifo     - oldest lot first, each at its own entry price
+    average  - a single lot carried at the running average cost
+A fill larger than the open position closes it and opens the remainder
+in the other direction at the fill price.
+
+Every fill is appended to typed columns (slot, quantity, price, realized
+PnL, timestamp), so realized PnL stays attributed to the trade that
+produced it.
+"""
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+FIFO = "fifo"
+AVERAGE = "average"
+
+
+class Ledger:
+
+    METHODS = (FIFO, AVERAGE)
+
+    def __init__(self, method: str = FIFO, keep_fills: bool = True):
+        """
+        Args:
+            method: "fifo" or "average" lot matching
+            keep_fills: Keep the per-fill log (off = positions and totals only)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Invalid method: {method}. Must be one of {self.METHODS}")
+
+        self.method = method
+        self.keep_fills = keep_fills
+
+        # Interned names
+        self.strategy_names: List[str] = []
+        self.symbol_names: List[str] = []
+        self._strategy_codes: Dict[str, int] = {}
+        self._symbol_codes: Dict[str, int] = {}
+
+        # book[strategy code][symbol code] -> slot (-1 = no position yet)
+        self._book: List[List[int]] = []
+
+        # Per-slot state
+        self.slot_strategy: List[int] = []
+        self.slot_symbol: List[int] = []
+        self.quantities: List[int] = []
+        self.realized: List[float] = []
+        self.lots: List[deque] = []
+
+        # Per-fill log
+        self.fill_slots = array('i')
+        self.fill_quantities = array('q')
+        self.fill_prices = array('d')
+        self.fill_pnls = array('d')
+        self.fill_timestamps = array('q')
+
+    # ------------------------------------------------------------
+    # Interning
+    # ------------------------------------------------------------
+    def strategy_code(self, strategy_id: str) -> int:
+        code = self._strategy_codes.get(strategy_id)
+        if code is None:
+            code = self._strategy_codes[strategy_id] = len(self.strategy_names)
+            self.strategy_names.append(strategy_id)
+            self._book.append([])
+        return code
+
+    def symbol_code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = self._symbol_codes[symbol] = len(self.symbol_names)
+            self.symbol_names.append(symbol)
+        return code
+
+    def slot(self, strategy: int, symbol: int) -> int:
+        """Slot of (strategy code, symbol code), created on first use"""
+        row = self._book[strategy]
+        if symbol < len(row):
+            slot = row[symbol]
+            if slot >= 0:
+                return slot
+        else:
+            row.extend([-1] * (symbol + 1 - len(row)))
+
+        slot = row[symbol] = len(self.quantities)
+        self.slot_strategy.append(strategy)
+        self.slot_symbol.append(symbol)
+        self.quantities.append(0)
+        self.realized.append(0.0)
+        self.lots.append(deque())
+        return slot
+
+    def _find(self, strategy_id: str, symbol: str) -> int:
+        """Existing slot or -1 (never creates one)"""
+        strategy = self._strategy_codes.get(strategy_id)
+        code = self._symbol_codes.get(symbol)
+        if strategy is None or code is None:
+            return -1
+        row = self._book[strategy]
+        return row[code] if code < len(row) else -1
+
+    # ------------------------------------------------------------
+    # Fills
+    # ------------------------------------------------------------
+    def record(self, strategy_id: str, symbol: str, quantity: int, price: float,
+               timestamp: int = 0) -> float:
+        """
+        Book one fill (quantity signed: + buy, - sell)
+
+        Returns:
+            Realized PnL of this fill (0 when it only opens or adds)
+        """
+        slot = self.slot(self.strategy_code(strategy_id), self.symbol_code(symbol))
+        return self.record_slot(slot, quantity, price, timestamp)
+
+    def record_slot(self, slot: int, quantity: int, price: float, timestamp: int = 0) -> float:
+        """Book one fill against a slot from slot()"""
+        pnl = self._match((slot,), (quantity,), (price,))[0]
+        if self.keep_fills:
+            self.fill_slots.append(slot)
+            self.fill_quantities.append(quantity)
+            self.fill_prices.append(price)
+            self.fill_pnls.append(pnl)
+            self.fill_timestamps.append(timestamp)
+        return pnl
+
+    def record_many(self, slots: Sequence[int], quantities: Sequence[int],
+                    prices: Sequence[float], timestamps: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Book a batch of fills in order (the fast path); returns each fill's realized PnL"""
+        slots = np.asarray(slots, dtype=np.int32)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        pnls = np.array(self._match(slots.tolist(), quantities.tolist(), prices.tolist()))
+
+        if self.keep_fills:
+            if timestamps is None:
+                timestamps = np.zeros(len(slots), dtype=np.int64)
+            self.fill_slots.frombytes(slots.tobytes())
+            self.fill_quantities.frombytes(quantities.tobytes())
+            self.fill_prices.frombytes(prices.tobytes())
+            self.fill_pnls.frombytes(pnls.tobytes())
+            self.fill_timestamps.frombytes(np.asarray(timestamps, dtype=np.int64).tobytes())
+        return pnls
+
+    def _match(self, slots, quantities, prices) -> List[float]:
+        """Update positions / lots for each fill in order; realized PnL per fill"""
+        held_by_slot = self.quantities
+        lots_by_slot = self.lots
+        realized = self.realized
+        average = self.method == AVERAGE
+        pnls = []
+        append = pnls.append
+
+        for slot, quantity, price in zip(slots, quantities, prices):
+            held = held_by_slot[slot]
+            held_by_slot[slot] = held + quantity
+            lots = lots_by_slot[slot]
+
+            if held * quantity >= 0:
+                # Opening (flat) or adding (same sign)
+                if average and lots:
+                    size, entry = lots[0]
+                    total = size + quantity
+                    lots[0] = (total, (size * entry + quantity * price) / total)
+                else:
+                    lots.append((quantity, price))
+                append(0.0)
+                continue
+
+            # Closing against the oldest lots (lot and fill have opposite signs)
+            pnl = 0.0
+            left = quantity
+            while left and lots:
+                size, entry = lots[0]
+                rest = left + size
+                if rest * size <= 0:
+                    # Whole lot closed
+                    pnl += (price - entry) * size
+                    left = rest
+                    lots.popleft()
+                else:
+                    pnl -= (price - entry) * left
+                    lots[0] = (rest, entry)
+                    left = 0
+            if left:
+                # Flipped: the remainder opens a position the other way
+                lots.append((left, price))
+            realized[slot] += pnl
+            append(pnl)
+
+        return pnls
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def position(self, strategy_id: str, symbol: str) -> int:
+        slot = self._find(strategy_id, symbol)
+        return self.quantities[slot] if slot >= 0 else 0
+
+    def average_price(self, strategy_id: str, symbol: str) -> float:
+        """Average entry price of the open lots (0 when flat)"""
+        slot = self._find(strategy_id, symbol)
+        if slot < 0 or not self.quantities[slot]:
+            return 0.0
+        lots = self.lots[slot]
+        return sum(q * p for q, p in lots) / self.quantities[slot]
+
+    def open_lots(self, strategy_id: str, symbol: str) -> List[Tuple[int, float]]:
+        """(signed quantity, entry price) of each open lot, oldest first"""
+        slot = self._find(strategy_id, symbol)
+        return [] if slot < 0 else list(self.lots[slot])
+
+    def realized_pnl(self, strategy_id: Optional[str] = None) -> float:
+        """Total realized PnL, optionally of one strategy"""
+        if strategy_id is None:
+            return sum(self.realized)
+        strategy = self._strategy_codes.get(strategy_id)
+        if strategy is None:
+            return 0.0
+        return sum(self.realized[slot] for slot in self._book[strategy] if slot >= 0)
+
+    def unrealized_pnl(self, strategy_id: str, symbol: str, price: float) -> float:
+        slot = self._find(strategy_id, symbol)
+        if slot < 0:
+            return 0.0
+        return sum((price - p) * q for q, p in self.lots[slot])
+
+    def strategy_pnl(self) -> Dict[str, float]:
+        """Realized PnL per strategy"""
+        totals = np.bincount(self.slot_strategy, weights=self.realized,
+                             minlength=len(self.strategy_names))
+        return dict(zip(self.strategy_names, totals.tolist()))
+
+    def fills(self) -> Dict[str, np.ndarray]:
+        """Per-fill log as columns (names resolved)"""
+        slots = np.frombuffer(self.fill_slots, dtype=np.int32)
+        strategies = np.array(self.strategy_names, dtype=object)
+        symbols = np.array(self.symbol_names, dtype=object)
+        slot_strategy = np.array(self.slot_strategy, dtype=np.int64)
+        slot_symbol = np.array(self.slot_symbol, dtype=np.int64)
+        return {
+            'strategy_id': strategies[slot_strategy[slots]] if len(slots) else np.array([], dtype=object),
+            'symbol': symbols[slot_symbol[slots]] if len(slots) else np.array([], dtype=object),
+            'quantity': np.frombuffer(self.fill_quantities, dtype=np.int64).copy(),
+            'price': np.frombuffer(self.fill_prices, dtype=np.float64).copy(),
+            'realized_pnl': np.frombuffer(self.fill_pnls, dtype=np.float64).copy(),
+            'timestamp': np.frombuffer(self.fill_timestamps, dtype=np.int64).copy(),
+        }
+
+    def __len__(self) -> int:
+        return len(self.fill_slots)
@@ -1,16 +1,29 @@
 
 from typing import Dict, Optional
-from datetime import datetime
+from core.signal import BUY, SELL
 from execution.models import Trade, Position
 
 
 class ExecutionEngine:
     
 
-    def __init__(self):
-        """Initialize execution engine"""
+    def __init__(self, ledger=None):
+        """
+        Initialize execution engine
+
+        Args:
+            ledger: Optional execution.accounting.Ledger; when given, every
+                    fill is booked there too, trades carry its realized
+                    PnL (FIFO or average-cost lots) and positions take its
+                    average price of the open lots
+        """
         # Key: (strategy_id, symbol) -> Position
         self.positions: Dict[tuple, Position] = {}
+
+        # strategy_id -> symbol -> Position (lookup without building a key)
+        self._books: Dict[str, Dict[str, Position]] = {}
+
+        self.ledger = ledger
         
         # All executed trades
         self.trades: list = []
@@ -21,7 +34,7 @@ class ExecutionEngine:
         symbol: str,
         quantity: int,  # Signed: positive=BUY, negative=SELL
         price: float,
-        timestamp: datetime,
+        timestamp: int,
         signal_reason: str = ""
     ) -> Optional[Trade]:
   
@@ -29,10 +42,10 @@ class ExecutionEngine:
         
         # Determine side and absolute quantity
         if quantity > 0:
-            side = "BUY"
+            side = BUY
             abs_qty = quantity
         elif quantity < 0:
-            side = "SELL"
+            side = SELL
             abs_qty = abs(quantity)
         else:
             # Zero quantity - shouldn't happen
@@ -41,13 +54,19 @@ class ExecutionEngine:
         # Calculate realized PnL (only for position-closing trades)
         realized_pnl = 0.0
         
-        if side == "BUY":
-            # Buying - update position
-            position.buy(abs_qty, price)
+        if side is BUY:
+            # Buying - update position (PnL when covering a short)
+            realized_pnl = position.buy(abs_qty, price)
             
-        elif side == "SELL":
+        else:
             # Selling - calculate PnL and update position
             realized_pnl = position.sell(abs_qty, price)
+
+        if self.ledger is not None:
+            # The ledger's lots are the cost basis: keep the position's average
+            # on them, so realized + unrealized PnL adds up under FIFO too
+            realized_pnl = self.ledger.record(strategy_id, symbol, quantity, price, timestamp)
+            position.average_price = self.ledger.average_price(strategy_id, symbol)
         
         # Create trade record
         trade = Trade(
@@ -68,15 +87,19 @@ class ExecutionEngine:
 
     def get_position(self, strategy_id: str, symbol: str) -> Position:
        
-        key = (strategy_id, symbol)
+        try:
+            return self._books[strategy_id][symbol]
+        except KeyError:
+            pass
         
-        if key not in self.positions:
-            self.positions[key] = Position(
-                strategy_id=strategy_id,
-                symbol=symbol
-            )
+        position = Position(
+            strategy_id=strategy_id,
+            symbol=symbol
+        )
+        self._books.setdefault(strategy_id, {})[symbol] = position
+        self.positions[(strategy_id, symbol)] = position
         
-        return self.positions[key]
+        return position
 
     def get_all_positions(self) -> Dict[tuple, Position]:
         return self.positions.copy()
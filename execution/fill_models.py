@@ -0,0 +1,30 @@
+"""
+Fill models - the price a market order executes at on a given bar
+"""
+from data.bar import Bar
+
+
+class CloseFillModel:
+    """Fill at the bar close (the engine's default)"""
+
+    def fill_price(self, side: str, bar: Bar) -> float:
+        return bar.close
+
+
+class SlippageFillModel:
+    """Fill at the bar close moved against the order by a fixed number of basis points"""
+
+    def __init__(self, slippage_bps: float = 1.0):
+        self.slippage_bps = slippage_bps
+        self._factor = slippage_bps / 10000.0
+
+    def fill_price(self, side: str, bar: Bar) -> float:
+        if side == "BUY":
+            return bar.close * (1.0 + self._factor)
+        return bar.close * (1.0 - self._factor)
+
+
+FILL_MODELS = {
+    "close": CloseFillModel,
+    "slippage": SlippageFillModel,
+}
@@ -2,23 +2,23 @@
 Position and Trade models
 """
 from dataclasses import dataclass
-from datetime import datetime
+from core.signal import Side
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Record of an executed trade"""
     strategy_id: str
     symbol: str
-    side: str            # BUY / SELL
+    side: Side           # BUY / SELL
     quantity: int        # Signed: positive for BUY, negative for SELL
     price: float
-    timestamp: datetime
+    timestamp: int       # Epoch nanoseconds
     realized_pnl: float = 0.0  # PnL realized by this trade (if closing position)
     reason: str = ""     # Signal reason
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     
     strategy_id: str
@@ -26,24 +26,26 @@ class Position:
     quantity: int = 0
     average_price: float = 0.0
     
-    def buy(self, qty: int, price: float):
+    def buy(self, qty: int, price: float) -> float:
+        
+        realized_pnl = 0.0
+        
         if self.quantity < 0:
-            # Closing short position
-            if qty >= abs(self.quantity):
-                # Closing entire short or flipping to long
-                self.quantity += qty
-                if self.quantity > 0:
-                    self.average_price = price
-                else:
-                    self.average_price = 0.0
-            else:
-                # Partially closing short
-                self.quantity += qty
+            # Covering short position
+            close_qty = min(qty, -self.quantity)
+            realized_pnl = (self.average_price - price) * close_qty
+            self.quantity += qty
+            
+            if self.quantity >= 0:
+                # Covered entire short, possibly went long with the rest
+                self.average_price = price if self.quantity > 0 else 0.0
         else:
             # Adding to long or opening new long
             total_cost = self.average_price * self.quantity + price * qty
             self.quantity += qty
             self.average_price = total_cost / self.quantity if self.quantity > 0 else 0.0
+        
+        return realized_pnl
     
     def sell(self, qty: int, price: float) -> float:
         
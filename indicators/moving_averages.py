@@ -5,16 +5,20 @@ class EMA:
         self.multiplier = 2 / (period + 1)
         self.value = None
         self.initialized = False
-        self.prices = []
+
+        # Warm-up: running sum of the first `period` prices (no list kept)
+        self._count = 0
+        self._sum = 0
 
     def update(self, price: float):
        
         if not self.initialized:
-            self.prices.append(price)
+            self._count += 1
+            self._sum += price
 
             # Initialize EMA using SMA
-            if len(self.prices) == self.period:
-                self.value = sum(self.prices) / self.period
+            if self._count == self.period:
+                self.value = self._sum / self.period
                 self.initialized = True
             return self.value
 
@@ -0,0 +1,75 @@
+from collections import deque
+from math import sqrt
+
+
+class ATR:
+    """Average True Range with Wilder smoothing, O(1) per update"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.value = None
+        self.initialized = False
+        self.prev_close = None
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, high: float, low: float, close: float):
+
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high, self.prev_close) - min(low, self.prev_close)
+        self.prev_close = close
+
+        if not self.initialized:
+            self._count += 1
+            self._sum += tr
+
+            # Seed with the simple average of the first `period` ranges
+            if self._count == self.period:
+                self.value = self._sum / self.period
+                self.initialized = True
+            return self.value
+
+        self.value += (tr - self.value) / self.period
+        return self.value
+
+
+class RollingStdDev:
+    """Rolling sample standard deviation of close-to-close returns, O(1) per update"""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.value = None
+        self.initialized = False
+        self.prev_price = None
+        self.window = deque(maxlen=period)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, price: float):
+
+        if self.prev_price is None:
+            self.prev_price = price
+            return self.value
+
+        ret = price / self.prev_price - 1.0
+        self.prev_price = price
+
+        if len(self.window) == self.period:
+            old = self.window[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self.window.append(ret)
+        self._sum += ret
+        self._sum_sq += ret * ret
+
+        n = len(self.window)
+        if n < self.period:
+            return self.value
+
+        mean = self._sum / n
+        var = max((self._sum_sq - n * mean * mean) / (n - 1), 0.0)
+        self.value = sqrt(var)
+        self.initialized = True
+        return self.value
@@ -0,0 +1,114 @@
+from math import floor
+from typing import Dict, Optional, Tuple
+
+
+class VWAP:
+    """Session VWAP of the typical price (H+L+C)/3, O(1) per update"""
+
+    def __init__(self, reset_each_session: bool = True):
+        self.reset_each_session = reset_each_session
+        self.value = None
+        self.session_day = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float,
+               session_day: Optional[int] = None):
+
+        if self.reset_each_session and session_day != self.session_day:
+            self.session_day = session_day
+            self._pv = 0.0
+            self._volume = 0.0
+            self.value = None
+
+        if volume <= 0:
+            return self.value
+
+        self._pv += (high + low + close) / 3.0 * volume
+        self._volume += volume
+        self.value = self._pv / self._volume
+        return self.value
+
+    def reset(self):
+        self.__init__(self.reset_each_session)
+
+
+class VolumeProfile:
+    """
+    Volume traded per price bin (bar volume assigned to its typical price)
+
+    Maintains the point of control incrementally; value_area() sorts only
+    the occupied bins, so it is meant for occasional queries.
+    """
+
+    def __init__(self, bin_size: float = 1.0, reset_each_session: bool = True):
+        if bin_size <= 0:
+            raise ValueError(f"Invalid bin_size: {bin_size}. Must be > 0")
+
+        self.bin_size = bin_size
+        self.reset_each_session = reset_each_session
+        self.session_day = None
+
+        self.bins: Dict[int, float] = {}
+        self.total_volume = 0.0
+        self._poc_bin = None
+
+    def update(self, high: float, low: float, close: float, volume: float,
+               session_day: Optional[int] = None):
+
+        if self.reset_each_session and session_day != self.session_day:
+            self.session_day = session_day
+            self.bins.clear()
+            self.total_volume = 0.0
+            self._poc_bin = None
+
+        if volume <= 0:
+            return self.poc
+
+        key = floor((high + low + close) / 3.0 / self.bin_size)
+        traded = self.bins.get(key, 0.0) + volume
+        self.bins[key] = traded
+        self.total_volume += volume
+
+        if self._poc_bin is None or traded > self.bins[self._poc_bin]:
+            self._poc_bin = key
+        return self.poc
+
+    @property
+    def poc(self) -> Optional[float]:
+        """Point of control: lower edge of the highest-volume bin"""
+        return None if self._poc_bin is None else self._poc_bin * self.bin_size
+
+    def volume_at(self, price: float) -> float:
+        return self.bins.get(floor(price / self.bin_size), 0.0)
+
+    def value_area(self, fraction: float = 0.7) -> Optional[Tuple[float, float]]:
+        """
+        Smallest contiguous price range around the POC holding `fraction`
+        of the volume (grown one bin at a time toward the heavier side)
+
+        Returns:
+            (low, high) price edges, or None before any volume
+        """
+        if self._poc_bin is None:
+            return None
+
+        keys = sorted(self.bins)
+        lo = hi = keys.index(self._poc_bin)
+        covered = self.bins[self._poc_bin]
+        target = fraction * self.total_volume
+
+        while covered < target and (lo > 0 or hi < len(keys) - 1):
+            below = self.bins[keys[lo - 1]] if lo > 0 else -1.0
+            above = self.bins[keys[hi + 1]] if hi < len(keys) - 1 else -1.0
+            if above >= below:
+                hi += 1
+                covered += above
+            else:
+                lo -= 1
+                covered += below
+
+        return keys[lo] * self.bin_size, (keys[hi] + 1) * self.bin_size
+
+    def reset(self):
+        self.__init__(self.bin_size, self.reset_each_session)
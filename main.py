@@ -1,9 +1,9 @@
+import argparse
 
+from core.timestamps import format_timestamp
 from data.feed import MarketDataFeed
 
-from strategies.ema_crossover import EMACrossoverStrategy
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.opening_range_breakout import OpeningRangeBreakoutStrategy
+from strategies.registry import create_strategy
 
 from risk.risk_manager import RiskManager
 from execution.execution_engine import ExecutionEngine
@@ -11,7 +11,7 @@ from analytics.metrics import Analytics
 from engine.backtest_engine import BacktestEngine
 
 
-def main():
+def main(state_path=None, journal_path=None, metrics_port=None, metrics_file=None):
     print("=" * 80)
     print("MINI ALGORITHMIC TRADING SYSTEM — BACKTEST")
     print("=" * 80)
@@ -25,15 +25,18 @@ def main():
         csv_path="data/market_data.csv",
         symbol="NIFTY"
     )
-    data_feed.load()
+    if state_path is None:
+        # Incremental runs load the feed themselves (only the new rows)
+        data_feed.load()
 
     # ------------------------------------------------------------
     # Strategies (FINAL 3 — NO time_exit)
     # ------------------------------------------------------------
+    # Resolved through the registry so only the modules in use get imported
     strategies = [
-        EMACrossoverStrategy(symbol="NIFTY"),
-        MeanReversionStrategy(symbol="NIFTY"),
-        OpeningRangeBreakoutStrategy(symbol="NIFTY"),
+        create_strategy("ema_crossover", symbol="NIFTY"),
+        create_strategy("mean_reversion", symbol="NIFTY"),
+        create_strategy("opening_range", symbol="NIFTY"),
     ]
 
     # ------------------------------------------------------------
@@ -56,6 +59,23 @@ def main():
     # ------------------------------------------------------------
     analytics = Analytics()
 
+    # Optional event journal (replay with: python -m engine.journal PATH)
+    journal = None
+    if journal_path is not None:
+        from engine.journal import Journal
+        journal = Journal(journal_path)
+
+    # Optional live telemetry (Prometheus text over HTTP and / or to a file)
+    telemetry = None
+    exporters = []
+    if metrics_port is not None or metrics_file is not None:
+        from engine.telemetry import FileExporter, PrometheusExporter, Telemetry
+        telemetry = Telemetry()
+        if metrics_port is not None:
+            exporters.append(PrometheusExporter(telemetry, port=metrics_port))
+        if metrics_file is not None:
+            exporters.append(FileExporter(telemetry, metrics_file))
+
     # ------------------------------------------------------------
     # Backtest Engine
     # ------------------------------------------------------------
@@ -64,7 +84,9 @@ def main():
         strategies=strategies,
         risk_manager=risk_manager,
         execution_engine=execution_engine,
-        analytics=analytics
+        analytics=analytics,
+        journal=journal,
+        telemetry=telemetry
     )
 
     print("    ✔ Market data feed ready")
@@ -78,7 +100,15 @@ def main():
     # ------------------------------------------------------------
     print("\n[2] Running backtest...")
     print("=" * 80)
-    engine.run()
+    if state_path is None:
+        engine.run()
+    else:
+        from engine.incremental import IncrementalRunner
+        IncrementalRunner(engine, state_path).run()
+    if journal is not None:
+        journal.close()
+    for exporter in exporters:
+        exporter.close()
 
     # ------------------------------------------------------------
     # Trade-by-Trade Execution Trace
@@ -97,7 +127,7 @@ def main():
         for trade in trades:
             pnl_str = f" | PnL: {trade.realized_pnl:+.2f}" if trade.realized_pnl != 0 else ""
             print(
-                f"{trade.side:4s} → {trade.timestamp} | "
+                f"{trade.side:4s} → {format_timestamp(trade.timestamp)} | "
                 f"Price: {trade.price:7.2f} | "
                 f"Qty: {trade.quantity:+2d}{pnl_str}"
             )
@@ -108,12 +138,13 @@ def main():
     print("\n[4] SKIPPED TRADES (BLOCKED BY RISK MANAGER)")
     print("-" * 80)
 
-    if not analytics.skipped_trades:
+    skipped = analytics.rejections.rows()
+    if not skipped:
         print("✅ No trades were skipped by risk rules.")
     else:
-        for skip in analytics.skipped_trades:
+        for skip in skipped:
             print(
-                f"❌ SKIP → {skip['timestamp']} | "
+                f"❌ SKIP → {format_timestamp(skip['timestamp'])} | "
                 f"{skip['strategy_id']:20s} | "
                 f"{skip['side']:4s} | "
                 f"Reason: {skip['reason']}"
@@ -168,5 +199,31 @@ def main():
     print("=" * 80)
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mini algorithmic trading backtester")
+    parser.add_argument("--config", help="Run config file (.json, .toml or .yaml)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run even if an identical run already has a manifest")
+    parser.add_argument("--incremental", nargs="?", const=".backtest_state/main.ckpt",
+                        metavar="STATE",
+                        help="Resume from the last run's checkpoint and process only "
+                             "rows appended to the CSV since (default state file: %(const)s)")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="Write every signal, risk decision and fill to a binary "
+                             "event journal (replay: python -m engine.journal PATH)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Serve live latency / throughput metrics (Prometheus text) "
+                             "at http://127.0.0.1:PORT/metrics during the run")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="Rewrite live metrics (Prometheus text) to PATH every 5 s")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.config:
+        from engine.runner import run_config
+        run_config(args.config, force=args.force)
+    else:
+        main(state_path=args.incremental, journal_path=args.journal,
+             metrics_port=args.metrics_port, metrics_file=args.metrics_file)
@@ -0,0 +1,184 @@
+"""
+Engine-managed protective exits (stop-loss / take-profit / trailing / time)
+"""
+from dataclasses import dataclass
+from datetime import time
+from typing import Dict, List, Optional, Tuple
+
+from core.timestamps import minute_of_day
+from data.bar import Bar
+from execution.models import Trade, Position
+
+
+INF = float("inf")
+
+
+@dataclass(frozen=True)
+class ExitRule:
+    """
+    Protective exits attached to every position a strategy opens.
+
+    Distances are in price points; the *_pct variants are fractions of the
+    entry price (0.01 = 1%). Leave a field as None to disable it.
+    """
+    stop_loss: Optional[float] = None
+    stop_loss_pct: Optional[float] = None
+    take_profit: Optional[float] = None
+    take_profit_pct: Optional[float] = None
+    trailing_stop: Optional[float] = None
+    trailing_stop_pct: Optional[float] = None
+    max_bars: Optional[int] = None         # Exit after holding this many bars
+    exit_time: Optional[time] = None       # Exit at/after this time of day
+
+
+class Bracket:
+    """Armed exit levels for one (strategy_id, symbol) position"""
+
+    __slots__ = (
+        "strategy_id", "symbol", "direction", "stop", "target",
+        "trail", "trail_pct", "extreme", "bars_held", "max_bars", "exit_minute",
+    )
+
+    def __init__(self, strategy_id: str, symbol: str, direction: int,
+                 entry_price: float, rule: ExitRule):
+        self.strategy_id = strategy_id
+        self.symbol = symbol
+        self.direction = direction  # +1 long, -1 short
+
+        # Unused levels sit at +/-inf so the hot loop needs no None checks
+        stop_dist = _distance(rule.stop_loss, rule.stop_loss_pct, entry_price)
+        target_dist = _distance(rule.take_profit, rule.take_profit_pct, entry_price)
+        self.stop = entry_price - direction * stop_dist
+        self.target = entry_price + direction * target_dist
+
+        self.trail = rule.trailing_stop or 0.0
+        self.trail_pct = rule.trailing_stop_pct or 0.0
+        self.extreme = entry_price  # High-water (long) / low-water (short) mark
+
+        self.bars_held = 0
+        self.max_bars = rule.max_bars or 0
+        self.exit_minute = minute_of_day(rule.exit_time) if rule.exit_time is not None else -1
+
+
+def _distance(points: Optional[float], pct: Optional[float], price: float) -> float:
+    if points is not None:
+        return points
+    if pct is not None:
+        return price * pct
+    return INF
+
+
+class ExitManager:
+    """
+    Evaluates every armed bracket for a symbol in a single pass per bar.
+
+    Strategies only emit entries; the engine arms a bracket on each fill
+    that opens or adds to a position and closes the position when a level
+    is touched by the bar high/low.
+    """
+
+    def __init__(self):
+        # strategy_id -> ExitRule
+        self.rules: Dict[str, ExitRule] = {}
+
+        # symbol -> {strategy_id: Bracket}
+        self.brackets: Dict[str, Dict[str, Bracket]] = {}
+
+    def register(self, strategy_id: str, rule: ExitRule):
+        """Attach an exit rule to a strategy"""
+        self.rules[strategy_id] = rule
+
+    def on_fill(self, trade: Trade, position: Position):
+        """Arm, re-arm or disarm the bracket after a fill"""
+        rule = self.rules.get(trade.strategy_id)
+        if rule is None:
+            return
+
+        by_strategy = self.brackets.setdefault(trade.symbol, {})
+
+        if position.quantity == 0:
+            by_strategy.pop(trade.strategy_id, None)
+            return
+
+        direction = 1 if position.quantity > 0 else -1
+        opened_or_added = (trade.quantity > 0) == (direction > 0)
+
+        # Partial reductions keep the existing levels
+        if opened_or_added or trade.strategy_id not in by_strategy:
+            by_strategy[trade.strategy_id] = Bracket(
+                trade.strategy_id, trade.symbol, direction,
+                position.average_price, rule
+            )
+
+    def on_bar(self, bar: Bar) -> List[Tuple[str, float, str]]:
+        """
+        Check all brackets for this bar's symbol.
+
+        Returns:
+            List of (strategy_id, exit_price, reason) for triggered exits
+        """
+        by_strategy = self.brackets.get(bar.symbol)
+        if not by_strategy:
+            return []
+
+        exits = []
+        minute = bar.minute_of_day
+
+        for strategy_id, b in list(by_strategy.items()):
+            price, reason = _check(b, bar)
+
+            if price is None and 0 <= b.exit_minute <= minute:
+                price, reason = bar.close, "Time exit"
+
+            if price is None:
+                continue
+
+            del by_strategy[strategy_id]
+            exits.append((strategy_id, price, reason))
+
+        return exits
+
+    def is_armed(self, strategy_id: str, symbol: str) -> bool:
+        """Check if a strategy has live protective exits on a symbol"""
+        return strategy_id in self.brackets.get(symbol, {})
+
+    def reset(self):
+        """Drop all armed brackets"""
+        self.brackets = {}
+
+
+def _check(b: Bracket, bar: Bar):
+    """Evaluate one bracket against a bar; stop is assumed to fill before target"""
+    b.bars_held += 1
+
+    if b.direction > 0:
+        stop = b.stop
+        if b.trail or b.trail_pct:
+            stop = max(stop, b.extreme - b.trail - b.extreme * b.trail_pct)
+
+        if bar.low <= stop:
+            reason = "Stop loss" if stop == b.stop else "Trailing stop"
+            return min(bar.open, stop), reason
+        if bar.high >= b.target:
+            return max(bar.open, b.target), "Take profit"
+
+        if bar.high > b.extreme:
+            b.extreme = bar.high
+    else:
+        stop = b.stop
+        if b.trail or b.trail_pct:
+            stop = min(stop, b.extreme + b.trail + b.extreme * b.trail_pct)
+
+        if bar.high >= stop:
+            reason = "Stop loss" if stop == b.stop else "Trailing stop"
+            return max(bar.open, stop), reason
+        if bar.low <= b.target:
+            return min(bar.open, b.target), "Take profit"
+
+        if bar.low < b.extreme:
+            b.extreme = bar.low
+
+    if b.max_bars and b.bars_held >= b.max_bars:
+        return bar.close, "Max holding period"
+
+    return None, ""
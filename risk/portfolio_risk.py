@@ -0,0 +1,199 @@
+"""
+Portfolio-level risk: exposure, notional, drawdown and open-position limits
+"""
+from typing import Dict, Optional, Tuple
+
+from data.bar import Bar
+from execution.models import Trade, Position
+
+
+class PortfolioRiskEngine:
+    """
+    Aggregates across all strategies, updated in O(1) per fill and per bar.
+
+    Every limit is optional (None = disabled). Exposure limits are in
+    notional (quantity * last price); drawdown is measured in currency
+    from the intraday peak of equity.
+    """
+
+    def __init__(self,
+                 initial_capital: float = 0.0,
+                 max_gross_exposure_per_symbol: Optional[float] = None,
+                 max_net_exposure_per_symbol: Optional[float] = None,
+                 max_total_notional: Optional[float] = None,
+                 max_intraday_drawdown: Optional[float] = None,
+                 max_open_positions: Optional[int] = None):
+
+        self.initial_capital = initial_capital
+        self.max_gross_exposure_per_symbol = max_gross_exposure_per_symbol
+        self.max_net_exposure_per_symbol = max_net_exposure_per_symbol
+        self.max_total_notional = max_total_notional
+        self.max_intraday_drawdown = max_intraday_drawdown
+        self.max_open_positions = max_open_positions
+
+        self.reset()
+
+    def reset(self):
+        """Reset all aggregates"""
+        # Per-symbol aggregates
+        self.net_qty: Dict[str, int] = {}
+        self.gross_qty: Dict[str, int] = {}
+        self.last_price: Dict[str, float] = {}
+
+        # Portfolio aggregates
+        self.total_notional = 0.0   # sum(gross_qty * last_price)
+        self.mark_value = 0.0       # sum(net_qty * last_price)
+        self.cost_basis = 0.0       # sum(position qty * average price)
+        self.realized_pnl = 0.0
+        self.open_positions = 0
+
+        self.peak_equity = self.initial_capital
+
+    # ------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------
+    def on_bar(self, bar: Bar):
+        """Mark the symbol to the bar close"""
+        symbol = bar.symbol
+        price = bar.close
+        old = self.last_price.get(symbol)
+
+        if old is None:
+            self.net_qty.setdefault(symbol, 0)
+            self.gross_qty.setdefault(symbol, 0)
+        elif price != old:
+            move = price - old
+            self.mark_value += self.net_qty[symbol] * move
+            self.total_notional += self.gross_qty[symbol] * move
+
+        self.last_price[symbol] = price
+
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+
+    def start_day(self):
+        """Start a new intraday drawdown window (called on session start)"""
+        self.peak_equity = self.equity
+
+    def on_fill(self, trade: Trade, position: Position,
+                prev_qty: int, prev_avg: float):
+        """
+        Apply a fill to the aggregates.
+
+        Args:
+            trade: Executed trade
+            position: Position after the fill
+            prev_qty: Position quantity before the fill
+            prev_avg: Position average price before the fill
+        """
+        symbol = trade.symbol
+        price = self.last_price.get(symbol, trade.price)
+        new_qty = position.quantity
+
+        gross_change = abs(new_qty) - abs(prev_qty)
+
+        self.net_qty[symbol] = self.net_qty.get(symbol, 0) + trade.quantity
+        self.gross_qty[symbol] = self.gross_qty.get(symbol, 0) + gross_change
+        self.last_price.setdefault(symbol, price)
+
+        self.mark_value += trade.quantity * price
+        self.total_notional += gross_change * price
+        self.cost_basis += new_qty * position.average_price - prev_qty * prev_avg
+        self.realized_pnl += trade.realized_pnl
+
+        if prev_qty == 0 and new_qty != 0:
+            self.open_positions += 1
+        elif prev_qty != 0 and new_qty == 0:
+            self.open_positions -= 1
+
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+
+    # ------------------------------------------------------------
+    # Derived values
+    # ------------------------------------------------------------
+    @property
+    def equity(self) -> float:
+        return self.initial_capital + self.realized_pnl + self.mark_value - self.cost_basis
+
+    @property
+    def drawdown(self) -> float:
+        return self.peak_equity - self.equity
+
+    # ------------------------------------------------------------
+    # Approval
+    # ------------------------------------------------------------
+    def check(self, side: str, symbol: str, position_qty: int,
+              quantity: int) -> Tuple[int, str]:
+        """
+        Approve or downsize an order against all portfolio limits.
+
+        Args:
+            side: BUY or SELL
+            symbol: Trading symbol
+            position_qty: Strategy's current position in the symbol
+            quantity: Requested (unsigned) quantity
+
+        Returns:
+            (approved quantity, name of the binding rule or "")
+        """
+        direction = 1 if side == "BUY" else -1
+
+        # Part of the order that only reduces the strategy's position is always allowed
+        if position_qty * direction < 0:
+            reducing = min(quantity, abs(position_qty))
+        else:
+            reducing = 0
+        extra = quantity - reducing
+
+        if extra == 0:
+            return quantity, ""
+
+        allowed = extra
+        rule = ""
+
+        if (self.max_intraday_drawdown is not None
+                and self.drawdown > self.max_intraday_drawdown):
+            return reducing, "max_intraday_drawdown"
+
+        if (self.max_open_positions is not None
+                and position_qty == 0
+                and self.open_positions >= self.max_open_positions):
+            return reducing, "max_open_positions"
+
+        price = self.last_price.get(symbol)
+        if price:
+            if self.max_gross_exposure_per_symbol is not None:
+                gross_notional = self.gross_qty.get(symbol, 0) * price
+                room = int((self.max_gross_exposure_per_symbol - gross_notional) // price)
+                if room < allowed:
+                    allowed, rule = max(room, 0), "max_gross_exposure_per_symbol"
+
+            if self.max_total_notional is not None:
+                room = int((self.max_total_notional - self.total_notional) // price)
+                if room < allowed:
+                    allowed, rule = max(room, 0), "max_total_notional"
+
+            if self.max_net_exposure_per_symbol is not None:
+                # Net quantity measured in the order's direction
+                net = self.net_qty.get(symbol, 0) * direction
+                cap = int(self.max_net_exposure_per_symbol // price)
+                room = cap - net - reducing
+                if room < allowed:
+                    allowed, rule = max(room, 0), "max_net_exposure_per_symbol"
+
+        return reducing + allowed, rule
+
+    def get_summary(self) -> Dict:
+        """Get portfolio risk summary"""
+        return {
+            'equity': self.equity,
+            'peak_equity': self.peak_equity,
+            'drawdown': self.drawdown,
+            'total_notional': self.total_notional,
+            'open_positions': self.open_positions,
+            'net_qty': self.net_qty.copy(),
+            'gross_qty': self.gross_qty.copy(),
+        }
@@ -0,0 +1,171 @@
+"""
+Position sizing: fixed-fractional, volatility-targeted and Kelly-capped
+"""
+from typing import Dict
+
+from core.signal import Signal
+from data.bar import Bar
+from execution.models import Trade
+from indicators.volatility import ATR, RollingStdDev
+
+
+class PositionSizer:
+    """
+    Base sizer. Inputs (equity, last price, indicators) are maintained
+    incrementally from on_bar/on_fill so size() is O(1) per signal.
+    """
+
+    def __init__(self, initial_capital: float = 100000.0):
+        self.initial_capital = initial_capital
+        self.equity = initial_capital
+        self.last_price: Dict[str, float] = {}
+
+    def on_bar(self, bar: Bar):
+        self.last_price[bar.symbol] = bar.close
+
+    def on_fill(self, trade: Trade):
+        self.equity += trade.realized_pnl
+
+    def size(self, signal: Signal, default_quantity: int) -> int:
+        """Quantity for a new or increased position (0 = skip)"""
+        return default_quantity
+
+    def reset(self):
+        self.equity = self.initial_capital
+        self.last_price = {}
+
+
+class FixedFractionalSizer(PositionSizer):
+    """Commit a fixed fraction of current equity per position"""
+
+    def __init__(self, fraction: float = 0.1, initial_capital: float = 100000.0):
+        super().__init__(initial_capital)
+        self.fraction = fraction
+
+    def size(self, signal: Signal, default_quantity: int) -> int:
+        price = self.last_price.get(signal.symbol)
+        if not price:
+            return 0
+        return int(self.equity * self.fraction // price)
+
+
+class VolatilityTargetSizer(PositionSizer):
+    """
+    Risk a fixed fraction of equity per unit of volatility.
+
+    quantity = equity * risk_fraction / (multiple * volatility in price points)
+    Volatility comes from a streaming ATR or rolling return stdev per symbol.
+    """
+
+    def __init__(self, risk_fraction: float = 0.01, period: int = 14,
+                 measure: str = "atr", multiple: float = 1.0,
+                 initial_capital: float = 100000.0):
+        super().__init__(initial_capital)
+        if measure not in ("atr", "stdev"):
+            raise ValueError(f"Invalid measure: {measure}. Must be atr or stdev")
+
+        self.risk_fraction = risk_fraction
+        self.period = period
+        self.measure = measure
+        self.multiple = multiple
+        self.indicators: Dict[str, object] = {}
+
+    def on_bar(self, bar: Bar):
+        self.last_price[bar.symbol] = bar.close
+
+        indicator = self.indicators.get(bar.symbol)
+        if indicator is None:
+            indicator = ATR(self.period) if self.measure == "atr" else RollingStdDev(self.period)
+            self.indicators[bar.symbol] = indicator
+
+        if self.measure == "atr":
+            indicator.update(bar.high, bar.low, bar.close)
+        else:
+            indicator.update(bar.close)
+
+    def volatility(self, symbol: str) -> float:
+        """Current volatility in price points (0.0 until warmed up)"""
+        indicator = self.indicators.get(symbol)
+        if indicator is None or not indicator.initialized:
+            return 0.0
+        if self.measure == "atr":
+            return indicator.value
+        return indicator.value * self.last_price[symbol]
+
+    def size(self, signal: Signal, default_quantity: int) -> int:
+        vol = self.volatility(signal.symbol)
+        if vol <= 0:
+            return 0
+        return int(self.equity * self.risk_fraction // (self.multiple * vol))
+
+    def reset(self):
+        super().reset()
+        self.indicators = {}
+
+
+class KellySizer(PositionSizer):
+    """
+    Fractional Kelly sizing from each strategy's running win/loss stats.
+
+    f = kelly_fraction * (W - (1 - W) / R), capped to [0, max_fraction],
+    where W is the win rate and R the average win / average loss ratio.
+    Falls back to default_quantity until min_trades closed trades exist.
+    """
+
+    def __init__(self, kelly_fraction: float = 0.5, max_fraction: float = 0.25,
+                 min_trades: int = 20, initial_capital: float = 100000.0):
+        super().__init__(initial_capital)
+        self.kelly_fraction = kelly_fraction
+        self.max_fraction = max_fraction
+        self.min_trades = min_trades
+
+        # strategy_id -> [wins, losses, sum_win, sum_loss]
+        self.stats: Dict[str, list] = {}
+
+    def on_fill(self, trade: Trade):
+        pnl = trade.realized_pnl
+        if pnl == 0:
+            return
+
+        self.equity += pnl
+        stats = self.stats.get(trade.strategy_id)
+        if stats is None:
+            stats = self.stats[trade.strategy_id] = [0, 0, 0.0, 0.0]
+
+        if pnl > 0:
+            stats[0] += 1
+            stats[2] += pnl
+        else:
+            stats[1] += 1
+            stats[3] -= pnl
+
+    def kelly(self, strategy_id: str):
+        """Capped Kelly fraction, or None while there is too little history"""
+        stats = self.stats.get(strategy_id)
+        if stats is None or stats[0] + stats[1] < self.min_trades:
+            return None
+
+        wins, losses, sum_win, sum_loss = stats
+        if losses == 0:
+            return self.max_fraction
+        if wins == 0:
+            return 0.0
+
+        win_rate = wins / (wins + losses)
+        payoff = (sum_win / wins) / (sum_loss / losses)
+        f = self.kelly_fraction * (win_rate - (1 - win_rate) / payoff)
+        return min(max(f, 0.0), self.max_fraction)
+
+    def size(self, signal: Signal, default_quantity: int) -> int:
+        fraction = self.kelly(signal.strategy_id)
+        if fraction is None:
+            return default_quantity
+
+        price = self.last_price.get(signal.symbol)
+        if not price:
+            return 0
+        return int(self.equity * fraction // price)
+
+    def reset(self):
+        super().reset()
+        self.stats = {}
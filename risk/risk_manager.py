@@ -1,7 +1,10 @@
 
 from typing import Dict, Optional
 from core.signal import Signal
-from execution.models import Position
+from data.bar import Bar
+from execution.models import Trade, Position
+from .portfolio_risk import PortfolioRiskEngine
+from .position_sizing import PositionSizer
 
 
 class RiskManager:
@@ -11,12 +14,23 @@ class RiskManager:
                  max_position_size: int = 1,
                  max_loss_per_strategy: float = -20.0,
                  max_profit_per_strategy: float = 50000.0,
-                 default_quantity: int = 1):
+                 default_quantity: int = 1,
+                 portfolio: Optional[PortfolioRiskEngine] = None,
+                 sizer: Optional[PositionSizer] = None):
       
         self.max_position_size = max_position_size
         self.max_loss_per_strategy = max_loss_per_strategy
         self.max_profit_per_strategy = max_profit_per_strategy
         self.default_quantity = default_quantity
+
+        # Optional cross-strategy limits
+        self.portfolio = portfolio
+
+        # Optional sizing model (None = always default_quantity)
+        self.sizer = sizer
+
+        # Name of the rule behind the last rejection / downsize ("" = none)
+        self.last_rule = ""
         
    
         self.strategy_pnl: Dict[str, float] = {}
@@ -27,6 +41,7 @@ class RiskManager:
     def approve(self, signal: Signal, position: Position) -> int:
        
         strategy_id = signal.strategy_id
+        self.last_rule = ""
         
         # Initialize strategy PnL tracking if needed
         if strategy_id not in self.strategy_pnl:
@@ -34,6 +49,7 @@ class RiskManager:
         
         # Rule 1: Check if strategy is blocked due to limits
         if strategy_id in self.blocked_strategies:
+            self.last_rule = "strategy_blocked"
             return 0
         
         # Rule 2: Check strategy PnL limits
@@ -41,40 +57,90 @@ class RiskManager:
         
         if current_pnl <= self.max_loss_per_strategy:
             self.blocked_strategies.add(strategy_id)
-            print(f"❌ Strategy {strategy_id} BLOCKED: Hit max loss (PnL: {current_pnl:.2f})")
+            self.last_rule = "max_loss_per_strategy"
             return 0
         
         if current_pnl >= self.max_profit_per_strategy:
             self.blocked_strategies.add(strategy_id)
-            print(f"❌ Strategy {strategy_id} BLOCKED: Hit max profit (PnL: {current_pnl:.2f})")
+            self.last_rule = "max_profit_per_strategy"
             return 0
         
         # Rule 3: Position size limits
         current_qty = position.quantity
+        quantity = self._order_quantity(signal, current_qty)
+
+        if quantity <= 0:
+            self.last_rule = "position_sizing"
+            return 0
         
         if signal.side == "BUY":
             # Trying to buy
             if current_qty >= self.max_position_size:
                 # Already at max long position
+                self.last_rule = "max_position_size"
                 return 0
             
             # Approve default quantity, but don't exceed max position
-            approved_qty = min(self.default_quantity, self.max_position_size - current_qty)
-            return approved_qty
+            approved_qty = min(quantity, self.max_position_size - current_qty)
+            return self._check_portfolio(signal, current_qty, approved_qty)
         
         elif signal.side == "SELL":
             # Trying to sell
             if current_qty <= -self.max_position_size:
                 # Already at max short position
+                self.last_rule = "max_position_size"
                 return 0
             
             # For SELL, quantity is negative direction
             # Approve default quantity, but don't exceed max position
-            approved_qty = min(self.default_quantity, self.max_position_size + current_qty)
-            return approved_qty
+            approved_qty = min(quantity, self.max_position_size + current_qty)
+            return self._check_portfolio(signal, current_qty, approved_qty)
         
         # Invalid signal side (shouldn't happen)
+        self.last_rule = "invalid_side"
         return 0
+
+    def _order_quantity(self, signal: Signal, current_qty: int) -> int:
+        """Requested size: sizer for entries/adds, full position for exits"""
+        if self.sizer is None:
+            return self.default_quantity
+
+        closing = (current_qty > 0 and signal.side == "SELL") or \
+                  (current_qty < 0 and signal.side == "BUY")
+        if closing:
+            return abs(current_qty)
+
+        return self.sizer.size(signal, self.default_quantity)
+
+    def _check_portfolio(self, signal: Signal, current_qty: int, approved_qty: int) -> int:
+        """Apply portfolio-level limits on top of the per-strategy approval"""
+        if self.portfolio is None:
+            return approved_qty
+
+        approved_qty, rule = self.portfolio.check(
+            signal.side, signal.symbol, current_qty, approved_qty
+        )
+        self.last_rule = rule
+        return approved_qty
+
+    def on_bar(self, bar: Bar):
+        """Mark portfolio aggregates and sizing inputs to the latest bar"""
+        if self.portfolio is not None:
+            self.portfolio.on_bar(bar)
+        if self.sizer is not None:
+            self.sizer.on_bar(bar)
+
+    def on_session_start(self, bar: Bar):
+        """Reset intraday portfolio state"""
+        if self.portfolio is not None:
+            self.portfolio.start_day()
+
+    def on_fill(self, trade: Trade, position: Position, prev_qty: int, prev_avg: float):
+        """Feed an executed trade into portfolio aggregates and the sizer"""
+        if self.portfolio is not None:
+            self.portfolio.on_fill(trade, position, prev_qty, prev_avg)
+        if self.sizer is not None:
+            self.sizer.on_fill(trade)
     
     def update_strategy_pnl(self, strategy_id: str, realized_pnl: float):
        
@@ -95,6 +161,11 @@ class RiskManager:
         """Reset risk manager state"""
         self.strategy_pnl = {}
         self.blocked_strategies = set()
+        self.last_rule = ""
+        if self.portfolio is not None:
+            self.portfolio.reset()
+        if self.sizer is not None:
+            self.sizer.reset()
     
     def get_summary(self) -> Dict:
         """Get risk summary"""
@@ -103,5 +174,6 @@ class RiskManager:
             'blocked_strategies': list(self.blocked_strategies),
             'max_position_size': self.max_position_size,
             'max_loss_per_strategy': self.max_loss_per_strategy,
-            'max_profit_per_strategy': self.max_profit_per_strategy
+            'max_profit_per_strategy': self.max_profit_per_strategy,
+            'portfolio': self.portfolio.get_summary() if self.portfolio else None
         }
\ No newline at end of file
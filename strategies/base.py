@@ -1,18 +1,70 @@
 
+import inspect
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from data.bar import Bar
-from core.signal import Signal
+from core.signal import Side, Signal
+from risk.exit_manager import ExitRule
 
 
 class BaseStrategy(ABC):
-    def __init__(self, strategy_id: str, symbol: str):
+
+    # Hand out one preallocated Signal per (side, reason) instead of a new
+    # object per signal. Only safe while consumers don't keep the instance
+    # (the engine copies fields into trades / logs immediately).
+    reuse_signals = False
+
+    # Higher timeframes (minutes) this strategy wants via on_htf_bar; the
+    # engine builds each (symbol, timeframe) once and shares it
+    timeframes: Tuple[int, ...] = ()
+
+    # Closes kept in self.prices (0 = no price history); see track_prices
+    lookback = 0
+
+    def __init__(self, strategy_id: str, symbol: str,
+                 exit_rule: Optional[ExitRule] = None):
         self.strategy_id = strategy_id
         self.symbol = symbol
 
+        # Protective exits managed by the engine (None = strategy exits only)
+        self.exit_rule = exit_rule
+
         self.position_qty = 0
         self.bars_processed = 0
 
+        self._signal_pool: Dict[Tuple[Side, str], Signal] = {}
+
+    def track_prices(self, lookback: int):
+        """
+        Keep the last `lookback` closes in self.prices, a fixed-size ring
+        buffer (strategies.history.PriceHistory), instead of every close
+        """
+        from .history import PriceHistory
+
+        self.lookback = lookback
+        self.prices = PriceHistory(lookback)
+
+    def emit(self, side: Side, timestamp: int, reason: str = "") -> Signal:
+        """Create (or, with reuse_signals, recycle) a signal for this strategy"""
+        if not self.reuse_signals:
+            return Signal(self.strategy_id, self.symbol, side, timestamp, reason)
+
+        signal = self._signal_pool.get((side, reason))
+        if signal is None:
+            signal = Signal(self.strategy_id, self.symbol, side, timestamp, reason)
+            self._signal_pool[(side, reason)] = signal
+        else:
+            signal.timestamp = timestamp
+        return signal
+
+    def get_params(self) -> Dict:
+        """Constructor arguments of this instance (read back from attributes)"""
+        params = {}
+        for name in inspect.signature(type(self).__init__).parameters:
+            if name != "self" and hasattr(self, name):
+                params[name] = getattr(self, name)
+        return params
+
     def can_buy(self) -> bool:
         return self.position_qty == 0
 
@@ -25,6 +77,23 @@ class BaseStrategy(ABC):
         elif side == "SELL":
             self.position_qty -= qty
 
+    def on_session_start(self, bar: Bar):
+        """Called before on_bar for the first bar of each session"""
+        pass
+
+    def on_session_end(self, bar: Bar):
+        """Called after on_bar for the last bar of each session"""
+        pass
+
+    def on_htf_bar(self, timeframe: int, bar: Bar):
+        """Called with each completed bar of a subscribed timeframe, before
+        on_bar for the base bar that completed it"""
+        pass
+
+    def on_protective_exit(self, signal: Signal):
+        """Called after the engine closed the position via an exit rule"""
+        pass
+
     @abstractmethod
     def on_bar(self, bar: Bar) -> Optional[Signal]:
         pass
@@ -32,3 +101,5 @@ class BaseStrategy(ABC):
     def reset(self):
         self.position_qty = 0
         self.bars_processed = 0
+        if self.lookback:
+            self.prices.clear()
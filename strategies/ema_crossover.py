@@ -1,18 +1,19 @@
-import numpy as np
 from data.bar import Bar
-from core.signal import Signal
+from core.signal import BUY, SELL, Signal
 from .base import BaseStrategy
 
 
 class EMACrossoverStrategy(BaseStrategy):
     
 
-    def __init__(self, symbol="NIFTY", fast=10, slow=20):
-        super().__init__("ema_crossover", symbol)
+    def __init__(self, symbol="NIFTY", fast=10, slow=20, exit_rule=None,
+                 strategy_id="ema_crossover"):
+        super().__init__(strategy_id, symbol, exit_rule)
         self.fast = fast
         self.slow = slow
 
-        self.prices = []
+        # Warm-up needs slow + 1 bars, but only the last max(fast, slow) closes
+        self.track_prices(max(fast, slow))
         self.prev_fast = None
         self.prev_slow = None
         self.in_position = False
@@ -24,14 +25,18 @@ class EMACrossoverStrategy(BaseStrategy):
             ema = alpha * price + (1 - alpha) * ema
         return ema
 
+    def on_protective_exit(self, signal: Signal):
+        self.in_position = False
+
     def on_bar(self, bar: Bar):
         self.prices.append(bar.close)
 
-        if len(self.prices) < self.slow + 1:
+        if self.prices.count < self.slow + 1:
             return None
 
-        fast_ema = self._ema(self.prices[-self.fast:], self.fast)
-        slow_ema = self._ema(self.prices[-self.slow:], self.slow)
+        window = self.prices.last(self.lookback).tolist()
+        fast_ema = self._ema(window[-self.fast:], self.fast)
+        slow_ema = self._ema(window[-self.slow:], self.slow)
 
         signal = None
 
@@ -44,10 +49,7 @@ class EMACrossoverStrategy(BaseStrategy):
                 fast_ema > slow_ema
             ):
                 self.in_position = True
-                signal = Signal(
-                    self.strategy_id, self.symbol, "BUY",
-                    bar.timestamp, "EMA bullish crossover"
-                )
+                signal = self.emit(BUY, bar.timestamp, "EMA bullish crossover")
 
             # SELL once
             elif (
@@ -56,10 +58,7 @@ class EMACrossoverStrategy(BaseStrategy):
                 fast_ema < slow_ema
             ):
                 self.in_position = False
-                signal = Signal(
-                    self.strategy_id, self.symbol, "SELL",
-                    bar.timestamp, "EMA bearish crossover"
-                )
+                signal = self.emit(SELL, bar.timestamp, "EMA bearish crossover")
 
         self.prev_fast = fast_ema
         self.prev_slow = slow_ema
@@ -0,0 +1,92 @@
+"""
+Fixed-capacity price history for strategies
+
+Strategies used to append every close to a list, so memory grew with the
+length of the backtest for every instance. A PriceHistory keeps only the
+last `capacity` values in a numpy ring buffer: memory is fixed when the
+strategy is built, however many bars it sees.
+"""
+import numpy as np
+
+
+class PriceHistory:
+    """
+    Ring buffer of the last `capacity` floats
+
+    Each value is written twice (buffer[i] and buffer[i + capacity]), so the
+    last n values are always one contiguous, oldest-first slice and last()
+    never copies.
+    """
+
+    __slots__ = ("capacity", "count", "_buffer")
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        self.capacity = capacity
+        self.count = 0   # values appended so far (not bounded)
+        self._buffer = np.zeros(2 * capacity)
+
+    def append(self, value: float):
+        i = self.count % self.capacity
+        self._buffer[i] = value
+        self._buffer[i + self.capacity] = value
+        self.count += 1
+
+    def last(self, n: int) -> np.ndarray:
+        """
+        View of the last n values, oldest first (fewer while fewer are
+        held, like list[-n:]). It points into the buffer: copy it to keep
+        it past the next append, and don't write to it.
+        """
+        count = self.count
+        capacity = self.capacity
+        held = count if count < capacity else capacity
+        if n > held:
+            n = held
+        end = count % capacity + capacity
+        return self._buffer[end - n:end]
+
+    def window(self) -> np.ndarray:
+        """
+        View of all `capacity` slots, oldest first, even before that many
+        values were appended (the leading slots are then zeros). Fixed-shape
+        input for vectorized indicators that only read the slots they need.
+        """
+        end = self.count % self.capacity + self.capacity
+        return self._buffer[end - self.capacity:end]
+
+    def values(self) -> np.ndarray:
+        """Every value held, oldest first"""
+        return self.last(len(self))
+
+    def load(self, values, count: int):
+        """Hold `values` (oldest first) as if `count` values had been appended in all"""
+        values = list(values)[-self.capacity:]
+        self.count = count - len(values)
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def __getitem__(self, index: int) -> float:
+        """Negative indices count back from the newest value (-1 = last)"""
+        held = len(self)
+        if index < 0:
+            index += held
+        if not 0 <= index < held:
+            raise IndexError("PriceHistory index out of range")
+        return float(self._buffer[(self.count - held + index) % self.capacity])
+
+    def __getstate__(self):
+        return self.capacity, self.count, self._buffer
+
+    def __setstate__(self, state):
+        self.capacity, self.count, self._buffer = state
+
+    def __repr__(self) -> str:
+        return f"PriceHistory(capacity={self.capacity}, held={len(self)}, seen={self.count})"
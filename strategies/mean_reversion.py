@@ -2,42 +2,40 @@
 import numpy as np
 from typing import List, Optional
 from data.bar import Bar
-from core.signal import Signal
+from core.signal import BUY, SELL, Signal
 from .base import BaseStrategy
 
 
 class MeanReversionStrategy(BaseStrategy):
 
-    def __init__(self, symbol="NIFTY", period=20):
-        super().__init__("mean_reversion", symbol)
+    def __init__(self, symbol="NIFTY", period=20, exit_rule=None,
+                 strategy_id="mean_reversion"):
+        super().__init__(strategy_id, symbol, exit_rule)
         self.period = period
-        self.prices = []
+        self.track_prices(period)
         self.in_position = False   # 🔑
 
+    def on_protective_exit(self, signal: Signal):
+        self.in_position = False
+
     def on_bar(self, bar: Bar):
         self.prices.append(bar.close)
 
-        if len(self.prices) < self.period:
+        if self.prices.count < self.period:
             return None
 
-        sma = np.mean(self.prices[-self.period:])
+        sma = np.mean(self.prices.last(self.period))
         price = bar.close
 
         # BUY once
         if not self.in_position and price < sma:
             self.in_position = True
-            return Signal(
-                self.strategy_id, self.symbol, "BUY",
-                bar.timestamp, "Mean reversion entry"
-            )
+            return self.emit(BUY, bar.timestamp, "Mean reversion entry")
 
         # SELL once
         if self.in_position and price >= sma:
             self.in_position = False
-            return Signal(
-                self.strategy_id, self.symbol, "SELL",
-                bar.timestamp, "Mean reversion exit"
-            )
+            return self.emit(SELL, bar.timestamp, "Mean reversion exit")
 
         return None
 
@@ -0,0 +1,53 @@
+"""
+Strategy registry - strategies are imported on demand by name
+"""
+from importlib import import_module
+from typing import Dict, List, Type, Union
+
+
+# name -> "module:ClassName" (imported on first use) or the class itself
+STRATEGIES: Dict[str, Union[str, type]] = {
+    "ema_crossover": "strategies.ema_crossover:EMACrossoverStrategy",
+    "mean_reversion": "strategies.mean_reversion:MeanReversionStrategy",
+    "opening_range": "strategies.opening_range_breakout:OpeningRangeBreakoutStrategy",
+    "time_exit": "strategies.time_exit_strategy:TimeExitStrategy",
+}
+
+
+def register_strategy(name: str, target: Union[str, type]):
+    """
+    Register a strategy under a name
+
+    Args:
+        name: Registry key used in configs / CLI
+        target: Strategy class or lazy "package.module:ClassName" reference
+    """
+    STRATEGIES[name] = target
+
+
+def get_strategy_class(name: str) -> Type:
+    """Resolve a registered name (or a "module:Class" path) to its class"""
+    target = STRATEGIES.get(name, name)
+
+    if isinstance(target, str):
+        if ":" not in target:
+            raise KeyError(
+                f"Unknown strategy: {name}. Available: {available_strategies()}"
+            )
+        module_name, class_name = target.split(":", 1)
+        target = getattr(import_module(module_name), class_name)
+
+        # Cache the resolved class for the next lookup
+        if name in STRATEGIES:
+            STRATEGIES[name] = target
+
+    return target
+
+
+def create_strategy(name: str, **params):
+    """Instantiate a registered strategy with keyword params"""
+    return get_strategy_class(name)(**params)
+
+
+def available_strategies() -> List[str]:
+    return sorted(STRATEGIES)
@@ -1,8 +1,9 @@
 
 from typing import Optional
 from datetime import time
+from core.timestamps import minute_of_day
 from data.bar import Bar
-from core.signal import Signal
+from core.signal import BUY, SELL, Signal
 from .base import BaseStrategy
 
 
@@ -10,49 +11,48 @@ class TimeExitStrategy(BaseStrategy):
     
     
     def __init__(self, strategy_id: str = "time_exit", symbol: str = "NIFTY",
-                 entry_time: time = time(9, 30), exit_time: time = time(15, 15)):
+                 entry_time: time = time(9, 30), exit_time: time = time(15, 15),
+                 exit_rule=None):
        
-        super().__init__(strategy_id, symbol)
+        super().__init__(strategy_id, symbol, exit_rule)
         self.entry_time = entry_time
         self.exit_time = exit_time
+        self.entry_minute = minute_of_day(entry_time)
+        self.exit_minute = minute_of_day(exit_time)
         
-        # Track if we've already signaled today
-        self.last_entry_date = None
-        self.last_exit_date = None
+        # Track if we've already signaled today (reset on session start)
+        self.entered_today = False
+        self.exited_today = False
+
+    def on_session_start(self, bar: Bar):
+        self.entered_today = False
+        self.exited_today = False
         
     def on_bar(self, bar: Bar) -> Optional[Signal]:
        
         self.bars_processed += 1
         
-        current_time = bar.timestamp.time()
-        current_date = bar.timestamp.date()
+        if self.entered_today and self.exited_today:
+            return None
+
+        current_minute = bar.minute_of_day
         
         # Check for entry signal
-        if current_time >= self.entry_time and self.last_entry_date != current_date:
-            self.last_entry_date = current_date
-            return Signal(
-                strategy_id=self.strategy_id,
-                symbol=self.symbol,
-                side="BUY",
-                timestamp=bar.timestamp,
-                reason=f"Entry time reached: {self.entry_time}"
-            )
+        if not self.entered_today and current_minute >= self.entry_minute:
+            self.entered_today = True
+            return self.emit(BUY, bar.timestamp,
+                             f"Entry time reached: {self.entry_time}")
         
         # Check for exit signal
-        if current_time >= self.exit_time and self.last_exit_date != current_date:
-            self.last_exit_date = current_date
-            return Signal(
-                strategy_id=self.strategy_id,
-                symbol=self.symbol,
-                side="SELL",
-                timestamp=bar.timestamp,
-                reason=f"Exit time reached: {self.exit_time}"
-            )
+        if not self.exited_today and current_minute >= self.exit_minute:
+            self.exited_today = True
+            return self.emit(SELL, bar.timestamp,
+                             f"Exit time reached: {self.exit_time}")
         
         return None
     
     def reset(self):
         """Reset strategy state"""
         super().reset()
-        self.last_entry_date = None
-        self.last_exit_date = None
\ No newline at end of file
+        self.entered_today = False
+        self.exited_today = False
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Shared engine factory for tests that compare runs of one strategy lineup
+(incremental, sharded, journaled, telemetry runs vs. a plain run)
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from analytics.metrics import Analytics
+from data.feed import MarketDataFeed
+from engine.backtest_engine import BacktestEngine
+from execution.execution_engine import ExecutionEngine
+from risk.exit_manager import ExitRule
+from risk.risk_manager import RiskManager
+from strategies.ema_crossover import EMACrossoverStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.opening_range_breakout import OpeningRangeBreakoutStrategy
+
+
+RISK = {"max_position_size": 10, "max_loss_per_strategy": -500, "default_quantity": 4}
+
+
+def make_strategies(symbols: Optional[Iterable[str]] = None, mr_period: int = 10):
+    """
+    EMA 5/20 with a stop, EMA 3/8, mean reversion and opening range on
+    NIFTY, or on each of `symbols` (ids then end in _<symbol>)
+    """
+    if symbols is None:
+        return [
+            EMACrossoverStrategy(fast=5, slow=20, strategy_id="ema",
+                                 exit_rule=ExitRule(stop_loss_pct=0.002)),
+            EMACrossoverStrategy(fast=3, slow=8, strategy_id="ema_fast"),
+            MeanReversionStrategy(period=mr_period, strategy_id="mr"),
+            OpeningRangeBreakoutStrategy(symbol="NIFTY"),
+        ]
+
+    strategies = []
+    for symbol in symbols:
+        strategies += [
+            EMACrossoverStrategy(symbol=symbol, fast=5, slow=20, strategy_id=f"ema_{symbol}",
+                                 exit_rule=ExitRule(stop_loss_pct=0.002)),
+            EMACrossoverStrategy(symbol=symbol, fast=3, slow=8, strategy_id=f"ema_fast_{symbol}"),
+            MeanReversionStrategy(symbol=symbol, period=mr_period, strategy_id=f"mr_{symbol}"),
+            OpeningRangeBreakoutStrategy(symbol=symbol, strategy_id=f"orb_{symbol}"),
+        ]
+    return strategies
+
+
+def make_engine(feed, strategies=None, risk: Optional[Dict] = None, portfolio=None,
+                ledger=None, mr_period: int = 10, **engine_kwargs) -> BacktestEngine:
+    """
+    Args:
+        feed: A feed, or the path of a NIFTY CSV (not loaded yet)
+        strategies: Default: make_strategies(mr_period=mr_period)
+        risk: RiskManager arguments overriding RISK
+        portfolio / ledger: Passed to the risk manager / execution engine
+        engine_kwargs: Passed to BacktestEngine (portfolio_mode, journal, telemetry, ...)
+    """
+    if isinstance(feed, (str, Path)):
+        feed = MarketDataFeed(str(feed), "NIFTY")
+    risk_manager = RiskManager(**{**RISK, **(risk or {})}, portfolio=portfolio)
+    return BacktestEngine(feed, strategies or make_strategies(mr_period=mr_period),
+                          risk_manager, ExecutionEngine(ledger=ledger), Analytics(),
+                          verbose=False, **engine_kwargs)
+
+
+def run_result(engine):
+    """Everything a run leaves behind that two equivalent runs must agree on"""
+    return (
+        [(t.timestamp, t.strategy_id, t.symbol, str(t.side), t.quantity, t.price, t.realized_pnl)
+         for t in engine.analytics.trades],
+        engine.analytics.rejections.rows(),
+        dict(engine.risk_manager.strategy_pnl),
+        engine.risk_manager.blocked_strategies,
+        {key: (p.quantity, p.average_price) for key, p in engine.execution_engine.positions.items()},
+        engine.bars_processed,
+    )
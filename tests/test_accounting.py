@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from execution.accounting import Ledger
+from execution.execution_engine import ExecutionEngine
+from execution.models import Position
+
+
+def test_fifo_matches_oldest_lots_first():
+    ledger = Ledger("fifo")
+    ledger.record("s", "NIFTY", 10, 100.0)
+    ledger.record("s", "NIFTY", 10, 110.0)
+
+    assert ledger.record("s", "NIFTY", -15, 120.0) == 10 * 20.0 + 5 * 10.0
+    assert ledger.open_lots("s", "NIFTY") == [(5, 110.0)]
+
+    # Selling through zero opens a short at the fill price
+    assert ledger.record("s", "NIFTY", -8, 105.0) == 5 * -5.0
+    assert ledger.position("s", "NIFTY") == -3
+    assert ledger.open_lots("s", "NIFTY") == [(-3, 105.0)]
+
+    assert ledger.record("s", "NIFTY", 3, 100.0) == 15.0
+    assert ledger.position("s", "NIFTY") == 0
+    assert ledger.realized_pnl("s") == 250.0 - 25.0 + 15.0
+
+
+def test_average_cost_uses_one_lot():
+    ledger = Ledger("average")
+    ledger.record("s", "NIFTY", 10, 100.0)
+    ledger.record("s", "NIFTY", 10, 110.0)
+    assert ledger.open_lots("s", "NIFTY") == [(20, 105.0)]
+
+    assert ledger.record("s", "NIFTY", -15, 120.0) == 15 * 15.0
+    assert ledger.average_price("s", "NIFTY") == 105.0
+    assert ledger.unrealized_pnl("s", "NIFTY", 100.0) == 5 * -5.0
+
+    with pytest.raises(ValueError):
+        Ledger("lifo")
+
+
+def test_batch_matches_single_fills_and_attributes_pnl():
+    rng = np.random.default_rng(3)
+    n = 5000
+    names = [(f"s{i % 7}", f"X{i % 3}") for i in range(21)]
+    pick = rng.integers(0, len(names), n)
+    quantities = rng.integers(1, 6, n) * rng.choice([-1, 1], n)
+    prices = np.round(100 + rng.normal(0, 2, n), 2)
+
+    single = Ledger()
+    expected = [single.record(*names[k], int(q), float(p), t)
+                for t, (k, q, p) in enumerate(zip(pick, quantities, prices))]
+
+    batch = Ledger()
+    slots = [batch.slot(batch.strategy_code(s), batch.symbol_code(x)) for s, x in names]
+    pnls = batch.record_many(np.array(slots)[pick], quantities, prices, np.arange(n))
+
+    assert pnls.tolist() == expected
+    assert [batch.position(*k) for k in names] == [single.position(*k) for k in names]
+    assert batch.strategy_pnl() == pytest.approx(single.strategy_pnl())
+
+    fills = batch.fills()
+    assert len(batch) == n and fills['realized_pnl'].sum() == pytest.approx(batch.realized_pnl())
+    first = names[pick[0]]
+    assert (fills['strategy_id'][0], fills['symbol'][0]) == first
+
+    # Open lots always add up to the position
+    for s, x in names:
+        assert sum(q for q, _ in batch.open_lots(s, x)) == batch.position(s, x)
+
+
+def test_position_buy_realizes_short_cover():
+    position = Position("s", "NIFTY")
+    position.sell(5, 100.0)
+    assert position.buy(3, 90.0) == 30.0
+    assert position.buy(4, 95.0) == 10.0
+    assert position.quantity == 2 and position.average_price == 95.0
+
+
+def test_execution_engine_books_into_ledger():
+    engine = ExecutionEngine(ledger=Ledger("fifo"))
+    engine.execute_trade("s", "NIFTY", 1, 100.0, 0)
+    engine.execute_trade("s", "NIFTY", 1, 104.0, 1)
+    trade = engine.execute_trade("s", "NIFTY", -1, 106.0, 2)
+
+    # FIFO closes the 100 lot; the position follows the ledger's open lot
+    assert trade.realized_pnl == 6.0
+    position = engine.get_position("s", "NIFTY")
+    assert position is engine.positions[("s", "NIFTY")]
+    assert position.quantity == 1 and position.average_price == 104.0
+
+    # Realized + unrealized is the true PnL at any price
+    assert engine.ledger.realized_pnl() + position.calculate_unrealized_pnl(110.0) == \
+        (106 - 100) + (110 - 104)
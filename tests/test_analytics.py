@@ -0,0 +1,119 @@
+import numpy as np
+
+from analytics.export import SKIP_COLUMNS, iter_chunks, open_writer
+from analytics.metrics import Analytics
+from analytics.robustness import path_stats, simulate, trade_pnls
+from execution.models import Trade
+
+
+T0 = 1420775100 * 1_000_000_000  # 2015-01-09 09:15 IST
+
+
+def sample_trades():
+    pnls = [0.0, 12.5, 0.0, -4.0, 0.0, 7.25, 0.0, -1.5]
+    return [
+        Trade("s1" if i % 4 < 2 else "s2", "NIFTY", "SELL" if pnl else "BUY",
+              -5 if pnl else 5, 100.0 + i, T0 + i * 60_000_000_000, pnl, "test")
+        for i, pnl in enumerate(pnls)
+    ]
+
+
+def test_streaming_export_round_trip(tmp_path):
+    trades = sample_trades()
+
+    for target in ("trades.csv", "trades_npz"):
+        path = tmp_path / target
+        analytics = Analytics(trade_writer=open_writer(str(path), batch_size=3),
+                              keep_in_memory=False)
+        for trade in trades:
+            analytics.log_trade(trade)
+        analytics.close()
+
+        assert analytics.trades == []
+        assert analytics.trade_count == len(trades)
+
+        chunks = list(iter_chunks(str(path), chunk_size=3))
+        assert [len(c['price']) for c in chunks] == [3, 3, 2]
+
+        expected = [Analytics().calculate_metrics([t for t in trades if t.strategy_id == sid], sid)
+                    for sid in ("s1", "s2")]
+        assert analytics.metrics_from_file(str(path), ["s1", "s2"]) == expected
+
+
+def test_skip_writer_streams_rows(tmp_path):
+    path = tmp_path / "skips.csv"
+    analytics = Analytics(skip_writer=open_writer(str(path), SKIP_COLUMNS, batch_size=2))
+
+    for i in range(5):
+        analytics.log_skipped_trade(T0 + i, "s1", "NIFTY", "BUY", "Risk manager rejected", 0, -10.0)
+
+    # Two full batches already on disk before close()
+    assert analytics.skip_writer.rows_written == 4
+    analytics.close()
+
+    rows = path.read_text().splitlines()
+    assert len(rows) == 6
+    assert rows[1].startswith("2015-01-09 09:15:00+05:30,s1,NIFTY,BUY")
+
+
+def test_rejection_log_aggregate_mode_stays_flat():
+    full = Analytics()
+    compact = Analytics(skip_mode="aggregate")
+
+    for analytics in (full, compact):
+        for i in range(1000):
+            side = "BUY" if i % 2 == 0 else "SELL"
+            analytics.log_skipped_trade(T0 + i, "s1", "NIFTY", side, "Risk manager rejected", 0, -1136.0)
+
+    assert full.skip_count == compact.skip_count == 1000
+    rows = full.rejections.rows()
+    assert len(rows) == 1000
+    assert rows[1]['side'] == "SELL"
+
+    rows = compact.rejections.rows()
+    assert len(rows) == 2
+    assert rows[0]['count'] == 500
+    assert rows[0]['timestamp'] == T0 and rows[0]['last_timestamp'] == T0 + 998
+    assert compact.rejections.counts() == full.rejections.counts() == {
+        ("s1", "Risk manager rejected", "BUY"): 500,
+        ("s1", "Risk manager rejected", "SELL"): 500,
+    }
+
+    # Each symbol keeps its own aggregate row
+    compact.log_skipped_trade(T0 + 1000, "s1", "BANKNIFTY", "BUY", "Risk manager rejected", 0, -1136.0)
+    rows = compact.rejections.rows()
+    assert [(r['symbol'], r['count']) for r in rows] == [("NIFTY", 500), ("NIFTY", 500), ("BANKNIFTY", 1)]
+    assert compact.rejections.counts()[("s1", "Risk manager rejected", "BUY")] == 501
+
+
+def test_path_stats_matches_loop():
+    pnl = np.array([[5.0, -3.0, -4.0, 6.0, -1.0]])
+    totals, max_dd, sharpe = path_stats(pnl)
+
+    assert totals[0] == 3.0
+    assert max_dd[0] == 7.0  # peak 5 -> trough -2
+    assert np.isclose(sharpe[0], pnl.mean() / pnl.std())
+
+
+def test_robustness_simulation_is_chunked_and_deterministic():
+    trades = sample_trades()
+    assert trade_pnls(trades).tolist() == [12.5, -4.0, 7.25, -1.5]
+    assert trade_pnls(trades, "s2").tolist() == [-4.0, -1.5]
+
+    pnl = np.random.default_rng(1).normal(1.0, 10.0, 500)
+    # One seed block per chunk -> many chunks; the budget doesn't change the draws
+    small = simulate(pnl, n_sims=200, max_bytes=500 * 24 * 4, seed=9)
+    large = simulate(pnl, n_sims=200, seed=9)
+    again = simulate(pnl, n_sims=200, max_bytes=500 * 24 * 4, seed=9)
+
+    assert small == again == large
+    assert small['n_sims'] == large['n_sims'] == 200
+    for key in ('total_pnl', 'max_drawdown', 'sharpe'):
+        interval = small[key]
+        assert interval['lower'] <= interval['mean'] <= interval['upper']
+
+    shuffled = simulate(pnl, n_sims=100, method="shuffle", return_samples=True)
+    samples = shuffled['samples']
+    assert np.allclose(samples['total_pnl'], pnl.sum())
+    assert np.allclose(samples['sharpe'], shuffled['sharpe']['actual'], atol=1e-4)
+    assert samples['max_drawdown'].std() > 0
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from engine.config import build_strategies, config_hash, expand_runs
+from engine.runner import run_config
+
+
+CSV = "timestamp,open,high,low,close\n" + "\n".join(
+    f"2015-01-09 09:{15 + i:02d}:00,{100 + i % 7},{101 + i % 7},{99 + i % 7},{100 + i % 5}"
+    for i in range(40)
+)
+
+
+def test_expand_runs_merges_defaults():
+    config = {
+        "defaults": {"feed": "nifty", "risk": {"default_quantity": 5, "max_position_size": 50}},
+        "runs": [
+            {"name": "a", "risk": {"default_quantity": 2}},
+            {"name": "b", "outputs": {"dir": "custom"}},
+        ],
+    }
+    a, b = expand_runs(config)
+
+    assert a["risk"] == {"default_quantity": 2, "max_position_size": 50}
+    assert a["outputs"]["dir"].endswith("a")
+    assert b["outputs"]["dir"] == "custom"
+
+    # Name and output location do not change the result
+    assert config_hash(a) != config_hash(b)
+    assert config_hash({**a, "name": "x", "outputs": {}}) == config_hash(a)
+
+
+def test_build_strategies_rejects_duplicate_ids():
+    specs = [{"name": "ema_crossover"}, {"name": "ema_crossover", "params": {"fast": 5}}]
+    with pytest.raises(ValueError):
+        build_strategies(specs, "NIFTY")
+
+    specs[1]["id"] = "ema_fast"
+    strategies = build_strategies(specs, "NIFTY")
+    assert [s.strategy_id for s in strategies] == ["ema_crossover", "ema_fast"]
+    assert strategies[1].fast == 5
+
+
+def test_runner_writes_manifest_and_skips_identical_run(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text(CSV)
+
+    config = {
+        "feeds": {"test": {"path": str(csv_path), "symbol": "NIFTY"}},
+        "runs": [{
+            "name": "mr",
+            "feed": "test",
+            "strategies": [{"name": "mean_reversion", "params": {"period": 5}}],
+            "risk": {"max_position_size": 100, "default_quantity": 1},
+            "outputs": {"dir": str(tmp_path / "out")},
+        }],
+    }
+
+    first, = run_config(config)
+    manifest = json.loads((tmp_path / "out" / "manifest.json").read_text())
+    assert not first["skipped"]
+    assert manifest["config_hash"] == first["config_hash"]
+    assert manifest["bars"] == 40
+    assert (tmp_path / "out" / "trades.csv").exists()
+
+    second, = run_config(config)
+    assert second["skipped"]
+
+    forced, = run_config(config, force=True)
+    assert not forced["skipped"]
+
+    # A missing output file means the run has to be redone
+    (tmp_path / "out" / "trades.csv").unlink()
+    rerun, = run_config(config)
+    assert not rerun["skipped"]
+    assert (tmp_path / "out" / "trades.csv").exists()
+
+    # So does a change to the feed's spec (same file, different symbol)
+    config["feeds"]["test"]["symbol"] = "BANKNIFTY"
+    respec, = run_config(config)
+    assert not respec["skipped"]
+    assert respec["config_hash"] != first["config_hash"]
+
+    # Changing the data invalidates the cached run
+    csv_path.write_text(CSV + "\n2015-01-09 09:55:00,100,101,99,100")
+    changed, = run_config(config)
+    assert not changed["skipped"]
+    assert changed["data_hash"] != first["data_hash"]
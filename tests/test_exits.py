@@ -0,0 +1,87 @@
+from datetime import datetime, time, timedelta
+
+from core.timestamps import from_datetime
+from data.bar import Bar
+from execution.execution_engine import ExecutionEngine
+from risk.exit_manager import ExitManager, ExitRule
+
+
+START = datetime(2015, 1, 9, 9, 15)
+T0 = from_datetime(START)
+
+
+def make_bar(i, high, low, close=None, open_=None):
+    close = close if close is not None else (high + low) / 2
+    open_ = open_ if open_ is not None else close
+    return Bar.from_datetime(
+        START + timedelta(minutes=i),
+        symbol="NIFTY",
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+    )
+
+
+def open_long(manager, rule, price=100.0, qty=5):
+    engine = ExecutionEngine()
+    manager.register("s1", rule)
+    trade = engine.execute_trade("s1", "NIFTY", qty, price, T0)
+    manager.on_fill(trade, engine.get_position("s1", "NIFTY"))
+    return engine
+
+
+def test_stop_loss_fills_at_stop_level():
+    manager = ExitManager()
+    open_long(manager, ExitRule(stop_loss=2.0, take_profit=5.0))
+
+    assert manager.on_bar(make_bar(1, high=101, low=99)) == []
+    exits = manager.on_bar(make_bar(2, high=100, low=97))
+
+    assert exits == [("s1", 98.0, "Stop loss")]
+    assert not manager.is_armed("s1", "NIFTY")
+
+
+def test_take_profit_gap_fills_at_open():
+    manager = ExitManager()
+    open_long(manager, ExitRule(take_profit_pct=0.05))
+
+    exits = manager.on_bar(make_bar(1, high=110, low=107, open_=108))
+    assert exits == [("s1", 108.0, "Take profit")]
+
+
+def test_trailing_stop_follows_high_water_mark():
+    manager = ExitManager()
+    open_long(manager, ExitRule(trailing_stop=3.0))
+
+    assert manager.on_bar(make_bar(1, high=110, low=108)) == []
+    exits = manager.on_bar(make_bar(2, high=109, low=106))
+    assert exits == [("s1", 107.0, "Trailing stop")]
+
+
+def test_max_bars_exit_at_close():
+    manager = ExitManager()
+    open_long(manager, ExitRule(max_bars=2))
+
+    assert manager.on_bar(make_bar(1, high=101, low=99, close=100.5)) == []
+    exits = manager.on_bar(make_bar(2, high=101, low=99, close=100.25))
+    assert exits == [("s1", 100.25, "Max holding period")]
+
+
+def test_closing_fill_disarms_bracket():
+    manager = ExitManager()
+    engine = open_long(manager, ExitRule(stop_loss=2.0))
+
+    trade = engine.execute_trade("s1", "NIFTY", -5, 101.0, T0)
+    manager.on_fill(trade, engine.get_position("s1", "NIFTY"))
+
+    assert not manager.is_armed("s1", "NIFTY")
+    assert manager.on_bar(make_bar(1, high=90, low=80)) == []
+
+
+def test_time_exit_uses_minute_of_day():
+    manager = ExitManager()
+    open_long(manager, ExitRule(exit_time=time(9, 20)))
+
+    assert manager.on_bar(make_bar(4, high=101, low=99, close=100.0)) == []
+    assert manager.on_bar(make_bar(5, high=101, low=99, close=100.5)) == [("s1", 100.5, "Time exit")]
@@ -1,4 +1,13 @@
+from datetime import date, datetime, time
+
+import numpy as np
+
+from core.timestamps import format_timestamp
+from data.bar import Bar
+from data.calendar import day_number, nse_calendar
+from data.aggregator import BarAggregator
 from data.feed import MarketDataFeed
+from data.synthetic import SyntheticMarket
 
 
 def test_market_data_feed():
@@ -21,3 +30,146 @@ def test_market_data_feed():
 
 if __name__ == "__main__":
     test_market_data_feed()
+
+
+def test_feed_precomputes_session_bounds():
+    feed = MarketDataFeed(csv_path="data/market_data.csv", symbol="NIFTY")
+    feed.load()
+
+    assert len(feed.session_starts) == len(feed.session_ends) == 6
+    assert feed.session_starts[0] == 0
+    assert feed.session_ends[-1] == len(feed) - 1
+    assert (feed.session_ends[:-1] + 1 == feed.session_starts[1:]).all()
+    assert feed.minutes[0] == 9 * 60 + 15
+
+
+def test_calendar_masks_holidays_and_half_days():
+    calendar = nse_calendar(half_days={date(2015, 1, 9): time(12, 0)})
+    days = np.array([day_number(date(2015, 1, 9))] * 2 +
+                    [day_number(date(2015, 1, 10))] +
+                    [day_number(date(2015, 1, 26))])
+    minutes = np.array([11 * 60, 13 * 60, 10 * 60, 10 * 60])
+
+    # Half-day afternoon, Saturday and Republic Day are all closed
+    assert calendar.session_mask(days, minutes).tolist() == [True, False, False, False]
+
+
+def test_feed_yields_epoch_ns_bars():
+    feed = MarketDataFeed(csv_path="data/market_data.csv", symbol="NIFTY")
+    feed.load()
+
+    bar = next(iter(feed))
+    assert isinstance(bar.timestamp, int)
+    assert format_timestamp(bar.timestamp) == "2015-01-09 09:15:00+05:30"
+    assert bar.minute_of_day == 9 * 60 + 15
+    assert bar.session_day == day_number(date(2015, 1, 9))
+    assert Bar.from_datetime(datetime(2015, 1, 9, 9, 15), "NIFTY", 1, 1, 1, 1) == \
+        Bar(bar.timestamp, "NIFTY", 1, 1, 1, 1, bar.minute_of_day, bar.session_day)
+
+
+def test_binary_cache_round_trip(tmp_path):
+    cache = tmp_path / "bars.npz"
+
+    first = MarketDataFeed(csv_path="data/market_data.csv", symbol="NIFTY", cache=str(cache))
+    first.load()
+    assert cache.exists()
+
+    second = MarketDataFeed(csv_path="data/market_data.csv", symbol="NIFTY", cache=str(cache))
+    assert second._cache_is_fresh()
+    second.load()
+
+    assert (first.timestamps == second.timestamps).all()
+    assert (first.closes == second.closes).all()
+    assert (first.session_starts == second.session_starts).all()
+
+    direct = MarketDataFeed(csv_path=str(cache), symbol="NIFTY")
+    direct.load()
+    assert len(direct) == len(first)
+
+
+def test_synthetic_market_is_deterministic_and_in_session():
+    market = SyntheticMarket(start=date(2015, 1, 20), n_bars=5000, model="regime", seed=3)
+    a = market.arrays("NIFTY")
+    b = SyntheticMarket(start=date(2015, 1, 20), n_bars=5000, model="regime", seed=3).arrays("NIFTY")
+    other = market.arrays("BANKNIFTY")
+
+    assert len(a['closes']) == 5000
+    assert all((a[k] == b[k]).all() for k in a)
+    assert not (a['closes'] == other['closes']).all()
+
+    # NSE hours, no weekends or Republic Day
+    assert a['minutes'].min() == 9 * 60 + 15
+    assert a['minutes'].max() == 15 * 60 + 29
+    assert not np.isin((a['session_days'] + 3) % 7, (5, 6)).any()
+    assert day_number(date(2015, 1, 26)) not in a['session_days']
+
+    assert (a['highs'] >= np.maximum(a['opens'], a['closes'])).all()
+    assert (a['lows'] <= np.minimum(a['opens'], a['closes'])).all()
+    assert (np.diff(a['timestamps']) > 0).all()
+
+
+def test_synthetic_market_outputs_load_in_feed(tmp_path):
+    market = SyntheticMarket(n_bars=1200, seed=5)
+    expected = market.arrays("NIFTY")
+
+    market.write_cache("NIFTY", tmp_path / "bars.npz")
+    market.write_csv("NIFTY", tmp_path / "bars.csv")
+
+    for path in ("bars.npz", "bars.csv"):
+        feed = MarketDataFeed(str(tmp_path / path), "NIFTY")
+        feed.load()
+        assert (feed.timestamps == expected['timestamps']).all()
+        assert np.allclose(feed.closes, expected['closes'])
+        assert len(feed.session_starts) == 4
+
+    feed = market.feed("NIFTY")
+    assert len(feed) == 1200
+    assert next(iter(feed)).minute_of_day == 9 * 60 + 15
+
+
+def test_feed_timezone_is_used_everywhere(tmp_path):
+    # A market on UTC: CSV, synthetic bars and Bar.from_datetime agree
+    market = SyntheticMarket(n_bars=400, seed=5, tz="UTC")
+    market.write_csv("NIFTY", tmp_path / "bars.csv")
+    assert (tmp_path / "bars.csv").read_text().splitlines()[1].startswith("2015-01-01 09:15:00+00:00")
+
+    feed = MarketDataFeed(str(tmp_path / "bars.csv"), "NIFTY", tz="UTC")
+    feed.load()
+    bar = next(iter(feed))
+    assert (feed.timestamps == market.arrays("NIFTY")['timestamps']).all()
+    assert next(iter(market.feed("NIFTY"))) == bar
+    assert Bar.from_datetime(datetime(2015, 1, 1, 9, 15), "NIFTY", bar.open, bar.high,
+                             bar.low, bar.close, tz=feed.tz, volume=bar.volume) == bar
+    assert format_timestamp(bar.timestamp, feed.tz) == "2015-01-01 09:15:00+00:00"
+
+
+def test_optional_volume_and_open_interest_columns(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text(
+        "timestamp,open,high,low,close,volume,oi\n"
+        "2015-01-09 09:15:00,100,101,99,100.5,1200,50\n"
+        "2015-01-09 09:16:00,100.5,102,100,101.5,800,55\n"
+        "2015-01-09 09:17:00,101.5,103,101,102.5,400,60\n"
+    )
+
+    feed = MarketDataFeed(str(csv_path), "NIFTY", cache=True)
+    feed.load()
+    bars = list(feed)
+    assert [b.volume for b in bars] == [1200, 800, 400]
+    assert bars[-1].open_interest == 60
+
+    # Volume survives the binary cache and is summed by the aggregator
+    cached = MarketDataFeed(str(csv_path), "NIFTY", cache=True)
+    cached.load()
+    assert (cached.volumes == feed.volumes).all()
+    assert cached.content_hash() == feed.content_hash()
+
+    aggregator = BarAggregator("NIFTY", 3)
+    completed = [b for bar in cached for b in aggregator.update(bar)]
+    assert completed[0].volume == 2400 and completed[0].open_interest == 60
+
+    # Sources without the columns keep plain OHLC bars
+    plain = MarketDataFeed(csv_path="data/market_data.csv", symbol="NIFTY")
+    plain.load()
+    assert plain.volumes is None
+    assert next(iter(plain)).volume == 0.0
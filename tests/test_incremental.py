@@ -0,0 +1,83 @@
+import pytest
+
+from data.synthetic import SyntheticMarket
+from engine.incremental import IncrementalRunner
+from tests.helpers import make_engine, run_result
+
+
+@pytest.mark.parametrize("portfolio_mode", [False, True])
+def test_resumed_runs_match_full_run(tmp_path, portfolio_mode):
+    full_csv = tmp_path / "full.csv"
+    SyntheticMarket(n_bars=2500, seed=3).write_csv("NIFTY", full_csv)
+    lines = full_csv.read_text().splitlines(keepends=True)
+
+    full = make_engine(full_csv, portfolio_mode=portfolio_mode)
+    full.data_feed.load()
+    full.run()
+
+    # Append in pieces that end mid-session, on a session end and not at all
+    csv = tmp_path / "daily.csv"
+    state = tmp_path / "state.ckpt"
+    csv.write_text("".join(lines[:600]))
+    written = 600
+    runs = []
+    for cut in (600, 900, 901, 1876, len(lines), len(lines)):
+        with open(csv, "a") as f:
+            f.write("".join(lines[written:cut]))
+        written = cut
+
+        engine = make_engine(csv, portfolio_mode=portfolio_mode)
+        runner = IncrementalRunner(engine, state)
+        runner.run()
+        runs.append((runner.resumed, runner.bars_run))
+
+    assert runs[0] == (False, 599)
+    assert all(resumed for resumed, _ in runs[1:])
+    # Only the last session (<= 375 bars) is replayed on top of new rows
+    assert runs[2][1] <= 375 + 1 and runs[-1][1] <= 375
+    assert run_result(engine) == run_result(full)
+
+
+def test_edited_history_falls_back_to_full_run(tmp_path):
+    csv = tmp_path / "bars.csv"
+    SyntheticMarket(n_bars=1200, seed=8).write_csv("NIFTY", csv)
+    state = tmp_path / "state.ckpt"
+
+    IncrementalRunner(make_engine(csv), state).run()
+
+    # Rewrite an early row: the checkpoint must not be trusted
+    lines = csv.read_text().splitlines(keepends=True)
+    lines[5] = lines[5].replace(lines[5].split(",")[4], "1.00", 1)
+    csv.write_text("".join(lines))
+
+    engine = make_engine(csv)
+    runner = IncrementalRunner(engine, state)
+    runner.run()
+    assert not runner.resumed and runner.bars_run == 1200
+
+    full = make_engine(csv)
+    full.data_feed.load()
+    full.run()
+    assert run_result(engine) == run_result(full)
+
+    # An edit that keeps the file's length, far before the offset, is caught too
+    big = tmp_path / "big.csv"
+    SyntheticMarket(n_bars=20000, seed=8).write_csv("NIFTY", big)
+    assert big.stat().st_size > 1 << 20
+    big_state = tmp_path / "big.ckpt"
+    IncrementalRunner(make_engine(big), big_state).run()
+
+    data = bytearray(big.read_bytes())
+    row = data.index(b"\n", 200) + 1
+    digit = data.index(b".", row) - 1
+    data[digit] = ord("1") if data[digit] != ord("1") else ord("2")
+    big.write_bytes(bytes(data))
+
+    runner = IncrementalRunner(make_engine(big), big_state)
+    runner.run()
+    assert not runner.resumed
+
+    # A different setup doesn't resume either
+    runner = IncrementalRunner(make_engine(csv, mr_period=11), state)
+    runner.run()
+    assert not runner.resumed
@@ -1,4 +1,8 @@
+from statistics import stdev
+
 from indicators.moving_averages import EMA
+from indicators.volatility import ATR, RollingStdDev
+from indicators.volume import VWAP, VolumeProfile
 
 def test_ema():
     prices = [10, 11, 12, 13, 14, 15]
@@ -10,3 +14,45 @@ def test_ema():
 
 if __name__ == "__main__":
     test_ema()
+
+
+def test_atr_and_stdev_streaming():
+    atr = ATR(period=3)
+    for high, low, close in [(11, 9, 10), (12, 10, 11), (13, 10, 12), (12, 11, 11)]:
+        value = atr.update(high, low, close)
+    # TRs: 2, 2, 3 -> seed 7/3, then TR=1 smoothed
+    assert abs(value - (7 / 3 + (1 - 7 / 3) / 3)) < 1e-12
+
+    prices = [100, 101, 99, 102, 103, 101]
+    sd = RollingStdDev(period=3)
+    for p in prices:
+        value = sd.update(p)
+    rets = [prices[i] / prices[i - 1] - 1 for i in range(3, 6)]
+    assert abs(value - stdev(rets)) < 1e-12
+
+
+def test_vwap_resets_each_session():
+    vwap = VWAP()
+    vwap.update(11, 9, 10, 100, session_day=1)
+    assert vwap.update(21, 19, 20, 300, session_day=1) == (10 * 100 + 20 * 300) / 400
+
+    # Zero-volume bars leave it unchanged
+    assert vwap.update(31, 29, 30, 0, session_day=1) == 17.5
+
+    assert vwap.update(6, 4, 5, 10, session_day=2) == 5
+
+
+def test_volume_profile_poc_and_value_area():
+    profile = VolumeProfile(bin_size=1.0)
+    for price, volume in [(100.2, 10), (101.5, 50), (102.1, 30), (103.7, 5), (101.9, 20)]:
+        profile.update(price, price, price, volume, session_day=1)
+
+    assert profile.poc == 101.0
+    assert profile.volume_at(101.3) == 70
+    assert profile.total_volume == 115
+
+    # 70 at 101 + 30 at 102 = 100 >= 0.7 * 115
+    assert profile.value_area(0.7) == (101.0, 103.0)
+
+    profile.update(50, 50, 50, 1, session_day=2)
+    assert profile.poc == 50.0 and profile.total_volume == 1
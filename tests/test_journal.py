@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from data.synthetic import SyntheticMarket
+from engine.incremental import IncrementalRunner
+from engine.journal import (
+    APPROVE, FILL, REJECT, SIGNAL, Journal, RECORD, RECORD_DTYPE, read_journal, replay,
+)
+from execution.accounting import Ledger
+from tests.helpers import make_engine
+
+
+# Tighter than the shared default, so strategies get blocked part-way
+LOSS_LIMIT = {"max_loss_per_strategy": -300}
+
+
+def test_record_layout_is_fixed_width():
+    assert RECORD.size == RECORD_DTYPE.itemsize == 48
+
+
+@pytest.mark.parametrize("ledger,portfolio_mode", [(None, False), ("fifo", True)])
+def test_replay_rebuilds_run(tmp_path, ledger, portfolio_mode):
+    csv = tmp_path / "bars.csv"
+    SyntheticMarket(n_bars=3000, seed=5).write_csv("NIFTY", csv)
+    path = tmp_path / "run.journal"
+
+    # Small batches: several hand-offs to the writer thread during the run
+    with Journal(path, batch_events=64) as journal:
+        engine = make_engine(csv, risk=LOSS_LIMIT, ledger=Ledger(ledger) if ledger else None,
+                             journal=journal, portfolio_mode=portfolio_mode)
+        engine.data_feed.load()
+        engine.run()
+
+    result = replay(path)
+    analytics = engine.analytics
+    assert result.events == len(journal)
+    assert analytics.skip_count > 0
+
+    assert [(t.timestamp, t.strategy_id, t.side, t.quantity, t.price, t.realized_pnl, t.reason)
+            for t in result.analytics.trades] == \
+           [(t.timestamp, t.strategy_id, t.side, t.quantity, t.price, t.realized_pnl, t.reason)
+            for t in analytics.trades]
+    assert result.analytics.rejections.rows() == analytics.rejections.rows()
+    assert result.strategy_pnl == pytest.approx(engine.risk_manager.strategy_pnl)
+    assert list(result.strategy_pnl) == list(engine.risk_manager.strategy_pnl)
+    assert {k: (p.quantity, p.average_price) for k, p in result.execution_engine.positions.items()} \
+        == {k: (p.quantity, p.average_price) for k, p in engine.execution_engine.positions.items()}
+
+
+def test_rejections_carry_the_rule_that_fired(tmp_path):
+    csv = tmp_path / "bars.csv"
+    SyntheticMarket(n_bars=2000, seed=2).write_csv("NIFTY", csv)
+    path = tmp_path / "run.journal"
+
+    with Journal(path) as journal:
+        engine = make_engine(csv, risk=LOSS_LIMIT, journal=journal)
+        engine.data_feed.load()
+        engine.run()
+
+    records, strings = read_journal(path)
+    kinds = records["kind"]
+    rules = {strings[code] for code in records["reason"][kinds == REJECT].tolist()}
+    assert rules and "" not in rules
+    assert rules <= {"strategy_blocked", "max_loss_per_strategy", "max_position_size"}
+
+    # Every signal is followed by exactly one approval or rejection
+    decisions = kinds[np.flatnonzero(kinds == SIGNAL) + 1]
+    assert set(decisions.tolist()) <= {APPROVE, REJECT}
+    assert (kinds == SIGNAL).sum() == (kinds == APPROVE).sum() + (kinds == REJECT).sum()
+    assert (kinds == APPROVE).sum() == (kinds == FILL).sum()
+
+    counts = replay(path).rejections
+    assert sum(counts.values()) == (kinds == REJECT).sum()
+
+
+def test_read_rejects_foreign_files(tmp_path):
+    path = tmp_path / "bogus.journal"
+    path.write_bytes(b"not a journal at all")
+    with pytest.raises(ValueError):
+        read_journal(path)
+
+
+def test_incremental_runner_refuses_a_journal(tmp_path):
+    csv = tmp_path / "bars.csv"
+    SyntheticMarket(n_bars=400, seed=1).write_csv("NIFTY", csv)
+    with Journal(tmp_path / "run.journal") as journal:
+        with pytest.raises(ValueError):
+            IncrementalRunner(make_engine(csv, journal=journal), tmp_path / "state.ckpt")
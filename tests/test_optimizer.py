@@ -0,0 +1,90 @@
+import pytest
+
+from analytics.metrics import Analytics
+from data.synthetic import SyntheticMarket
+from engine.config import build_engine
+from engine.optimizer import Optimizer, apply_params, objective_value
+from engine.result_cache import ResultCache
+
+
+BASE = {"strategies": [{"name": "ema_crossover", "params": {}}], "risk": {"default_quantity": 5}}
+SPACE = {
+    "strategies.0.params.fast": range(2, 12),
+    "strategies.0.params.slow": range(10, 50, 5),
+    "risk.max_loss_per_strategy": [-300, -5000],
+}
+
+
+def _fast_below_slow(params):
+    return params["strategies.0.params.fast"] < params["strategies.0.params.slow"]
+
+
+def _optimizer(**kwargs):
+    feed = SyntheticMarket(n_bars=2000, seed=5).feed("NIFTY")
+    kwargs.setdefault("verbose", False)
+    return Optimizer(feed, BASE, SPACE, constraint=_fast_below_slow, **kwargs)
+
+
+def test_apply_params_sets_dotted_paths():
+    run = apply_params(BASE, {"strategies.0.params.fast": 7, "fill_model.type": "close"})
+    assert run["strategies"][0]["params"] == {"fast": 7}
+    assert run["fill_model"] == {"type": "close"}
+    assert BASE["strategies"][0]["params"] == {}
+
+    feed = SyntheticMarket(n_bars=200, seed=1).feed("NIFTY")
+    with pytest.raises(IndexError):
+        Optimizer(feed, BASE, {"strategies.1.params.fast": [3]})
+    with pytest.raises(ValueError):
+        Optimizer(feed, BASE, SPACE, objective="profit")
+
+
+def test_objectives_come_from_analytics_metrics():
+    engine = build_engine(BASE, SyntheticMarket(n_bars=2000, seed=5).feed("NIFTY"))
+    engine.run()
+    trades = engine.analytics.trades
+    assert trades
+
+    assert objective_value(trades) == Analytics().calculate_metrics(trades, "all")["total_pnl"]
+    assert objective_value(trades, "pnl_to_drawdown") != 0
+    assert objective_value([], "sharpe") == 0.0
+
+
+def test_genetic_matches_grid_with_fewer_backtests():
+    grid = _optimizer(prefix=None).grid()
+    scores = sorted((e.score for e in grid.evaluations), reverse=True)
+    assert grid.backtests == len(scores) > 100
+
+    result = _optimizer().genetic(population=12, generations=10, seed=1)
+    assert result.best.score >= scores[2]
+    assert result.pruned > 0
+    assert result.backtest_equivalents < 0.5 * grid.backtests
+
+
+def test_pruned_runs_stop_at_a_session_start():
+    optimizer = _optimizer(prefix=0.3, warmup=4)
+    result = optimizer.genetic(population=12, generations=4, patience=10, seed=3)
+    assert optimizer.checkpoint in optimizer.feed.session_starts.tolist()
+
+    pruned = [e for e in result.evaluations if e.pruned]
+    assert pruned and all(e.bars == optimizer.checkpoint for e in pruned)
+    assert all(e.bars == len(optimizer.feed) for e in result.evaluations if not e.pruned)
+
+
+def test_results_do_not_depend_on_workers():
+    def outcome(result):
+        return [(e.params, e.score, e.pruned) for e in result.evaluations]
+
+    serial = _optimizer().genetic(population=8, generations=3, seed=2)
+    pooled = _optimizer(n_workers=2).genetic(population=8, generations=3, seed=2)
+    assert outcome(pooled) == outcome(serial)
+
+
+def test_result_cache_reuses_completed_runs(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    first = _optimizer(prefix=None, cache=cache).grid()
+    again = _optimizer(prefix=None, cache=cache).grid()
+
+    assert not any(e.cached for e in first.evaluations)
+    assert all(e.cached and e.bars == 0 for e in again.evaluations)
+    assert [e.score for e in again.evaluations] == [e.score for e in first.evaluations]
+    assert again.best.params == first.best.params
@@ -0,0 +1,72 @@
+from analytics.metrics import Analytics
+from data.feed import MarketDataFeed
+from engine.backtest_engine import BacktestEngine
+from engine.result_cache import ResultCache
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.mean_reversion import MeanReversionStrategy
+
+
+CSV = "timestamp,open,high,low,close\n" + "\n".join(
+    f"2015-01-09 09:{15 + i:02d}:00,{100 + i % 7},{101 + i % 7},{99 + i % 7},{100 + i % 5}"
+    for i in range(40)
+)
+
+
+def make_engine(csv_path, period=5, quantity=1):
+    feed = MarketDataFeed(str(csv_path), "NIFTY")
+    feed.load()
+    return BacktestEngine(
+        data_feed=feed,
+        strategies=[MeanReversionStrategy(period=period)],
+        risk_manager=RiskManager(max_position_size=100, default_quantity=quantity),
+        execution_engine=ExecutionEngine(),
+        analytics=Analytics(),
+        verbose=False,
+    )
+
+
+def test_result_cache_hit_miss_and_bypass(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text(CSV)
+    cache = ResultCache(tmp_path / "cache")
+
+    first = cache.run(make_engine(csv_path))
+    assert not first.cached and first.trades
+
+    second = cache.run(make_engine(csv_path))
+    assert second.cached
+    assert second.key == first.key
+    assert second.trades == first.trades
+    assert second.metrics == first.metrics
+
+    # Any param change is a different key
+    assert cache.key(make_engine(csv_path, period=6)) != first.key
+    assert cache.key(make_engine(csv_path, quantity=2)) != first.key
+
+    bypassed = cache.run(make_engine(csv_path), bypass=True)
+    assert not bypassed.cached
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Same bars under another path share the entry
+    copy_path = tmp_path / "copy.csv"
+    copy_path.write_text(CSV)
+    assert cache.run(make_engine(copy_path)).cached
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text(CSV)
+    cache = ResultCache(tmp_path / "cache")
+
+    keys = [cache.run(make_engine(csv_path, period=p)).key for p in (3, 4, 5)]
+    entry_size = cache.size_bytes() // 3
+
+    # Touch the oldest, then shrink the budget to two entries
+    assert cache.get(keys[0]) is not None
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    cache._evict()
+
+    assert len(cache) == 2
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
@@ -0,0 +1,151 @@
+from datetime import datetime
+
+from core.signal import Signal
+from core.timestamps import from_datetime
+from data.bar import Bar
+from execution.execution_engine import ExecutionEngine
+from execution.models import Trade
+from risk.portfolio_risk import PortfolioRiskEngine
+from risk.position_sizing import KellySizer, VolatilityTargetSizer
+from risk.risk_manager import RiskManager
+
+
+START = datetime(2015, 1, 9, 9, 15)
+T0 = from_datetime(START)
+
+
+def bar(price, symbol="NIFTY"):
+    return Bar.from_datetime(START, symbol, open=price, high=price, low=price, close=price)
+
+
+def fill(risk, engine, strategy_id, symbol, qty, price):
+    position = engine.get_position(strategy_id, symbol)
+    prev_qty, prev_avg = position.quantity, position.average_price
+    trade = engine.execute_trade(strategy_id, symbol, qty, price, T0)
+    risk.on_fill(trade, position, prev_qty, prev_avg)
+
+
+def test_gross_exposure_downsizes_order():
+    portfolio = PortfolioRiskEngine(max_gross_exposure_per_symbol=1000.0)
+    risk = RiskManager(max_position_size=100, default_quantity=10, portfolio=portfolio)
+    engine = ExecutionEngine()
+
+    risk.on_bar(bar(100.0))
+    fill(risk, engine, "a", "NIFTY", 7, 100.0)
+
+    signal = Signal("b", "NIFTY", "BUY", T0)
+    assert risk.approve(signal, engine.get_position("b", "NIFTY")) == 3
+    assert risk.last_rule == "max_gross_exposure_per_symbol"
+
+
+def test_reducing_orders_always_pass():
+    portfolio = PortfolioRiskEngine(max_total_notional=500.0)
+    engine = ExecutionEngine()
+    risk = RiskManager(max_position_size=100, default_quantity=5, portfolio=portfolio)
+
+    risk.on_bar(bar(100.0))
+    fill(risk, engine, "a", "NIFTY", 5, 100.0)
+
+    buy = Signal("a", "NIFTY", "BUY", T0)
+    sell = Signal("a", "NIFTY", "SELL", T0)
+    assert risk.approve(buy, engine.get_position("a", "NIFTY")) == 0
+    assert risk.approve(sell, engine.get_position("a", "NIFTY")) == 5
+
+
+def test_open_positions_limit_and_aggregates():
+    portfolio = PortfolioRiskEngine(max_open_positions=1)
+    engine = ExecutionEngine()
+    risk = RiskManager(max_position_size=100, default_quantity=5, portfolio=portfolio)
+
+    risk.on_bar(bar(100.0))
+    fill(risk, engine, "a", "NIFTY", 5, 100.0)
+    assert portfolio.open_positions == 1
+
+    signal = Signal("b", "NIFTY", "BUY", T0)
+    assert risk.approve(signal, engine.get_position("b", "NIFTY")) == 0
+    assert risk.last_rule == "max_open_positions"
+
+    risk.on_bar(bar(110.0))
+    assert portfolio.total_notional == 550.0
+    assert portfolio.equity == 50.0
+
+    fill(risk, engine, "a", "NIFTY", -5, 110.0)
+    assert portfolio.open_positions == 0
+    assert portfolio.realized_pnl == 50.0
+    assert portfolio.equity == 50.0
+
+
+def test_intraday_drawdown_blocks_new_exposure():
+    portfolio = PortfolioRiskEngine(max_intraday_drawdown=40.0)
+    engine = ExecutionEngine()
+    risk = RiskManager(max_position_size=100, default_quantity=5, portfolio=portfolio)
+
+    risk.on_bar(bar(100.0))
+    fill(risk, engine, "a", "NIFTY", 5, 100.0)
+    risk.on_bar(bar(110.0))
+    risk.on_bar(bar(101.0))
+
+    assert portfolio.drawdown == 45.0
+    signal = Signal("b", "NIFTY", "BUY", T0)
+    assert risk.approve(signal, engine.get_position("b", "NIFTY")) == 0
+    assert risk.last_rule == "max_intraday_drawdown"
+
+
+def test_intraday_drawdown_limit_is_breached_only_when_exceeded():
+    signal = Signal("b", "NIFTY", "BUY", T0)
+
+    # A zero limit still allows new exposure at peak equity
+    portfolio = PortfolioRiskEngine(max_intraday_drawdown=0.0)
+    risk = RiskManager(max_position_size=100, default_quantity=5, portfolio=portfolio)
+    risk.on_bar(bar(100.0))
+    assert portfolio.drawdown == 0.0
+    assert risk.approve(signal, ExecutionEngine().get_position("b", "NIFTY")) == 5
+
+    # Exactly at the limit passes, one tick beyond it doesn't
+    portfolio = PortfolioRiskEngine(max_intraday_drawdown=45.0)
+    engine = ExecutionEngine()
+    risk = RiskManager(max_position_size=100, default_quantity=5, portfolio=portfolio)
+    risk.on_bar(bar(100.0))
+    fill(risk, engine, "a", "NIFTY", 5, 100.0)
+    risk.on_bar(bar(110.0))
+    risk.on_bar(bar(101.0))
+    assert portfolio.drawdown == 45.0
+    assert risk.approve(signal, engine.get_position("b", "NIFTY")) == 5
+    assert risk.last_rule == ""
+
+    risk.on_bar(bar(100.0))
+    assert risk.approve(signal, engine.get_position("b", "NIFTY")) == 0
+    assert risk.last_rule == "max_intraday_drawdown"
+
+
+def test_volatility_target_sizing_and_closing_orders():
+    sizer = VolatilityTargetSizer(risk_fraction=0.01, period=2, initial_capital=100000.0)
+    risk = RiskManager(max_position_size=10000, default_quantity=5, sizer=sizer)
+    engine = ExecutionEngine()
+
+    buy = Signal("a", "NIFTY", "BUY", T0)
+    risk.on_bar(Bar.from_datetime(START, "NIFTY", 100, 102, 98, 100))
+    assert risk.approve(buy, engine.get_position("a", "NIFTY")) == 0
+    assert risk.last_rule == "position_sizing"
+
+    risk.on_bar(Bar.from_datetime(START, "NIFTY", 100, 103, 99, 101))
+    # ATR(2) = (4 + 4) / 2 = 4 -> 1000 / 4 = 250
+    assert risk.approve(buy, engine.get_position("a", "NIFTY")) == 250
+
+    fill(risk, engine, "a", "NIFTY", 250, 101.0)
+    sell = Signal("a", "NIFTY", "SELL", T0)
+    assert risk.approve(sell, engine.get_position("a", "NIFTY")) == 250
+
+
+def test_kelly_sizer_caps_fraction():
+    sizer = KellySizer(kelly_fraction=1.0, max_fraction=0.2, min_trades=4, initial_capital=10000.0)
+    sizer.on_bar(bar(100.0))
+    signal = Signal("a", "NIFTY", "BUY", T0)
+    assert sizer.size(signal, 5) == 5
+
+    for pnl in (100.0, 100.0, 100.0, -100.0):
+        sizer.on_fill(Trade("a", "NIFTY", "SELL", -1, 100.0, T0, realized_pnl=pnl))
+
+    # W=0.75, R=1 -> f=0.5, capped at 0.2 of 10200 equity
+    assert sizer.kelly("a") == 0.2
+    assert sizer.size(signal, 5) == 20
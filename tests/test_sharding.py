@@ -0,0 +1,85 @@
+import pytest
+
+from analytics.metrics import Analytics
+from data.feed import MarketDataFeed
+from data.multi_feed import MultiSymbolFeed
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from engine.sharding import ShardedBacktest
+from execution.accounting import Ledger
+from execution.execution_engine import ExecutionEngine
+from risk.portfolio_risk import PortfolioRiskEngine
+from risk.risk_manager import RiskManager
+from tests.helpers import make_engine, make_strategies, run_result
+
+
+SYMBOLS = ("NIFTY", "BANKNIFTY", "FINNIFTY")
+
+
+def _feeds():
+    feeds = SyntheticMarket(n_bars=2000, seed=9).feeds(SYMBOLS)
+    # One symbol starts later, so not every timestamp has every symbol
+    late = feeds["FINNIFTY"]
+    columns = {name: getattr(late, name)[400:] for name in late._columns()}
+    feeds["FINNIFTY"] = MarketDataFeed.from_arrays("FINNIFTY", **columns)
+    return feeds
+
+
+def test_merged_feed_routes_bars_by_symbol():
+    feeds = _feeds()
+    merged = BacktestEngine(MultiSymbolFeed(feeds), make_strategies(SYMBOLS), RiskManager(),
+                            ExecutionEngine(), Analytics(), verbose=False)
+    merged.run()
+
+    # Each symbol's strategies see exactly what a run over that feed alone gives
+    for symbol in SYMBOLS:
+        alone = BacktestEngine(feeds[symbol], make_strategies([symbol]), RiskManager(),
+                               ExecutionEngine(), Analytics(), verbose=False)
+        alone.run()
+        assert [t for t in merged.analytics.trades if t.symbol == symbol] == alone.analytics.trades
+        assert alone.analytics.trades
+
+
+@pytest.mark.parametrize("ledger,portfolio_mode", [(None, False), ("fifo", True)])
+def test_sharded_run_matches_single_process(ledger, portfolio_mode):
+    feed = MultiSymbolFeed(_feeds())
+
+    single = make_engine(feed, make_strategies(SYMBOLS), ledger=Ledger(ledger) if ledger else None,
+                         portfolio_mode=portfolio_mode)
+    single.run()
+
+    engine = make_engine(feed, make_strategies(SYMBOLS), ledger=Ledger(ledger) if ledger else None,
+                         portfolio_mode=portfolio_mode)
+    sharded = ShardedBacktest(engine, processes=2)
+    sharded.run()
+
+    assert sharded.mode == "sharded"
+    assert single.analytics.skip_count > 0
+    assert run_result(engine) == run_result(single)
+    if ledger:
+        assert engine.execution_engine.ledger.realized_pnl() == \
+            pytest.approx(single.execution_engine.ledger.realized_pnl())
+
+
+def test_cross_symbol_risk_falls_back_to_single_process():
+    feed = MultiSymbolFeed(_feeds())
+    portfolio = PortfolioRiskEngine(max_total_notional=2_000_000)
+
+    reference = make_engine(feed, make_strategies(SYMBOLS),
+                            portfolio=PortfolioRiskEngine(max_total_notional=2_000_000))
+    reference.run()
+
+    engine = make_engine(feed, make_strategies(SYMBOLS), portfolio=portfolio)
+    sharded = ShardedBacktest(engine, processes=2)
+    sharded.run()
+    assert sharded.mode == "single"
+    assert run_result(engine) == run_result(reference)
+
+    engine = make_engine(feed, make_strategies(SYMBOLS), portfolio=portfolio)
+    with pytest.raises(ValueError):
+        ShardedBacktest(engine, fallback=False).run()
+
+
+def test_sharding_needs_a_multi_symbol_feed():
+    with pytest.raises(ValueError):
+        ShardedBacktest(make_engine(_feeds()["NIFTY"], make_strategies(["NIFTY"])))
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from data.shared_store import SharedBarStore
+from data.synthetic import SyntheticMarket
+
+
+def _name(tag):
+    return f"test_bars_{tag}_{os.getpid()}"
+
+
+def _worker_sum(name):
+    store = SharedBarStore.attach(name)
+    feed = store.feed("NIFTY")
+    total = sum(bar.close for bar in feed)
+    del feed
+    store.close()
+    return total
+
+
+def test_attached_feed_is_read_only_view_of_published_bars():
+    feeds = SyntheticMarket(n_bars=1000, seed=4).feeds(["NIFTY", "BANKNIFTY"])
+
+    with SharedBarStore.create(feeds, name=_name("view")) as store:
+        reader = SharedBarStore.attach(store.name)
+        assert reader.symbols == ["NIFTY", "BANKNIFTY"]
+
+        feed = reader.feed("BANKNIFTY")
+        original = feeds["BANKNIFTY"]
+        assert feed.content_hash() == original.content_hash()
+        assert feed.volumes is not None and not feed.closes.flags.writeable
+        with pytest.raises(ValueError):
+            feed.closes[0] = 1.0
+
+        # Bars come out identical while lists are built a chunk at a time
+        feed.chunk_rows = 64
+        assert [(b.timestamp, b.close, b.volume) for b in feed] == \
+               [(b.timestamp, b.close, b.volume) for b in original]
+        assert len(feed._rows[0]) <= 64
+
+        # Feeds handed out are views of the one block, not copies
+        publisher = store.feed("BANKNIFTY")
+        assert np.shares_memory(publisher.closes, store.feed("BANKNIFTY").closes)
+
+        with pytest.raises(RuntimeError):
+            reader.unlink()
+        with pytest.raises(KeyError):
+            reader.feed("MISSING")
+
+        del feed, publisher
+        reader.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedBarStore.attach(store.name)
+
+
+def test_worker_processes_attach_by_name():
+    feed = SyntheticMarket(n_bars=2000, seed=5).feed("NIFTY")
+
+    with SharedBarStore.create([feed], name=_name("workers")) as store:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(2) as pool:
+            totals = pool.map(_worker_sum, [store.name] * 2)
+
+        assert totals == [pytest.approx(feed.closes.sum())] * 2
+
+        # Workers exiting must not take the block with them
+        assert SharedBarStore.attach(store.name).symbols == ["NIFTY"]
+
+
+def test_duplicate_symbols_are_rejected():
+    feed = SyntheticMarket(n_bars=10, seed=1).feed("NIFTY")
+    with pytest.raises(ValueError):
+        SharedBarStore.create([feed, feed])
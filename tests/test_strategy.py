@@ -1,6 +1,17 @@
 from datetime import datetime
 
+import pytest
+
+from analytics.metrics import Analytics
+from core.signal import BUY, Side, Signal
+from data.synthetic import SyntheticMarket
+from engine.backtest_engine import BacktestEngine
+from execution.execution_engine import ExecutionEngine
+from risk.risk_manager import RiskManager
+from strategies.base import BaseStrategy
 from strategies.ema_crossover import EMACrossoverStrategy
+from strategies.opening_range_breakout import OpeningRangeBreakoutStrategy
+from strategies.registry import STRATEGIES, create_strategy, get_strategy_class
 from data.bar import Bar
 
 
@@ -23,3 +34,190 @@ def test_ema_crossover_strategy():
     # We don't assert signal here yet because:
     # - crossover depends on EMA state
     # - this test is only for contract validation
+
+
+def test_opening_range_resets_each_session():
+    strategy = OpeningRangeBreakoutStrategy(symbol="TEST")
+
+    def bar(day, hh, mm, high, low):
+        return Bar.from_datetime(
+            datetime(2015, 1, day, hh, mm),
+            symbol="TEST", open=low, high=high, low=low, close=low,
+        )
+
+    first = bar(9, 9, 15, 110, 100)
+    strategy.on_session_start(first)
+    strategy.on_bar(first)
+    strategy.on_bar(bar(9, 9, 30, 108, 101))
+    assert strategy.range_done and strategy.or_high == 110
+
+    second = bar(12, 9, 15, 95, 90)
+    strategy.on_session_start(second)
+    strategy.on_bar(second)
+    assert strategy.or_high == 95 and strategy.or_low == 90
+
+
+def test_signal_side_enum_and_pooling():
+    assert Signal("s", "TEST", "SELL", 0).side is Side.SELL
+    assert Side.BUY == "BUY" and str(Side.BUY) == "BUY"
+    with pytest.raises(ValueError):
+        Signal("s", "TEST", "HOLD", 0)
+
+    strategy = OpeningRangeBreakoutStrategy(symbol="TEST")
+    assert strategy.emit(BUY, 1, "x") is not strategy.emit(BUY, 2, "x")
+
+    strategy.reuse_signals = True
+    first = strategy.emit(BUY, 1, "x")
+    second = strategy.emit(BUY, 2, "x")
+    assert first is second and second.timestamp == 2
+
+
+def test_registry_resolves_strategies_lazily():
+    strategy = create_strategy("mean_reversion", symbol="TEST", period=5)
+    assert strategy.period == 5 and strategy.symbol == "TEST"
+    assert STRATEGIES["mean_reversion"] is type(strategy)
+
+    path = "strategies.opening_range_breakout:OpeningRangeBreakoutStrategy"
+    assert get_strategy_class(path) is OpeningRangeBreakoutStrategy
+
+    with pytest.raises(KeyError):
+        get_strategy_class("does_not_exist")
+
+
+class _HigherTimeframeRecorder(BaseStrategy):
+    timeframes = (5, 15)
+
+    def __init__(self, strategy_id):
+        super().__init__(strategy_id, "NIFTY")
+        self.htf = {5: [], 15: []}
+        self.base_minutes = []
+
+    def on_htf_bar(self, timeframe, bar):
+        # Delivered before on_bar of the base bar that completes it
+        self.htf[timeframe].append((bar, len(self.base_minutes)))
+
+    def on_bar(self, bar):
+        self.base_minutes.append(bar.minute_of_day)
+        return None
+
+
+def test_engine_delivers_shared_higher_timeframe_bars():
+    feed = SyntheticMarket(n_bars=800, seed=2).feed("NIFTY")  # 375 + 375 + 50
+    strategies = [_HigherTimeframeRecorder("a"), _HigherTimeframeRecorder("b")]
+    engine = BacktestEngine(feed, strategies, RiskManager(), ExecutionEngine(),
+                            Analytics(), verbose=False)
+    engine.run()
+
+    assert sorted(engine.aggregators) == [("NIFTY", 5), ("NIFTY", 15)]
+
+    bars_15 = strategies[0].htf[15]
+    assert [b for b, _ in bars_15] == [b for b, _ in strategies[1].htf[15]]
+
+    # 25 full buckets per session, the last session ends on a partial one
+    assert len(bars_15) == 25 + 25 + 4
+    assert len(strategies[0].htf[5]) == 75 + 75 + 10
+
+    first, seen = bars_15[0]
+    assert seen == 14 and first.minute_of_day == 9 * 60 + 15
+    assert first.open == feed.opens[0] and first.close == feed.closes[14]
+    assert first.high == feed.highs[:15].max() and first.low == feed.lows[:15].min()
+
+    # Second session restarts at the open
+    second_day = bars_15[25][0]
+    assert second_day.minute_of_day == 9 * 60 + 15
+    assert second_day.session_day == feed.session_days[375]
+
+    last, _ = bars_15[-1]
+    assert last.close == feed.closes[-1] and last.minute_of_day == 10 * 60
+
+
+def _trades(portfolio_mode, feed):
+    from risk.exit_manager import ExitRule
+    from strategies.mean_reversion import MeanReversionStrategy
+
+    strategies = [
+        EMACrossoverStrategy(fast=fast, slow=slow, strategy_id=f"ema_{fast}_{slow}",
+                             exit_rule=ExitRule(stop_loss_pct=0.01) if fast == 5 else None)
+        for fast in (2, 5, 8) for slow in (4, 20)
+    ] + [MeanReversionStrategy(period=p, strategy_id=f"mr_{p}") for p in (2, 5, 20)]
+    # A single strategy between group members
+    strategies.insert(3, OpeningRangeBreakoutStrategy())
+
+    analytics = Analytics()
+    risk_manager = RiskManager(max_position_size=10, max_loss_per_strategy=-1e9)
+    engine = BacktestEngine(feed, strategies, risk_manager, ExecutionEngine(), analytics,
+                            verbose=False, portfolio_mode=portfolio_mode)
+    engine.run()
+    trades = [(t.timestamp, t.strategy_id, str(t.side), t.price, t.reason)
+              for t in analytics.trades]
+    state = [(s.in_position, s.prices.values().tolist(), s.prices.count,
+              getattr(s, "prev_fast", None) is None)
+             for s in strategies if hasattr(s, "prices")]
+    return engine, trades, state
+
+
+def test_portfolio_mode_matches_sequential_run():
+    # Whole-point prices produce exact EMA / SMA ties
+    feed = SyntheticMarket(n_bars=3000, seed=0, tick_size=1.0).feed("NIFTY")
+
+    _, sequential, positions = _trades(False, feed)
+    engine, grouped, grouped_positions = _trades(True, feed)
+
+    assert len(engine.groups) == 2 and len(engine.single_strategies) == 1
+    assert len(sequential) > 100
+    # Same trades in the same order, and the strategies end in the same state
+    assert grouped == sequential
+    assert grouped_positions == positions
+
+    ema = engine.groups[0].strategies[-1]
+    alone = EMACrossoverStrategy(fast=ema.fast, slow=ema.slow)
+    for bar in feed:
+        alone.on_bar(bar)
+    assert ema.prev_fast == pytest.approx(alone.prev_fast, rel=1e-12)
+
+
+def test_price_history_keeps_the_last_values():
+    import pickle
+
+    from strategies.history import PriceHistory
+
+    history = PriceHistory(3)
+    assert len(history) == 0 and history.last(2).tolist() == []
+    history.append(1)
+    assert history.window().tolist() == [0, 0, 1]
+    for value in range(2, 8):
+        history.append(value)
+
+    assert (len(history), history.count) == (3, 7)
+    assert history.values().tolist() == [5, 6, 7]
+    assert history.last(2).tolist() == [6, 7]
+    assert history.last(10).tolist() == [5, 6, 7]
+    assert history.window().tolist() == [5, 6, 7]
+    assert (history[0], history[-1]) == (5, 7)
+
+    restored = pickle.loads(pickle.dumps(history))
+    restored.append(8)
+    assert restored.values().tolist() == [6, 7, 8]
+    assert history.values().tolist() == [5, 6, 7]
+
+
+def test_builtin_strategies_keep_bounded_history():
+    from strategies.mean_reversion import MeanReversionStrategy
+
+    feed = SyntheticMarket(n_bars=3000, seed=12).feed("NIFTY")
+
+    def run(strategy, lookback=None):
+        if lookback is not None:
+            strategy.track_prices(lookback)   # longer than the run: unbounded
+        signals = [(s.side, s.timestamp) for s in map(strategy.on_bar, feed) if s is not None]
+        return signals, strategy
+
+    for make in (lambda: EMACrossoverStrategy(fast=5, slow=20),
+                 lambda: EMACrossoverStrategy(fast=12, slow=6),
+                 lambda: MeanReversionStrategy(period=10)):
+        bounded, strategy = run(make())
+        unbounded, _ = run(make(), lookback=len(feed))
+
+        assert bounded and bounded == unbounded
+        assert len(strategy.prices) == strategy.lookback < 25
+        assert strategy.prices.count == len(feed)
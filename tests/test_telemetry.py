@@ -0,0 +1,99 @@
+import urllib.request
+
+import numpy as np
+import pytest
+
+from data.synthetic import SyntheticMarket
+from engine.telemetry import FileExporter, LatencyHistogram, PrometheusExporter, Telemetry
+from tests.helpers import make_engine
+
+
+# Tighter than the shared default, so there are rejections to count
+LOSS_LIMIT = {"max_loss_per_strategy": -300}
+
+
+def test_histogram_quantiles_within_bucket_precision():
+    values = np.random.default_rng(3).lognormal(10, 1.5, 20_000).astype(np.int64)
+    histogram = LatencyHistogram()
+    for value in values.tolist():
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert histogram.total == values.sum()
+    assert (histogram.min, histogram.max) == (values.min(), values.max())
+
+    for q, value in histogram.quantiles((0.5, 0.9, 0.99, 1.0)).items():
+        exact = np.quantile(values, q, method="inverted_cdf")
+        assert exact <= value <= exact * (1 + 1 / 32) + 1
+
+    # Small values are exact; huge ones saturate the last bucket
+    assert [LatencyHistogram.bucket(v) for v in range(64)] == list(range(64))
+    assert LatencyHistogram.bucket(10 ** 15) == len(histogram.counts) - 1
+
+
+@pytest.mark.parametrize("portfolio_mode", [False, True])
+def test_telemetry_counts_match_run(portfolio_mode):
+    feed = SyntheticMarket(n_bars=3000, seed=5).feed("NIFTY")
+    plain = make_engine(feed, risk=LOSS_LIMIT, portfolio_mode=portfolio_mode)
+    plain.run()
+
+    telemetry = Telemetry(sample_every=1)
+    engine = make_engine(feed, risk=LOSS_LIMIT, telemetry=telemetry, portfolio_mode=portfolio_mode)
+    engine.run()
+
+    # Observing the run doesn't change it
+    assert engine.analytics.trades == plain.analytics.trades
+    assert engine.analytics.rejections.rows() == plain.analytics.rejections.rows()
+
+    trades = engine.analytics.trades
+    assert telemetry.bars == len(feed)
+    assert sum(telemetry.fills.values()) == len(trades)
+    assert sum(h.count for h in telemetry.bar_to_fill.values()) == len(trades)
+    assert sum(telemetry.rejections.values()) == engine.analytics.skip_count > 0
+    assert telemetry.stages["bar"].count == len(feed)
+
+    timed = telemetry.strategy_time
+    if portfolio_mode:
+        # The EMA variants run as one group; a lone strategy stays single
+        assert set(timed) == {"EMACrossoverGroup:ema", "mr", "opening_range"}
+    else:
+        assert set(timed) == {"ema", "ema_fast", "mr", "opening_range"}
+    assert all(h.count == telemetry.stages["bar"].count for h in timed.values())
+
+
+def test_exporters_serve_prometheus_text(tmp_path):
+    telemetry = Telemetry()
+    make_engine(SyntheticMarket(n_bars=500, seed=2).feed("NIFTY"), risk=LOSS_LIMIT,
+                telemetry=telemetry).run()
+    text = telemetry.render()
+    assert "backtest_bars_total 500" in text
+    assert 'backtest_strategy_seconds{strategy="ema",quantile="0.99"}' in text
+    assert 'backtest_stage_seconds_count{stage="bar"} 4' in text
+
+    with PrometheusExporter(telemetry, port=0) as exporter:
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "# TYPE backtest_fills_total counter" in response.read().decode()
+
+    path = tmp_path / "metrics" / "backtest.prom"
+    with FileExporter(telemetry, path, interval=60):
+        pass
+    assert "backtest_bars_total 500" in path.read_text()
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_fills_are_timed_on_sampled_bars_only():
+    feed = SyntheticMarket(n_bars=3000, seed=5).feed("NIFTY")
+    telemetry = Telemetry(sample_every=8)
+    engine = make_engine(feed, risk=LOSS_LIMIT, telemetry=telemetry)
+    engine.run()
+
+    sampled = {int(ts) for ts in feed.timestamps[::8]}
+    expected = sum(t.timestamp in sampled for t in engine.analytics.trades)
+    assert sum(h.count for h in telemetry.bar_to_fill.values()) == expected > 0
+    assert sum(telemetry.fills.values()) == len(engine.analytics.trades)
+    assert telemetry.stages["bar"].count == len(range(0, len(feed), 8))
+
+    with pytest.raises(ValueError):
+        Telemetry(sample_every=0)
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from core.timestamps import NS_PER_SECOND, format_timestamp
+from data.calendar import nse_calendar
+from data.ticks import (
+    TickBarBuilder, TickBarFeed, TimeBarBuilder, VolumeBarBuilder,
+    build_bars, iter_ticks, make_ticks, save_ticks,
+)
+
+
+T0 = 1420775100 * NS_PER_SECOND  # 2015-01-09 09:15:00 IST
+
+
+def sample_ticks(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return make_ticks(
+        T0 + np.cumsum(rng.integers(1, 3 * NS_PER_SECOND, n)),
+        100.0 + np.cumsum(rng.normal(0.0, 0.1, n)),
+        rng.integers(1, 50, n),
+    )
+
+
+def chunked(ticks, size):
+    return [ticks[i:i + size] for i in range(0, len(ticks), size)]
+
+
+def test_builders_are_chunk_size_independent():
+    ticks = sample_ticks()
+
+    for make in (lambda: TimeBarBuilder("NIFTY", 10),
+                 lambda: VolumeBarBuilder("NIFTY", 300),
+                 lambda: TickBarBuilder("NIFTY", 25)):
+        whole = build_bars([ticks], make())
+        for size in (1, 13, 400):
+            bars = build_bars(chunked(ticks, size), make())
+            assert all((bars[k] == whole[k]).all() for k in whole)
+
+        assert whole['tick_counts'].sum() == len(ticks)
+        assert whole['volumes'].sum() == ticks['size'].sum()
+
+
+def test_time_bars_match_naive_grouping():
+    ticks = sample_ticks()
+    bars = build_bars(chunked(ticks, 64), TimeBarBuilder("NIFTY", 10))
+
+    group = (ticks['timestamp'] - T0) // (10 * NS_PER_SECOND)
+    for i, g in enumerate(np.unique(group)):
+        members = ticks[group == g]
+        assert bars['timestamps'][i] == T0 + g * 10 * NS_PER_SECOND
+        assert bars['opens'][i] == members['price'][0]
+        assert bars['closes'][i] == members['price'][-1]
+        assert bars['highs'][i] == members['price'].max()
+        assert bars['lows'][i] == members['price'].min()
+
+
+def test_tick_count_and_volume_bars():
+    ticks = make_ticks(T0 + np.arange(10), np.arange(10, dtype=float), [100, 100, 300, 50, 50, 50, 50, 400, 1, 1])
+
+    counts = build_bars([ticks], TickBarBuilder("NIFTY", 4))
+    assert counts['tick_counts'].tolist() == [4, 4, 2]
+
+    volume = build_bars(chunked(ticks, 3), VolumeBarBuilder("NIFTY", 250))
+    # Ticks are never split: the 300 lot overshoots the first bar
+    assert volume['volumes'].tolist() == [500, 600, 2]
+
+
+def test_tick_bar_feed_from_files(tmp_path):
+    ticks = sample_ticks(3000)
+    save_ticks(tmp_path / "ticks.npy", ticks)
+
+    with open(tmp_path / "ticks.csv", "w") as f:
+        f.write("timestamp,price,size\n")
+        for t in ticks:
+            f.write(f"{format_timestamp(int(t['timestamp']))},{float(t['price'])!r},{t['size']}\n")
+
+    assert sum(len(c) for c in iter_ticks(tmp_path / "ticks.npy", chunk_size=700)) == 3000
+
+    feeds = []
+    for name in ("ticks.npy", "ticks.csv"):
+        feed = TickBarFeed(str(tmp_path / name), "NIFTY", TimeBarBuilder("NIFTY", 60),
+                           calendar=nse_calendar(), chunk_size=500)
+        feed.load()
+        feeds.append(feed)
+
+    npy, csv = feeds
+    assert (npy.timestamps == csv.timestamps).all()
+    assert np.allclose(npy.closes, csv.closes)
+
+    bars = list(npy)
+    assert len(bars) == len(npy) == npy.tick_counts.size
+    assert bars[0].minute_of_day == 9 * 60 + 15
+    assert len(npy.session_starts) == 1
+
+
+def test_tick_bar_feed_uses_its_timezone(tmp_path):
+    ticks = sample_ticks(300)
+    save_ticks(tmp_path / "ticks.npy", ticks)
+
+    feed = TickBarFeed(str(tmp_path / "ticks.npy"), "NIFTY", TimeBarBuilder("NIFTY", 60),
+                       tz="UTC")
+    feed.load()
+    assert feed.builder.tz == "UTC"
+    # 09:15 IST is 03:45 UTC
+    assert next(iter(feed)).minute_of_day == 3 * 60 + 45
+
+    with pytest.raises(ValueError):
+        TickBarFeed(str(tmp_path / "ticks.npy"), "NIFTY", TimeBarBuilder("NIFTY", 60),
+                    tz="America/New_York")